@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+# Checks the binary decoder of ``binary.py`` against the C path and compares their speed.
+# The cutscenes of a decomp tree (generated if none is given, see ``gen_decomp.py``) are imported from the C sources,
+# encoded like the ``z64cutscene_commands.h`` macros do in a single blob, decoded back from it, and compared command by command.
+# Usage: python3 benchmarks/bench_binary.py [--decomp path --version gc-eu-mq-dbg] [--repeat 5]
+
+import argparse
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from gen_decomp import addGeneratorArguments, generateDecomp, getGeneratorConfig
+from binary import CS_TEXT_ID_NONE, csCmd, decodeCutscene, encodeCutscene, getEnumKey
+from classes import Cutscene, CutsceneCmdText, CutsceneCmdTextNone, CutsceneCmdTextOcarinaAction, CutsceneImport
+from corpus import listClasses
+from diff import getCommandKey
+
+
+def getValue(value):
+    # the C path keeps the spelling of the literals (``0x4a00``, ``0x003E`` for ``CS_CMD_ACTOR_CUE_8_0``...),
+    # the decoder has a single one, and the legacy commands are the same once encoded so ``isLegacy`` is ignored
+    if isinstance(value, str) and value.startswith("0x"):
+        return int(value, 16)
+    if isinstance(value, str) and value in csCmd.itemByKey:
+        return csCmd.itemByKey[value].index
+    if isinstance(value, tuple):
+        return tuple(getValue(item) for item in value)
+    if isinstance(value, bool):
+        return None
+    return value
+
+
+def getEntryKey(entry):
+    # ``CS_TEXT_NONE()`` and ``CS_TEXT_OCARINA_ACTION()`` are ``CS_TEXT()`` with some values, which ``CS_TEXT()`` can have too
+    if isinstance(entry, CutsceneCmdText) and entry.textId & 0xFFFF == CS_TEXT_ID_NONE:
+        return (CutsceneCmdTextNone, entry.startFrame, entry.endFrame)
+    if isinstance(entry, CutsceneCmdText) and entry.type == "ocarina_action":
+        ocarinaActionId = getEnumKey("ocarinaSongActionId", entry.textId)
+        return getValue((CutsceneCmdTextOcarinaAction, entry.startFrame, entry.endFrame, ocarinaActionId, entry.altTextId1[0]))
+    return getValue(getCommandKey(entry))
+
+
+def getCutsceneKey(cutscene: Cutscene):
+    """Returns the compared data of a cutscene, the keys of its commands and of their entries by list"""
+
+    lists = {listName: getattr(cutscene, listName) for listName in listClasses}
+    lists["destination"] = [cutscene.destination] if cutscene.destination is not None else []
+
+    key = {"frameCount": cutscene.frameCount}
+    for listName, commands in lists.items():
+        key[listName] = [
+            (getValue(getCommandKey(command)), [getEntryKey(entry) for entry in getattr(command, "entries", [])])
+            for command in commands
+        ]
+    return key
+
+
+def measure(decomp_path: Path, version: str, columnar: bool, repeat: int):
+    """Imports the cutscenes from the C sources and from their binary encoding, returns the results of both"""
+
+    importer = CutsceneImport(decomp_path, version, columnar=columnar)
+    textTimes = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cutscenes = importer.getCutsceneList()
+        textTimes.append(time.perf_counter() - start)
+
+    # the generated cutscenes can have actor cue lists with the type of another command, they can't be compiled
+    encodable = []
+    for cutscene in cutscenes:
+        try:
+            encodable.append((cutscene, encodeCutscene(cutscene)))
+        except ValueError:
+            pass
+
+    offsets = []
+    size = 0
+    for _, chunk in encodable:
+        offsets.append(size)
+        size += len(chunk)
+    blob = memoryview(b"".join(chunk for _, chunk in encodable))
+
+    binaryTimes = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decoded = [decodeCutscene(blob, offset, cutscene.name, columnar) for offset, (cutscene, _) in zip(offsets, encodable)]
+        binaryTimes.append(time.perf_counter() - start)
+
+    mismatches = 0
+    for (cutscene, chunk), (decodedCutscene, decodedSize) in zip(encodable, decoded):
+        if decodedSize != len(chunk) or getCutsceneKey(cutscene) != getCutsceneKey(decodedCutscene):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"Mismatch: '{cutscene.name}'")
+
+    return {
+        "cutscenes": len(encodable),
+        "skipped": len(cutscenes) - len(encodable),
+        "bytes": size,
+        "mismatches": mismatches,
+        "textSeconds": min(textTimes),
+        "binarySeconds": min(binaryTimes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="checks and benchmarks the binary cutscene decoder")
+    parser.add_argument("--decomp", "-d", dest="decomp_path", help="existing decomp tree to use instead of a generated one")
+    parser.add_argument("--version", "-v", dest="version", help="version to use (first generated one by default)")
+    parser.add_argument("--repeat", dest="repeat", type=int, help="runs of each decoder, the fastest one is kept", default=5)
+    addGeneratorArguments(parser)
+    args = parser.parse_args()
+
+    config = getGeneratorConfig(args)
+    version = args.version if args.version is not None else config.versions[0]
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        if args.decomp_path is not None:
+            decomp_path = Path(args.decomp_path).resolve()
+        else:
+            decomp_path = Path(tempDir)
+            generateDecomp(decomp_path, config)
+
+        results = {mode: measure(decomp_path, version, mode == "columnar", args.repeat) for mode in ["objects", "columnar"]}
+
+    mismatches = 0
+    for mode, result in results.items():
+        cutscenes, textTime, binaryTime = result["cutscenes"], result["textSeconds"], result["binarySeconds"]
+        mismatches += result["mismatches"]
+        print(
+            f"{mode}: {cutscenes} cutscenes ({result['skipped']} skipped), {result['bytes']} bytes, {result['mismatches']} mismatches"
+        )
+        print(f"    C sources: {textTime:.3f}s ({cutscenes / textTime:.0f} cutscenes/s)")
+        print(
+            f"    binary:    {binaryTime:.3f}s ({cutscenes / binaryTime:.0f} cutscenes/s, {result['bytes'] / binaryTime / 1e6:.1f}MB/s)"
+        )
+        print(f"    speedup:   {textTime / binaryTime:.1f}x")
+
+    if mismatches > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# Compares the literal decoders of ``literals.py`` with the implementations they replaced.
+# Usage: python3 benchmarks/bench_literals.py [--number 200000]
+
+import argparse
+import random
+import re
+import sys
+
+from pathlib import Path
+from struct import unpack
+from timeit import repeat
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import literals
+
+
+# previous implementations, kept here as the reference
+
+
+def legacyGetInteger(number: str):
+    if number.startswith("0x"):
+        number = number.removeprefix("0x")
+        return unpack("!i", bytes.fromhex("0" * (8 - len(number)) + number))[0]
+    else:
+        return int(number)
+
+
+def legacyGetRotation(data: str):
+    if "DEG_TO_BINANG" in data or not "0x" in data:
+        angle = float(data.split("(")[1].removesuffix(")") if "DEG_TO_BINANG" in data else data)
+        binang = int(angle * (0x8000 / 180.0))
+        return f"0x{0xFFFF if binang > 0xFFFF else binang:04X}"
+    else:
+        return data
+
+
+def legacyFloat(v_str: str):
+    return float(v_str.removesuffix("f"))
+
+
+def legacySplitArgs(data: str):
+    data = data.replace(" ", "")
+    if "CS_FLOAT" in data:
+        data = re.sub(r"CS_FLOAT\([a-fA-F0-9x]*,([0-9e+-.f]*)\)", r"\1", data, re.DOTALL)
+        data = re.sub(r"CS_FLOAT\([a-fA-F0-9x]*,([0-9e+-.f]*)", r"\1", data, re.DOTALL)
+    return data.split(",")
+
+
+def legacyDecodeArgs(data: str):
+    params = []
+    for param in legacySplitArgs(data):
+        try:
+            params.append(legacyGetInteger(param))
+        except ValueError:
+            try:
+                params.append(legacyFloat(param))
+            except ValueError:
+                params.append(param)
+    return params
+
+
+def getSamples(count: int):
+    """Returns literals with a distribution close to the one of a real version"""
+
+    rng = random.Random(0)
+    integers = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.45:
+            integers.append(rng.choice(["0", "0x0000", "0x00000000", "1", "0x00", "30", "0xFFFFFFFE"]))
+        elif kind < 0.75:
+            integers.append(str(rng.randint(-4000, 4000)))
+        else:
+            integers.append(f"0x{rng.randint(0, 0xFFFF):04X}")
+
+    rotations = [rng.choice(["0x0000", "0x4000", "0x8000", f"DEG_TO_BINANG({rng.randint(0, 359)}.0)"]) for _ in range(count)]
+    floats = [rng.choice(["45.0f", "60.0f", "30.0f", f"{rng.uniform(20, 80):.1f}f"]) for _ in range(count)]
+    argLists = [
+        f"0x{rng.randint(1, 20):04X}, {i}, {i + 10}, 0x0000, 0x4000, 0x0000, {rng.randint(-100, 100)}, 0, 0, 10, 0, 0, "
+        + "CS_FLOAT(0x0, 0.0f), CS_FLOAT(0x3F800000, 1.0f), CS_FLOAT(0x0, 0.0f)"
+        for i in range(count // 10)
+    ]
+    return integers, rotations, floats, argLists
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmarks the literal decoders")
+    parser.add_argument("--number", dest="number", type=int, help="literals decoded per benchmark", default=200000)
+    args = parser.parse_args()
+
+    integers, rotations, floats, argLists = getSamples(args.number)
+
+    # both implementations have to agree before comparing them
+    assert [legacyGetInteger(n) for n in integers] == [literals.getInteger(n) for n in integers]
+    assert [legacyGetRotation(r) for r in rotations] == [literals.getRotation(r) for r in rotations]
+    assert [legacySplitArgs(a) for a in argLists] == [literals.splitArgs(a) for a in argLists]
+    assert [legacyDecodeArgs(a) for a in argLists] == [literals.decodeArgs(a) for a in argLists]
+
+    benchmarks = [
+        ("getInteger", integers, legacyGetInteger, literals.getInteger),
+        ("decodeInteger", integers, legacyGetInteger, literals.decodeInteger),
+        ("getRotation", rotations, legacyGetRotation, literals.getRotation),
+        ("cs_import_float", floats, legacyFloat, literals.cs_import_float),
+        ("decodeFloat", floats, legacyFloat, literals.decodeFloat),
+        ("getCmdParams split", argLists, legacySplitArgs, literals.splitArgs),
+        ("decodeArgs (typed)", argLists, legacyDecodeArgs, literals.decodeArgs),
+    ]
+
+    print(f"{'benchmark':<20} {'legacy (ns)':>12} {'new (ns)':>10} {'speedup':>8}")
+    for name, samples, legacy, new in benchmarks:
+        legacyTime = min(repeat(lambda: [legacy(sample) for sample in samples], number=1, repeat=3))
+        newTime = min(repeat(lambda: [new(sample) for sample in samples], number=1, repeat=3))
+        legacyNs = legacyTime * 1e9 / len(samples)
+        newNs = newTime * 1e9 / len(samples)
+        print(f"{name:<20} {legacyNs:>12.0f} {newNs:>10.0f} {legacyTime / newTime:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Times the cutscene tokenizer on growing cutscenes to show the cost per command stays flat.
+# Usage: python3 benchmarks/bench_tokenizer.py [--sizes 1000 2000 4000 8000 16000]
+
+import argparse
+import sys
+
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tokenizer import tokenizeCutscenes, groupCommands
+
+
+def getCutsceneText(pointCount: int):
+    """Returns a ``CutsceneData`` array shaped like ``gDeathMountainCraterBoleroCs`` with ``pointCount`` camera points"""
+
+    lines = ["CutsceneData gBenchCs[] = {", f"    CS_HEADER(3, {pointCount * 10}),"]
+
+    lines.append(f"    CS_CAM_EYE_SPLINE(0, {pointCount * 10}),")
+    for i in range(pointCount):
+        flag = "CS_CAM_STOP" if i == pointCount - 1 else "CS_CAM_CONTINUE"
+        # every point is repeated to hit the identical lines case
+        lines.append(f"        CS_CAM_POINT({flag}, 0x00, 30, 45.0f, {i % 7}, 100, -200, 0x0000),")
+
+    lines.append(f"    CS_ACTOR_CUE_LIST(CS_CMD_ACTOR_CUE_1_0, {pointCount // 4}),")
+    for i in range(pointCount // 4):
+        lines.append(f"        CS_ACTOR_CUE(0x0001, {i}, {i + 1}, 0x0000, 0x4000, 0x0000, 0, 0, 0, 10, 0, 0,")
+        lines.append("            CS_FLOAT(0x0, 0.0f), CS_FLOAT(0x3F800000, 1.0f), CS_FLOAT(0x0, 0.0f)),")
+
+    lines.append("    CS_TRANSITION(CS_TRANS_BLACK_FILL_IN, 10, 20),")
+    lines.append("    CS_END_OF_SCRIPT(),")
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmarks the cutscene tokenizer")
+    parser.add_argument("--sizes", dest="sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000, 16000, 32000])
+    parser.add_argument("--repeat", dest="repeat", type=int, help="runs per size, the best one is kept", default=5)
+    args = parser.parse_args()
+
+    print(f"{'points':>8} {'commands':>9} {'best (ms)':>10} {'us/command':>11}")
+    for size in args.sizes:
+        text = getCutsceneText(size)
+        best = None
+
+        for _ in range(args.repeat):
+            start = perf_counter()
+            csArrays = tokenizeCutscenes(text)
+            groups = groupCommands(csArrays[0])
+            elapsed = perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        commandCount = len(csArrays[0].tokens)
+        assert sum(len(group) for group in groups) == commandCount - 1  # everything but ``CS_END_OF_SCRIPT``
+        print(f"{size:>8} {commandCount:>9} {best * 1000:>10.2f} {best * 1e6 / commandCount:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+# Writes a fake ``extracted/<version>/assets/scenes/`` tree made of realistic ``_scene.c`` files.
+# Usage: python3 benchmarks/gen_decomp.py /tmp/fake_oot --files 400 --versions gc-eu-mq-dbg ntsc-1.0
+
+import argparse
+import random
+import sys
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from constants import oot_data
+
+
+@dataclass
+class GeneratorConfig:
+    """Shape of the generated tree"""
+
+    files: int = 100  # number of scene files per version
+    versions: list[str] = field(default_factory=lambda: ["gc-eu-mq-dbg"])
+    cutsceneRatio: float = 0.6  # ratio of scene files containing cutscenes
+    cutscenesPerFile: tuple[int, int] = (1, 4)
+    listsPerCutscene: tuple[int, int] = (4, 20)
+    listLength: tuple[int, int] = (2, 40)  # entries per list
+    legacyRatio: float = 0.1  # ratio of cutscenes written with the legacy command names
+    floatRatio: float = 0.5  # ratio of actor cues using ``CS_FLOAT()`` instead of plain floats
+    multilineRatio: float = 0.2  # ratio of actor cues split on two lines
+    versionChangeRatio: float = 0.1  # ratio of files that differ between two versions
+    seed: int = 0
+
+
+# command names for (new, legacy) formats
+listNames = {
+    "camEye": ("CS_CAM_EYE_SPLINE", "CS_CAM_POS_LIST"),
+    "camAT": ("CS_CAM_AT_SPLINE", "CS_CAM_FOCUS_POINT_LIST"),
+    "camEyePlayer": ("CS_CAM_EYE_SPLINE_REL_TO_PLAYER", "CS_CAM_POS_PLAYER_LIST"),
+    "camATPlayer": ("CS_CAM_AT_SPLINE_REL_TO_PLAYER", "CS_CAM_FOCUS_POINT_PLAYER_LIST"),
+    "actorCue": ("CS_ACTOR_CUE_LIST", "CS_NPC_ACTION_LIST"),
+    "playerCue": ("CS_PLAYER_CUE_LIST", "CS_PLAYER_ACTION_LIST"),
+    "misc": ("CS_MISC_LIST", "CS_MISC_LIST"),
+    "text": ("CS_TEXT_LIST", "CS_TEXT_LIST"),
+    "light": ("CS_LIGHT_SETTING_LIST", "CS_LIGHTING_LIST"),
+    "startSeq": ("CS_START_SEQ_LIST", "CS_PLAY_BGM_LIST"),
+    "stopSeq": ("CS_STOP_SEQ_LIST", "CS_STOP_BGM_LIST"),
+    "fadeSeq": ("CS_FADE_OUT_SEQ_LIST", "CS_FADE_BGM_LIST"),
+    "rumble": ("CS_RUMBLE_CONTROLLER_LIST", "CS_CMD_09_LIST"),
+    "time": ("CS_TIME_LIST", "CS_TIME_LIST"),
+}
+
+# relative weights of the lists, close to the vanilla game (camera and actor cues make most of the data)
+listWeights = {
+    "camEye": 8,
+    "camAT": 8,
+    "camEyePlayer": 1,
+    "camATPlayer": 1,
+    "actorCue": 12,
+    "playerCue": 4,
+    "misc": 3,
+    "text": 3,
+    "light": 2,
+    "startSeq": 1,
+    "stopSeq": 1,
+    "fadeSeq": 1,
+    "rumble": 1,
+    "time": 1,
+}
+
+
+def getEnumIDs(enumKey: str):
+    # a few IDs of the XML aren't valid C identifiers (like ``CS_DEST_ZORAS_FOUNTAIN_CREDITS crashes``)
+    return [item.id for item in oot_data.enumData.enumByKey[enumKey].items if item.id.isidentifier()]
+
+
+unused8 = ", ".join(["0x00000000"] * 7)
+unused10 = ", ".join(["0x00000000"] * 10)
+
+
+class SceneFileGenerator:
+    def __init__(self, config: GeneratorConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+
+        # the enum values used in the commands come from the XML data
+        self.enumIDs = {
+            key: getEnumIDs(key)
+            for key in [
+                "csCmd",
+                "csMiscType",
+                "csTextType",
+                "csFadeOutSeqPlayer",
+                "csTransitionType",
+                "csDestination",
+                "csPlayerCueId",
+                "ocarinaSongActionId",
+                "seqId",
+            ]
+        }
+        self.actorCueTypes = [enumID for enumID in self.enumIDs["csCmd"] if "ACTOR_CUE" in enumID]
+
+    def getEnum(self, enumKey: str):
+        return self.rng.choice(self.enumIDs[enumKey])
+
+    def getRange(self, bounds: tuple[int, int]):
+        return self.rng.randint(bounds[0], bounds[1])
+
+    def getFloat(self, value: float):
+        if self.rng.random() < self.config.floatRatio:
+            return f"CS_FLOAT(0x{self.rng.getrandbits(32):08X}, {value}f)"
+        return f"{value}f"
+
+    def getCamPoints(self, legacy: bool, count: int, cmdName: str):
+        lines = []
+        pointName = {
+            "CS_CAM_POS_LIST": "CS_CAM_POS",
+            "CS_CAM_FOCUS_POINT_LIST": "CS_CAM_FOCUS_POINT",
+            "CS_CAM_POS_PLAYER_LIST": "CS_CAM_POS_PLAYER",
+            "CS_CAM_FOCUS_POINT_PLAYER_LIST": "CS_CAM_FOCUS_POINT_PLAYER",
+        }.get(cmdName, "CS_CAM_POINT")
+        count = max(count, 4)
+        for i in range(count):
+            if legacy:
+                flag = "CS_CMD_STOP" if i == count - 1 else "CS_CMD_CONTINUE"
+            else:
+                flag = "CS_CAM_STOP" if i == count - 1 else "CS_CAM_CONTINUE"
+            lines.append(
+                f"        {pointName}({flag}, 0x00, {self.rng.randint(1, 60)}, {self.rng.choice(['45.0', '60.0', '30.0', '70.399994'])}f, "
+                + f"{self.rng.randint(-3000, 3000)}, {self.rng.randint(-300, 800)}, {self.rng.randint(-3000, 3000)}, 0x{self.rng.randint(0, 0xFF):04X}),"
+            )
+        return lines
+
+    def getCues(self, legacy: bool, count: int, isPlayer: bool):
+        lines = []
+        frame = 0
+        cueName = ("CS_PLAYER_ACTION" if legacy else "CS_PLAYER_CUE") if isPlayer else ("CS_NPC_ACTION" if legacy else "CS_ACTOR_CUE")
+        for _ in range(count):
+            start = frame
+            frame += self.rng.randint(1, 60)
+            action = self.getEnum("csPlayerCueId") if isPlayer else f"0x{self.rng.randint(1, 20):04X}"
+            rot = self.rng.choice(["0x0000", "0x4000", "0x8000", f"DEG_TO_BINANG({self.rng.randint(0, 359)}.0)"])
+            startPos = [self.rng.randint(-2000, 2000) for _ in range(3)]
+            endPos = startPos if self.rng.random() < 0.3 else [self.rng.randint(-2000, 2000) for _ in range(3)]
+            sep = "\n            " if self.rng.random() < self.config.multilineRatio else " "
+            lines.append(
+                f"        {cueName}({action}, {start}, {frame}, 0x0000, {rot}, 0x0000, "
+                + f"{startPos[0]}, {startPos[1]}, {startPos[2]}, {endPos[0]}, {endPos[1]}, {endPos[2]},{sep}"
+                + f"{self.getFloat(0.0)}, {self.getFloat(self.rng.choice([1.5, -2.25, 0.0]))}, {self.getFloat(0.0)}),"
+            )
+        return lines
+
+    def getEntries(self, kind: str, legacy: bool, count: int, cmdName: str):
+        rng = self.rng
+        frames = [(i * 10, i * 10 + rng.randint(1, 30)) for i in range(count)]
+
+        if kind.startswith("cam"):
+            return self.getCamPoints(legacy, count, cmdName)
+        elif kind in ("actorCue", "playerCue"):
+            return self.getCues(legacy, count, kind == "playerCue")
+        elif kind == "misc":
+            return [f"        CS_MISC({self.getEnum('csMiscType')}, {s}, {e}, 0x0000, {unused10})," for s, e in frames]
+        elif kind == "text":
+            lines = []
+            for s, e in frames:
+                choice = rng.random()
+                if choice < 0.6:
+                    lines.append(f"        CS_TEXT(0x{rng.randint(0x1000, 0x70FF):04X}, {s}, {e}, {self.getEnum('csTextType')}, 0xFFFF, 0xFFFF),")
+                elif choice < 0.9:
+                    lines.append(f"        CS_TEXT_NONE({s}, {e}),")
+                else:
+                    name = "CS_TEXT_LEARN_SONG" if legacy else "CS_TEXT_OCARINA_ACTION"
+                    lines.append(f"        {name}({self.getEnum('ocarinaSongActionId')}, {s}, {e}, 0x{rng.randint(0x1000, 0x70FF):04X}),")
+            return lines
+        elif kind == "light":
+            name = "CS_LIGHTING" if legacy else "CS_LIGHT_SETTING"
+            return [f"        {name}(0x{rng.randint(1, 20):02X}, {s}, {e}, 0x0000, {unused10})," for s, e in frames]
+        elif kind in ("startSeq", "stopSeq"):
+            if legacy:
+                name = "CS_PLAY_BGM" if kind == "startSeq" else "CS_STOP_BGM"
+                return [f"        {name}(0x{rng.randint(2, 0x60):04X}, {s}, {e}, 0x0000, {unused8})," for s, e in frames]
+            name = "CS_START_SEQ" if kind == "startSeq" else "CS_STOP_SEQ"
+            return [f"        {name}({self.getEnum('seqId')}, {s}, {e}, 0x0000, {unused8})," for s, e in frames]
+        elif kind == "fadeSeq":
+            name = "CS_FADE_BGM" if legacy else "CS_FADE_OUT_SEQ"
+            return [f"        {name}({self.getEnum('csFadeOutSeqPlayer')}, {s}, {e}, 0x0000, {unused8})," for s, e in frames]
+        elif kind == "rumble":
+            name = "CS_CMD_09" if legacy else "CS_RUMBLE_CONTROLLER"
+            return [f"        {name}(0, {s}, {e}, {rng.randint(1, 255)}, {rng.randint(1, 30)}, {rng.randint(1, 10)}, 0x00, 0x00)," for s, e in frames]
+        elif kind == "time":
+            return [f"        CS_TIME(0, {s}, {e}, {rng.randint(0, 23)}, {rng.randint(0, 59)}, 0x00000000)," for s, e in frames]
+        raise ValueError(f"ERROR: Unknown list kind '{kind}'")
+
+    def getCutscene(self, name: str):
+        config = self.config
+        rng = self.rng
+        legacy = rng.random() < config.legacyRatio
+        commands: list[str] = []
+
+        kinds = list(listWeights.keys())
+        weights = list(listWeights.values())
+        for kind in rng.choices(kinds, weights, k=self.getRange(config.listsPerCutscene)):
+            cmdName = listNames[kind][1 if legacy else 0]
+            count = self.getRange(config.listLength)
+            entries = self.getEntries(kind, legacy, count, cmdName)
+
+            if kind.startswith("cam"):
+                header = f"    {cmdName}(0, {rng.randint(100, 1500)}),"
+            elif kind == "actorCue":
+                cmdType = rng.choice(self.actorCueTypes) if rng.random() < 0.8 else f"0x{rng.randint(0x0A, 0x90):04X}"
+                header = f"    {cmdName}({cmdType}, {len(entries)}),"
+            else:
+                header = f"    {cmdName}({len(entries)}),"
+            commands.append("\n".join([header, *entries]))
+
+        for _ in range(rng.randint(0, 2)):
+            transName = "CS_SCENE_TRANS_FX" if legacy else "CS_TRANSITION"
+            transType = self.getEnum("csTransitionType") if not legacy else f"0x{rng.randint(1, 10):04X}"
+            commands.append(f"    {transName}({transType}, {rng.randint(0, 500)}, {rng.randint(500, 1000)}),")
+
+        if rng.random() < 0.5:
+            destName = "CS_TERMINATOR" if legacy else "CS_DESTINATION"
+            destination = f"0x{rng.randint(1, 0x60):04X}" if legacy else self.getEnum("csDestination")
+            commands.append(f"    {destName}({destination}, {rng.randint(100, 2000)}, {rng.randint(100, 2000)}),")
+
+        rng.shuffle(commands)
+        return (
+            f"CutsceneData {name}[] = {{\n    CS_HEADER({len(commands)}, {rng.randint(100, 3000)}),\n"
+            + "\n".join(commands)
+            + "\n    CS_END_OF_SCRIPT(),\n};\n"
+        )
+
+    def getSceneFile(self, sceneName: str):
+        config = self.config
+        csNames = []
+        if self.rng.random() < config.cutsceneRatio:
+            csNames = [f"g{sceneName.title().replace('_', '')}Cs{i}" for i in range(self.getRange(config.cutscenesPerFile))]
+
+        lines = [f'#include "{sceneName}_scene.h"', '#include "segment_symbols.h"', '#include "z64cutscene_commands.h"', ""]
+
+        # scene headers, the first cutscene is used by the main header and the others by the alternate headers
+        altHeaders = [f"{sceneName}_scene_header{i:02}" for i in range(1, len(csNames))]
+        lines.append(f"SceneCmd {sceneName}_scene_header00[] = {{")
+        if len(altHeaders) > 0:
+            lines.append(f"    SCENE_CMD_ALTERNATE_HEADER_LIST({sceneName}_scene_altHeaders),")
+        lines.append(f"    SCENE_CMD_SOUND_SETTINGS(0x00, 0x00, 0x{self.rng.randint(0, 0x50):02X}),")
+        lines.append(f"    SCENE_CMD_ROOM_LIST(2, {sceneName}_scene_roomList),")
+        if len(csNames) > 0:
+            lines.append(f"    SCENE_CMD_CUTSCENE_DATA({csNames[0]}),")
+        lines.append("    SCENE_CMD_END(),")
+        lines.append("};")
+        lines.append("")
+
+        if len(altHeaders) > 0:
+            lines.append(f"SceneCmd* {sceneName}_scene_altHeaders[] = {{")
+            lines.extend(f"    {name}," for name in altHeaders)
+            lines.append("};")
+            lines.append("")
+
+        # some filler data, like the vertices and collision of real scene files
+        lines.append(f"Vec3s {sceneName}_scene_polygons[] = {{")
+        for _ in range(self.rng.randint(20, 200)):
+            lines.append(f"    {{ {self.rng.randint(-3000, 3000)}, {self.rng.randint(-3000, 3000)}, {self.rng.randint(-3000, 3000)} }},")
+        lines.append("};")
+        lines.append("")
+
+        for i, name in enumerate(csNames):
+            if i > 0:
+                lines.append(f"SceneCmd {altHeaders[i - 1]}[] = {{")
+                lines.append(f"    SCENE_CMD_CUTSCENE_DATA({name}),")
+                lines.append("    SCENE_CMD_END(),")
+                lines.append("};")
+                lines.append("")
+            lines.append(self.getCutscene(name))
+
+        return "\n".join(lines)
+
+
+def generateDecomp(root: Path, config: GeneratorConfig):
+    """Writes the fake decomp tree in ``root``, returns the number of files written"""
+
+    generator = SceneFileGenerator(config)
+    sceneFiles = {}
+    written = 0
+
+    for i in range(config.files):
+        sceneName = f"scene_{i:04}"
+        sceneFiles[sceneName] = generator.getSceneFile(sceneName)
+
+    for versionIndex, version in enumerate(config.versions):
+        for i, (sceneName, fileData) in enumerate(sceneFiles.items()):
+            # versions are mostly identical, like the real ones
+            if versionIndex > 0 and generator.rng.random() < config.versionChangeRatio:
+                fileData += f"\n// {version} only\n"
+
+            sceneDir = root / f"extracted/{version}/assets/scenes/area_{i % 8}/{sceneName}"
+            sceneDir.mkdir(parents=True, exist_ok=True)
+            (sceneDir / f"{sceneName}_scene.c").write_text(fileData, encoding="utf-8")
+            (sceneDir / f"{sceneName}_room_0.c").write_text(f'#include "{sceneName}_room_0.h"\n', encoding="utf-8")
+            written += 2
+
+    return written
+
+
+def addGeneratorArguments(parser: argparse.ArgumentParser):
+    defaults = GeneratorConfig()
+    parser.add_argument("--files", dest="files", type=int, help="scene files per version", default=defaults.files)
+    parser.add_argument("--versions", dest="versions", nargs="+", help="versions to generate", default=defaults.versions)
+    parser.add_argument("--cutscene-ratio", dest="cutsceneRatio", type=float, default=defaults.cutsceneRatio)
+    parser.add_argument("--cutscenes-per-file", dest="cutscenesPerFile", type=int, nargs=2, default=defaults.cutscenesPerFile)
+    parser.add_argument("--lists-per-cutscene", dest="listsPerCutscene", type=int, nargs=2, default=defaults.listsPerCutscene)
+    parser.add_argument("--list-length", dest="listLength", type=int, nargs=2, default=defaults.listLength)
+    parser.add_argument("--legacy-ratio", dest="legacyRatio", type=float, default=defaults.legacyRatio)
+    parser.add_argument("--float-ratio", dest="floatRatio", type=float, default=defaults.floatRatio)
+    parser.add_argument("--multiline-ratio", dest="multilineRatio", type=float, default=defaults.multilineRatio)
+    parser.add_argument("--version-change-ratio", dest="versionChangeRatio", type=float, default=defaults.versionChangeRatio)
+    parser.add_argument("--seed", dest="seed", type=int, default=defaults.seed)
+
+
+def getGeneratorConfig(args: argparse.Namespace):
+    return GeneratorConfig(
+        args.files,
+        args.versions,
+        args.cutsceneRatio,
+        tuple(args.cutscenesPerFile),
+        tuple(args.listsPerCutscene),
+        tuple(args.listLength),
+        args.legacyRatio,
+        args.floatRatio,
+        args.multilineRatio,
+        args.versionChangeRatio,
+        args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="writes a fake decomp tree with realistic scene files")
+    parser.add_argument("output", help="root of the fake decomp")
+    addGeneratorArguments(parser)
+    args = parser.parse_args()
+
+    written = generateDecomp(Path(args.output), getGeneratorConfig(args))
+    print(f"Wrote {written} files in '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
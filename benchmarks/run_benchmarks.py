@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+# End to end benchmarks of the cutscene import on a generated decomp tree (see ``gen_decomp.py``).
+# Each stage runs in its own process so the peak RSS reported is the one of that stage only.
+# Usage: python3 benchmarks/run_benchmarks.py --files 400 --output results.json
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from gen_decomp import addGeneratorArguments, generateDecomp, getGeneratorConfig
+from classes import Cutscene, CutsceneImport
+from corpus import CorpusReader, CorpusWriter
+
+
+stageNames = ["getParsedCutscenes", "getCutsceneList", "main", "corpusReload"]
+
+
+def getEntryCount(cutscene: Cutscene):
+    """Returns the number of commands of a cutscene, counting every list entry"""
+
+    count = len(cutscene.transitionList) + (1 if cutscene.destination is not None else 0)
+    for listName in [
+        "actorCueList",
+        "playerCueList",
+        "camEyeSplineList",
+        "camATSplineList",
+        "camEyeSplineRelPlayerList",
+        "camATSplineRelPlayerList",
+        "camEyeList",
+        "camATList",
+        "textList",
+        "miscList",
+        "rumbleList",
+        "lightSettingsList",
+        "timeList",
+        "seqList",
+        "fadeSeqList",
+    ]:
+        for cmdList in getattr(cutscene, listName):
+            count += 1 + len(cmdList.entries)
+    return count
+
+
+def runStage(stage: str, decomp_path: Path, version: str, jobs: int):
+    """Runs a single stage in the current process and returns its measures"""
+
+    importer = CutsceneImport(decomp_path, version, jobs)
+    files = len(importer.getSceneFiles())
+    start = time.perf_counter()
+
+    if stage == "getParsedCutscenes":
+        parsedCutscenes = importer.getParsedCutscenes() or []
+        elapsed = time.perf_counter() - start
+        cutscenes = len(parsedCutscenes)
+        entries = sum(len(cmdTokens) for parsedCS in parsedCutscenes for cmdTokens in parsedCS.csData)
+    elif stage == "getCutsceneList":
+        cutsceneList = importer.getCutsceneList()
+        elapsed = time.perf_counter() - start
+        cutscenes = len(cutsceneList)
+        entries = sum(getEntryCount(cutscene) for cutscene in cutsceneList)
+    elif stage == "main":
+        import main
+
+        sys.argv = ["main.py", "--decomp", str(decomp_path), "--version", version, "--jobs", str(jobs)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main()
+        elapsed = time.perf_counter() - start
+        cutscenes = entries = None
+    elif stage == "corpusReload":
+        # only the reload is timed, the corpus is exported before
+        corpus = CorpusWriter()
+        for cutscene in importer.getCutsceneList():
+            corpus.add(cutscene, "", version)
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            corpusPath = Path(tempDir) / "corpus.bin"
+            corpus.write(corpusPath)
+            del corpus
+
+            start = time.perf_counter()
+            with CorpusReader(corpusPath) as reader:
+                cutscenes = len(reader)
+                entries = sum(getEntryCount(cutscene) for cutscene in reader)
+            elapsed = time.perf_counter() - start
+    else:
+        raise ValueError(f"ERROR: Unknown stage '{stage}'")
+
+    # ``ru_maxrss`` is in kilobytes on Linux, the workers (if any) are counted separately
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    childUsage = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    if sys.platform == "darwin":
+        usage //= 1024
+        childUsage //= 1024
+
+    return {
+        "stage": stage,
+        "seconds": elapsed,
+        "files": files,
+        "cutscenes": cutscenes,
+        "entries": entries,
+        "filesPerSecond": files / elapsed,
+        "cutscenesPerSecond": cutscenes / elapsed if cutscenes is not None else None,
+        "entriesPerSecond": entries / elapsed if entries is not None else None,
+        "peakRSSKiB": max(usage, childUsage),
+    }
+
+
+def measureStage(stage: str, decomp_path: Path, version: str, jobs: int, repeat: int):
+    """Runs a stage ``repeat`` times in fresh processes and keeps the fastest run"""
+
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, "--stage", stage, "--decomp", str(decomp_path), "--version", version, "--jobs", str(jobs)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    best = min(results, key=lambda result: result["seconds"])
+    best["peakRSSKiB"] = max(result["peakRSSKiB"] for result in results)
+    return best
+
+
+def printResults(results: list[dict]):
+    print(f"{'stage':<20} {'seconds':>8} {'files/s':>9} {'cutscenes/s':>12} {'entries/s':>11} {'peak RSS':>10}")
+    for result in results:
+        cutscenesPerSecond = f"{result['cutscenesPerSecond']:.0f}" if result["cutscenesPerSecond"] is not None else "-"
+        entriesPerSecond = f"{result['entriesPerSecond']:.0f}" if result["entriesPerSecond"] is not None else "-"
+        print(
+            f"{result['stage']:<20} {result['seconds']:>8.3f} {result['filesPerSecond']:>9.0f} "
+            + f"{cutscenesPerSecond:>12} {entriesPerSecond:>11} {result['peakRSSKiB'] / 1024:>8.1f}MB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmarks the cutscene import end to end")
+    parser.add_argument("--decomp", "-d", dest="decomp_path", help="existing decomp tree to use instead of a generated one")
+    parser.add_argument("--version", "-v", dest="version", help="version to benchmark (first generated one by default)")
+    parser.add_argument("--jobs", "-j", dest="jobs", type=int, help="number of processes parsing scene files", default=1)
+    parser.add_argument("--repeat", dest="repeat", type=int, help="runs per stage, the fastest one is kept", default=3)
+    parser.add_argument("--output", "-o", dest="output", help="JSON file where the results are written")
+    parser.add_argument("--stage", dest="stage", choices=stageNames, help=argparse.SUPPRESS)
+    addGeneratorArguments(parser)
+    args = parser.parse_args()
+
+    if args.stage is not None:
+        # worker mode, used by ``measureStage()``
+        print(json.dumps(runStage(args.stage, Path(args.decomp_path), args.version, args.jobs)))
+        return
+
+    config = getGeneratorConfig(args)
+    version = args.version if args.version is not None else config.versions[0]
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        if args.decomp_path is not None:
+            decomp_path = Path(args.decomp_path).resolve()
+        else:
+            decomp_path = Path(tempDir)
+            generateDecomp(decomp_path, config)
+
+        results = [measureStage(stage, decomp_path, version, args.jobs, args.repeat) for stage in stageNames]
+
+    printResults(results)
+
+    if args.output is not None:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "version": version,
+            "jobs": args.jobs,
+            "generator": vars(config) if args.decomp_path is None else None,
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=4), encoding="utf-8")
+        print(f"Results written to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,573 @@
+import mmap
+import struct
+import sys
+
+from array import array
+from pathlib import Path
+from typing import Any
+
+from constants import oot_data
+from literals import getInteger
+from classes import (
+    Cutscene,
+    CutsceneCmdActorCue,
+    CutsceneCmdActorCueList,
+    CutsceneCmdCamAT,
+    CutsceneCmdCamATSpline,
+    CutsceneCmdCamATSplineRelToPlayer,
+    CutsceneCmdCamEye,
+    CutsceneCmdCamEyeSpline,
+    CutsceneCmdCamEyeSplineRelToPlayer,
+    CutsceneCmdCamPoint,
+    CutsceneCmdDestination,
+    CutsceneCmdFadeSeq,
+    CutsceneCmdFadeSeqList,
+    CutsceneCmdLightSetting,
+    CutsceneCmdLightSettingList,
+    CutsceneCmdMisc,
+    CutsceneCmdMiscList,
+    CutsceneCmdRumbleController,
+    CutsceneCmdRumbleControllerList,
+    CutsceneCmdStartStopSeq,
+    CutsceneCmdStartStopSeqList,
+    CutsceneCmdText,
+    CutsceneCmdTextList,
+    CutsceneCmdTextNone,
+    CutsceneCmdTextOcarinaAction,
+    CutsceneCmdTime,
+    CutsceneCmdTimeList,
+    CutsceneCmdTransition,
+)
+from columnar import ActorCueArray, CamPointArray
+
+
+# Decoder (and encoder) of the compiled cutscene data, the big endian words written by the ``z64cutscene_commands.h`` macros,
+# for the built object files and segment dumps that don't have C sources.
+# The data is read in place with ``struct.unpack_from()`` (``iter_unpack()`` on ``memoryview`` slices for the list entries),
+# nothing is tokenized, and the commands are built with ``params=None`` since there's no text to keep.
+# The values are decoded like the C path decodes the literals of the macros: enums give their key, rotations are hex strings,
+# camera flags are ``CS_CAM_CONTINUE``/``CS_CAM_STOP`` and floats are rounded back to the shortest ``f`` literal.
+# In columnar mode (see ``columnar.py``) the camera points and actor cues aren't unpacked one by one, each column is a strided
+# slice of the data read as an ``array``, so the cost of a list barely depends on its length.
+
+# layout of the header of the cutscene and of the lists: two words
+wordStruct = struct.Struct(">i")
+pairStruct = struct.Struct(">iI")
+
+# layout of each entry, the unused parameters are kept in the layout but not decoded
+camHeaderStruct = struct.Struct(">HHHH")  # 0x0001, startFrame, endFrame, 0x0000
+camPointStruct = struct.Struct(">bbHf3hh")  # continueFlag, camRoll, frame, viewAngle, pos, unused
+actorCueStruct = struct.Struct(">H2H3H6i3f")  # cueId, startFrame, endFrame, rot, startPos, endPos, unused floats
+miscStruct = struct.Struct(">HHHH40x")  # type, startFrame, endFrame, unused0, unused1-10
+lightSettingStruct = struct.Struct(">xBHHH40x")  # 0, lightSetting + 1, startFrame, endFrame, unused0, unused1-10
+seqStruct = struct.Struct(">HHHH28x")  # seqId + 1, startFrame, endFrame, unused0, unused1-7
+fadeSeqStruct = struct.Struct(">HHHH28x")  # seqPlayer, startFrame, endFrame, unused0, unused1-7
+textStruct = struct.Struct(">HHHHHH")  # textId, startFrame, endFrame, type, altTextId1, altTextId2
+timeStruct = struct.Struct(">HHHBB4x")  # unused0, startFrame, endFrame, hour, minute, unused1
+rumbleStruct = struct.Struct(">HHHBBBBH")  # unused0, startFrame, endFrame, sourceStrength, duration, decreaseRate, unused1-2
+transitionStruct = struct.Struct(">HHHH")  # type (or destination), startFrame, endFrame, endFrame
+
+CS_CMD_END_OF_SCRIPT = -1
+CS_TEXT_ID_NONE = 0xFFFF
+CS_CAM_STOP = -1
+
+csCmd = oot_data.enumData.enumByKey["csCmd"]
+playerCueId = oot_data.enumData.enumByKey["csPlayerCueId"]
+
+
+def getCmdIndex(cmdId: str):
+    return csCmd.itemById[cmdId].index
+
+
+# camera command type to the ``Cutscene`` attribute and the class of the command
+cameraCommands = {
+    getCmdIndex("CS_CMD_CAM_EYE_SPLINE"): ("camEyeSplineList", CutsceneCmdCamEyeSpline),
+    getCmdIndex("CS_CMD_CAM_AT_SPLINE"): ("camATSplineList", CutsceneCmdCamATSpline),
+    getCmdIndex("CS_CMD_CAM_EYE_SPLINE_REL_TO_PLAYER"): ("camEyeSplineRelPlayerList", CutsceneCmdCamEyeSplineRelToPlayer),
+    getCmdIndex("CS_CMD_CAM_AT_SPLINE_REL_TO_PLAYER"): ("camATSplineRelPlayerList", CutsceneCmdCamATSplineRelToPlayer),
+    getCmdIndex("CS_CMD_CAM_EYE"): ("camEyeList", CutsceneCmdCamEye),
+    getCmdIndex("CS_CMD_CAM_AT"): ("camATList", CutsceneCmdCamAT),
+}
+
+CS_CMD_MISC = getCmdIndex("CS_CMD_MISC")
+CS_CMD_LIGHT_SETTING = getCmdIndex("CS_CMD_LIGHT_SETTING")
+CS_CMD_RUMBLE_CONTROLLER = getCmdIndex("CS_CMD_RUMBLE_CONTROLLER")
+CS_CMD_PLAYER_CUE = getCmdIndex("CS_CMD_PLAYER_CUE")
+CS_CMD_TEXT = getCmdIndex("CS_CMD_TEXT")
+CS_CMD_TRANSITION = getCmdIndex("CS_CMD_TRANSITION")
+CS_CMD_START_SEQ = getCmdIndex("CS_CMD_START_SEQ")
+CS_CMD_STOP_SEQ = getCmdIndex("CS_CMD_STOP_SEQ")
+CS_CMD_FADE_OUT_SEQ = getCmdIndex("CS_CMD_FADE_OUT_SEQ")
+CS_CMD_TIME = getCmdIndex("CS_CMD_TIME")
+CS_CMD_DESTINATION = getCmdIndex("CS_CMD_DESTINATION")
+
+# the commands that aren't actor cue lists
+listCommands = {
+    CS_CMD_MISC,
+    CS_CMD_LIGHT_SETTING,
+    CS_CMD_RUMBLE_CONTROLLER,
+    CS_CMD_PLAYER_CUE,
+    CS_CMD_TEXT,
+    CS_CMD_TRANSITION,
+    CS_CMD_START_SEQ,
+    CS_CMD_STOP_SEQ,
+    CS_CMD_FADE_OUT_SEQ,
+    CS_CMD_TIME,
+    CS_CMD_DESTINATION,
+}
+
+ocarinaActionType = oot_data.enumData.enumByKey["csTextType"].itemById["CS_TEXT_OCARINA_ACTION"].index
+
+floatStruct = struct.Struct(">f")
+float32Memo: dict[float, float] = {}
+
+
+def getFloat32(value: float):
+    """Returns the shortest float with the same single precision value, like the ``f`` literal it was compiled from"""
+
+    result = float32Memo.get(value)
+    if result is None:
+        packed = floatStruct.pack(value)
+        for digits in range(1, 10):
+            result = float(f"{value:.{digits}g}")
+            if floatStruct.pack(result) == packed:
+                break
+        float32Memo[value] = result
+    return result
+
+
+def getEnumKey(enumKey: str, index: int):
+    """Returns the key of the enum item at ``index``, its hex value if there's none"""
+
+    item = oot_data.enumData.enumByKey[enumKey].itemByIndex.get(index)
+    return item.key if item is not None else f"0x{index:04X}"
+
+
+def getEnumIndex(enumKey: str, key: str):
+    """Returns the index of the enum item ``key``, the value of the literal if it's not an enum key"""
+
+    item = oot_data.enumData.enumByKey[enumKey].itemByKey.get(key)
+    return item.index if item is not None else getInteger(key)
+
+
+def getRotation(value: int):
+    return f"0x{value:04X}"
+
+
+def getCamFlag(flag: int):
+    return "CS_CAM_STOP" if flag == CS_CAM_STOP else "CS_CAM_CONTINUE" if flag == 0 else str(flag)
+
+
+def getColumns(data: Any, pos: int, end: int, typecode: str):
+    """Returns the data between ``pos`` and ``end`` as an array of ``typecode`` values in the native byte order"""
+
+    values = array(typecode)
+    values.frombytes(memoryview(data)[pos:end])
+    if values.itemsize > 1 and sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def decodeCamPoints(data: Any, pos: int, points: list[CutsceneCmdCamPoint]):
+    """Appends the camera points up to the stop point (included), returns the position after them"""
+
+    while True:
+        flag, camRoll, frame, viewAngle, x, y, z, _ = camPointStruct.unpack_from(data, pos)
+        pos += camPointStruct.size
+        points.append(
+            CutsceneCmdCamPoint(
+                None,
+                continueFlag=getCamFlag(flag),
+                camRoll=camRoll,
+                frame=frame,
+                viewAngle=getFloat32(viewAngle),
+                pos=[x, y, z],
+            )
+        )
+        if flag == CS_CAM_STOP:
+            return pos
+
+
+def decodeCamPointColumns(data: Any, pos: int):
+    """Returns the camera points up to the stop point (included) as a ``CamPointArray``, and the position after them"""
+
+    # the stop flag is searched in the flags of a growing number of points
+    view = memoryview(data)
+    window = 64
+    while True:
+        limit = min(pos + window * camPointStruct.size, len(view))
+        stop = view[pos:limit:camPointStruct.size].tobytes().find(b"\xff")
+        if stop != -1:
+            break
+        if limit == len(view):
+            raise IndexError("no stop point")
+        window *= 4
+    end = pos + (stop + 1) * camPointStruct.size
+
+    # every field is a whole number of bytes, halfwords or words: the columns are strided slices of the data
+    bytesColumns = getColumns(data, pos, end, "b")
+    shortColumns = getColumns(data, pos, end, "h")
+    floatColumns = getColumns(data, pos, end, "f")
+
+    points = CamPointArray()
+    flags = bytesColumns[0::16]
+    if flags.count(0) == stop:
+        points.flag = array("H", [points.flagTable.getIndex("CS_CAM_CONTINUE")]) * stop
+        points.flag.append(points.flagTable.getIndex("CS_CAM_STOP"))
+    else:
+        points.flag = array("H", [points.flagTable.getIndex(getCamFlag(flag)) for flag in flags])
+    points.camRoll = array("i", bytesColumns[1::16])
+    points.frame = array("i", getColumns(data, pos, end, "H")[1::8])
+    points.viewAngle = array("d", map(getFloat32, floatColumns[1::4]))
+    points.x = array("i", shortColumns[4::8])
+    points.y = array("i", shortColumns[5::8])
+    points.z = array("i", shortColumns[6::8])
+    return points, end
+
+
+def decodeActorCueColumns(data: Any, pos: int, count: int, isPlayer: bool):
+    """Returns the actor cues of a list as an ``ActorCueArray``, and the position after them"""
+
+    end = pos + actorCueStruct.size * count
+    halfColumns = getColumns(data, pos, end, "H")
+    wordColumns = getColumns(data, pos, end, "i")
+
+    cues = ActorCueArray()
+    if isPlayer:
+        for cueId in halfColumns[0::24]:
+            item = playerCueId.itemByIndex.get(cueId)
+            cues.appendAction(item.id if item is not None else cueId)
+    else:
+        cues.actionID = array("i", halfColumns[0::24])
+    cues.startFrame = array("i", halfColumns[1::24])
+    cues.endFrame = array("i", halfColumns[2::24])
+    cues.rotX = array("q", halfColumns[3::24])
+    cues.rotY = array("q", halfColumns[4::24])
+    cues.rotZ = array("q", halfColumns[5::24])
+    cues.startX = wordColumns[3::12]
+    cues.startY = wordColumns[4::12]
+    cues.startZ = wordColumns[5::12]
+    cues.endX = wordColumns[6::12]
+    cues.endY = wordColumns[7::12]
+    cues.endZ = wordColumns[8::12]
+    return cues, end
+
+
+def getEntries(data: Any, pos: int, entryStruct: struct.Struct, count: int):
+    # ``memoryview`` slices don't copy the data
+    end = pos + entryStruct.size * count
+    return entryStruct.iter_unpack(memoryview(data)[pos:end]), end
+
+
+def decodeCommand(cutscene: Cutscene, cmdType: int, data: Any, pos: int, columnar: bool):
+    """Decodes the command of type ``cmdType`` starting at ``pos`` (after its type) into the cutscene, returns its end"""
+
+    camera = cameraCommands.get(cmdType)
+    if camera is not None:
+        listName, cls = camera
+        _, startFrame, endFrame, _ = camHeaderStruct.unpack_from(data, pos)
+        command = cls(None, startFrame=startFrame, endFrame=endFrame)
+        getattr(cutscene, listName).append(command)
+        if columnar:
+            command.entries, pos = decodeCamPointColumns(data, pos + camHeaderStruct.size)
+            return pos
+        return decodeCamPoints(data, pos + camHeaderStruct.size, command.entries)
+
+    if cmdType == CS_CMD_TRANSITION or cmdType == CS_CMD_DESTINATION:
+        value, startFrame, endFrame, _ = transitionStruct.unpack_from(data, pos + 4)
+        if cmdType == CS_CMD_TRANSITION:
+            cutscene.transitionList.append(
+                CutsceneCmdTransition(
+                    None, startFrame=startFrame, endFrame=endFrame, type=getEnumKey("csTransitionType", value)
+                )
+            )
+        else:
+            cutscene.destination = CutsceneCmdDestination(None, startFrame=startFrame, id=getEnumKey("csDestination", value))
+        return pos + 4 + transitionStruct.size
+
+    (count,) = wordStruct.unpack_from(data, pos)
+    pos += 4
+
+    if cmdType == CS_CMD_MISC:
+        command = CutsceneCmdMiscList(None, entryTotal=count)
+        entries, pos = getEntries(data, pos, miscStruct, count)
+        for miscType, startFrame, endFrame, _ in entries:
+            command.entries.append(
+                CutsceneCmdMisc(None, startFrame=startFrame, endFrame=endFrame, type=getEnumKey("csMiscType", miscType))
+            )
+        cutscene.miscList.append(command)
+    elif cmdType == CS_CMD_LIGHT_SETTING:
+        command = CutsceneCmdLightSettingList(None, entryTotal=count)
+        entries, pos = getEntries(data, pos, lightSettingStruct, count)
+        for setting, startFrame, endFrame, _ in entries:
+            command.entries.append(
+                CutsceneCmdLightSetting(
+                    None, startFrame=startFrame, endFrame=endFrame, isLegacy=False, lightSetting=setting - 1
+                )
+            )
+        cutscene.lightSettingsList.append(command)
+    elif cmdType == CS_CMD_RUMBLE_CONTROLLER:
+        command = CutsceneCmdRumbleControllerList(None, entryTotal=count)
+        entries, pos = getEntries(data, pos, rumbleStruct, count)
+        for _, startFrame, endFrame, sourceStrength, duration, decreaseRate, _, _ in entries:
+            command.entries.append(
+                CutsceneCmdRumbleController(
+                    None,
+                    startFrame=startFrame,
+                    endFrame=endFrame,
+                    sourceStrength=sourceStrength,
+                    duration=duration,
+                    decreaseRate=decreaseRate,
+                )
+            )
+        cutscene.rumbleList.append(command)
+    elif cmdType == CS_CMD_TEXT:
+        command = CutsceneCmdTextList(None, entryTotal=count)
+        entries, pos = getEntries(data, pos, textStruct, count)
+        for textId, startFrame, endFrame, textType, altTextId1, altTextId2 in entries:
+            if textId == CS_TEXT_ID_NONE:
+                entry = CutsceneCmdTextNone(None, startFrame=startFrame, endFrame=endFrame)
+            elif textType == ocarinaActionType:
+                entry = CutsceneCmdTextOcarinaAction(
+                    None,
+                    startFrame=startFrame,
+                    endFrame=endFrame,
+                    ocarinaActionId=getEnumKey("ocarinaSongActionId", textId),
+                    messageId=altTextId1,
+                )
+            else:
+                # like the C path, the alternative text IDs are tuples
+                entry = CutsceneCmdText(
+                    None,
+                    startFrame=startFrame,
+                    endFrame=endFrame,
+                    textId=textId,
+                    type=getEnumKey("csTextType", textType),
+                    altTextId1=(altTextId1,),
+                    altTextId2=(altTextId2,),
+                )
+            command.entries.append(entry)
+        cutscene.textList.append(command)
+    elif cmdType == CS_CMD_START_SEQ or cmdType == CS_CMD_STOP_SEQ:
+        command = CutsceneCmdStartStopSeqList(None, entryTotal=count, type="start" if cmdType == CS_CMD_START_SEQ else "stop")
+        entries, pos = getEntries(data, pos, seqStruct, count)
+        for seqIdPlusOne, startFrame, endFrame, _ in entries:
+            command.entries.append(
+                CutsceneCmdStartStopSeq(
+                    None, startFrame=startFrame, endFrame=endFrame, isLegacy=False, seqId=getEnumKey("seqId", seqIdPlusOne - 1)
+                )
+            )
+        cutscene.seqList.append(command)
+    elif cmdType == CS_CMD_FADE_OUT_SEQ:
+        command = CutsceneCmdFadeSeqList(None, entryTotal=count)
+        entries, pos = getEntries(data, pos, fadeSeqStruct, count)
+        for seqPlayer, startFrame, endFrame, _ in entries:
+            command.entries.append(
+                CutsceneCmdFadeSeq(
+                    None, startFrame=startFrame, endFrame=endFrame, seqPlayer=getEnumKey("csFadeOutSeqPlayer", seqPlayer)
+                )
+            )
+        cutscene.fadeSeqList.append(command)
+    elif cmdType == CS_CMD_TIME:
+        command = CutsceneCmdTimeList(None, entryTotal=count)
+        entries, pos = getEntries(data, pos, timeStruct, count)
+        for _, startFrame, endFrame, hour, minute in entries:
+            command.entries.append(CutsceneCmdTime(None, startFrame=startFrame, endFrame=endFrame, hour=hour, minute=minute))
+        cutscene.timeList.append(command)
+    else:
+        # every other command type is an actor cue list, like in the game
+        isPlayer = cmdType == CS_CMD_PLAYER_CUE
+        commandType = "Player" if isPlayer else getEnumKey("csCmd", cmdType)
+        command = CutsceneCmdActorCueList(None, isPlayer=isPlayer, commandType=commandType, entryTotal=count)
+        (cutscene.playerCueList if isPlayer else cutscene.actorCueList).append(command)
+        if columnar:
+            command.entries, pos = decodeActorCueColumns(data, pos, count, isPlayer)
+            return pos
+
+        entries, pos = getEntries(data, pos, actorCueStruct, count)
+        for cueId, startFrame, endFrame, rotX, rotY, rotZ, *positions, _, _, _ in entries:
+            if isPlayer:
+                # the player cues are written with their enum ID in the C sources
+                item = playerCueId.itemByIndex.get(cueId)
+                cueId = item.id if item is not None else cueId
+            command.entries.append(
+                CutsceneCmdActorCue(
+                    None,
+                    startFrame=startFrame,
+                    endFrame=endFrame,
+                    actionID=cueId,
+                    rot=[getRotation(rotX), getRotation(rotY), getRotation(rotZ)],
+                    startPos=positions[:3],
+                    endPos=positions[3:],
+                )
+            )
+
+    return pos
+
+
+def decodeCutscene(data: Any, offset: int = 0, name: str = "", columnar: bool = False):
+    """
+    Returns the cutscene encoded at ``offset`` of ``data`` (any buffer) and its size in bytes.
+    With ``columnar``, the camera points and actor cues are stored as columns like ``CutsceneImport.columnar`` does.
+    """
+
+    totalEntries, frameCount = pairStruct.unpack_from(data, offset)
+    cutscene = Cutscene(name, totalEntries, frameCount)
+    pos = offset + pairStruct.size
+
+    try:
+        # like the C path, the commands are read up to ``CS_END_OF_SCRIPT()`` whatever the header says
+        while True:
+            (cmdType,) = wordStruct.unpack_from(data, pos)
+            pos += 4
+            if cmdType == CS_CMD_END_OF_SCRIPT:
+                pos += 4
+                break
+            pos = decodeCommand(cutscene, cmdType, data, pos, columnar)
+    except (struct.error, IndexError):
+        raise ValueError(f"ERROR: The cutscene data of '{name}' at 0x{offset:X} ends before its `CS_END_OF_SCRIPT()`")
+
+    return cutscene, pos - offset
+
+
+def readCutscenes(path: Path, offsets: dict[str, int], columnar: bool = False):
+    """Returns the cutscenes of a binary file (an object file or a segment dump) found at the given offsets, by name"""
+
+    with path.open("rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return [decodeCutscene(data, offset, name, columnar)[0] for name, offset in offsets.items()]
+
+
+def encodeCamPoints(points: list[Any]):
+    words = []
+    for point in points:
+        flag = point.continueFlag
+        flag = CS_CAM_STOP if "CS_CAM_STOP" in flag else 0 if flag == "CS_CAM_CONTINUE" else getInteger(flag)
+        words.append(camPointStruct.pack(flag, point.camRoll, point.frame, point.viewAngle, *point.pos, 0))
+    return words
+
+
+def encodeCutscene(cutscene: Cutscene):
+    """Returns the cutscene encoded like the macros do, the reverse of ``decodeCutscene()``"""
+
+    chunks = [pairStruct.pack(cutscene.totalEntries, cutscene.frameCount)]
+
+    def addList(cmdType: int, command: Any, entryStruct: struct.Struct, getValues):
+        chunks.append(pairStruct.pack(cmdType, len(command.entries)))
+        chunks.extend(entryStruct.pack(*getValues(entry)) for entry in command.entries)
+
+    for cmdType, (listName, _) in cameraCommands.items():
+        for command in getattr(cutscene, listName):
+            chunks.append(wordStruct.pack(cmdType) + camHeaderStruct.pack(1, command.startFrame, command.endFrame, 0))
+            chunks.extend(encodeCamPoints(command.entries))
+
+    def getCueValues(cue: Any):
+        actionID = cue.actionID
+        if isinstance(actionID, str):
+            item = playerCueId.itemById.get(actionID)
+            if item is None:
+                raise ValueError(f"ERROR: Can't encode the cue ID '{actionID}' of '{cutscene.name}'")
+            actionID = item.index
+        rot = [getInteger(value) & 0xFFFF for value in cue.rot]
+        return (actionID, cue.startFrame, cue.endFrame, *rot, *cue.startPos, *cue.endPos, 0.0, 0.0, 0.0)
+
+    for command in cutscene.actorCueList + cutscene.playerCueList:
+        if command.isPlayer:
+            cmdType = CS_CMD_PLAYER_CUE
+        elif command.commandType.startswith("0x"):
+            cmdType = getInteger(command.commandType)
+        else:
+            cmdType = getEnumIndex("csCmd", command.commandType)
+
+        if not command.isPlayer and (cmdType in listCommands or cmdType in cameraCommands or cmdType == CS_CMD_END_OF_SCRIPT):
+            # the game would read it as that command
+            raise ValueError(f"ERROR: Can't encode the actor cue list '{command.commandType}' of '{cutscene.name}'")
+
+        addList(cmdType, command, actorCueStruct, getCueValues)
+
+    for command in cutscene.miscList:
+        addList(
+            CS_CMD_MISC,
+            command,
+            miscStruct,
+            lambda misc: (getEnumIndex("csMiscType", misc.type), misc.startFrame, misc.endFrame, 0),
+        )
+
+    for command in cutscene.lightSettingsList:
+        addList(
+            CS_CMD_LIGHT_SETTING,
+            command,
+            lightSettingStruct,
+            lambda light: (light.lightSetting + 1, light.startFrame, light.endFrame, 0),
+        )
+
+    for command in cutscene.rumbleList:
+        addList(
+            CS_CMD_RUMBLE_CONTROLLER,
+            command,
+            rumbleStruct,
+            lambda rumble: (
+                0,
+                rumble.startFrame,
+                rumble.endFrame,
+                rumble.sourceStrength,
+                rumble.duration,
+                rumble.decreaseRate,
+                0,
+                0,
+            ),
+        )
+
+    def getTextValues(text: Any):
+        if isinstance(text, CutsceneCmdTextNone):
+            return (CS_TEXT_ID_NONE, text.startFrame, text.endFrame, CS_TEXT_ID_NONE, CS_TEXT_ID_NONE, CS_TEXT_ID_NONE)
+        if isinstance(text, CutsceneCmdTextOcarinaAction):
+            ocarinaAction = getEnumIndex("ocarinaSongActionId", text.ocarinaActionId)
+            return (ocarinaAction, text.startFrame, text.endFrame, ocarinaActionType, text.messageId, CS_TEXT_ID_NONE)
+        return (
+            text.textId & 0xFFFF,
+            text.startFrame,
+            text.endFrame,
+            getEnumIndex("csTextType", text.type),
+            text.altTextId1[0] & 0xFFFF,
+            text.altTextId2[0] & 0xFFFF,
+        )
+
+    for command in cutscene.textList:
+        addList(CS_CMD_TEXT, command, textStruct, getTextValues)
+
+    for command in cutscene.seqList:
+        addList(
+            CS_CMD_START_SEQ if command.type == "start" else CS_CMD_STOP_SEQ,
+            command,
+            seqStruct,
+            lambda seq: (getEnumIndex("seqId", seq.seqId) + 1, seq.startFrame, seq.endFrame, 0),
+        )
+
+    for command in cutscene.fadeSeqList:
+        addList(
+            CS_CMD_FADE_OUT_SEQ,
+            command,
+            fadeSeqStruct,
+            lambda fade: (getEnumIndex("csFadeOutSeqPlayer", fade.seqPlayer), fade.startFrame, fade.endFrame, 0),
+        )
+
+    for command in cutscene.timeList:
+        addList(CS_CMD_TIME, command, timeStruct, lambda time: (0, time.startFrame, time.endFrame, time.hour, time.minute))
+
+    for transition in cutscene.transitionList:
+        transitionType = getEnumIndex("csTransitionType", transition.type)
+        chunks.append(
+            pairStruct.pack(CS_CMD_TRANSITION, 1)
+            + transitionStruct.pack(transitionType, transition.startFrame, transition.endFrame, transition.endFrame)
+        )
+
+    if cutscene.destination is not None:
+        destination = getEnumIndex("csDestination", cutscene.destination.id)
+        startFrame = cutscene.destination.startFrame
+        chunks.append(
+            pairStruct.pack(CS_CMD_DESTINATION, 1) + transitionStruct.pack(destination, startFrame, startFrame + 1, startFrame + 1)
+        )
+
+    chunks.append(pairStruct.pack(CS_CMD_END_OF_SCRIPT, 0))
+    return b"".join(chunks)
@@ -0,0 +1,192 @@
+import pickle
+
+from collections import Counter
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Optional
+
+from constants import ootCSLegacyToNewCmdNames
+
+
+# bump this when the format of the cache file changes
+CACHE_FORMAT = 1
+
+# files the parse results depend on, editing one of them invalidates the whole cache
+srcDir = Path(__file__).parent
+dependencyFiles = [
+    srcDir / "classes.py",
+    srcDir / "columnar.py",
+    srcDir / "constants.py",
+    srcDir / "diagnostics.py",
+    srcDir / "headers.py",
+    srcDir / "literals.py",
+    srcDir / "prefilter.py",
+    srcDir / "tokenizer.py",
+    srcDir / "usage.py",
+    *sorted(srcDir.glob("data/*.py")),
+    srcDir / "data/xml/ActorList.xml",
+    srcDir / "data/xml/EnumData.xml",
+    srcDir / "data/xml/ObjectList.xml",
+]
+
+
+def getFileDigest(data: bytes):
+    return sha256(data).hexdigest()
+
+
+def getFingerprint():
+    """Returns a hash of everything that can change the result of parsing a scene file"""
+
+    hash = sha256(f"{CACHE_FORMAT}".encode())
+    hash.update(repr(sorted(ootCSLegacyToNewCmdNames.items())).encode())
+    for path in dependencyFiles:
+        hash.update(path.read_bytes())
+    return hash.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """This class contains the cached result of a single scene file"""
+
+    mtime: int
+    size: int
+    digest: str
+    result: Any
+
+
+class DigestIndex:
+    """
+    Results of the scene files by content digest, shared by the caches of several versions so identical files are only
+    parsed once. Identical files have the same size, so the sizes of the files still to be looked up are counted
+    and a result is only kept while a file of its size is left: the index doesn't keep every parsed file until the end.
+    """
+
+    def __init__(self):
+        self.pendingSizes: Counter[int] = Counter()
+        self.results: dict[int, dict[str, Any]] = {}  # by size then digest
+
+    def addFiles(self, paths: list[Path]):
+        """Counts files that will be looked up later"""
+
+        for path in paths:
+            self.pendingSizes[path.stat().st_size] += 1
+
+    def removeFiles(self, paths: list[Path]):
+        """Counts files added with ``addFiles()`` that won't be looked up after all"""
+
+        for path in paths:
+            self.release(path.stat().st_size)
+
+    def release(self, size: int):
+        """Returns the results a file of this size can reuse, they are dropped if no other file of this size is left"""
+
+        if self.pendingSizes[size] > 1:
+            self.pendingSizes[size] -= 1
+            return self.results.get(size, {})
+
+        del self.pendingSizes[size]
+        return self.results.pop(size, {})
+
+    def isPending(self, size: int):
+        return size in self.pendingSizes
+
+    def add(self, size: int, digest: str, result: Any):
+        if self.isPending(size):
+            self.results.setdefault(size, {}).setdefault(digest, result)
+
+
+class ParseCache:
+    """
+    Cache of the processed cutscenes of every scene file of a version, kept on the disk if ``cache_dir`` is set.
+    Sharing a ``DigestIndex`` between caches lets identical files be parsed only once.
+    """
+
+    def __init__(self, cache_dir: Optional[Path], name: str, digestIndex: Optional[DigestIndex] = None):
+        self.path = cache_dir / f"{name}.pickle" if cache_dir is not None else None
+        self.entries: dict[str, CacheEntry] = {}
+        self.digestIndex = digestIndex
+        self.usedKeys: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+        if self.path is not None:
+            self.fingerprint = getFingerprint()
+
+            try:
+                with self.path.open("rb") as file:
+                    data = pickle.load(file)
+
+                if data["fingerprint"] == self.fingerprint:
+                    self.entries = data["entries"]
+            except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError):
+                # a missing or broken cache is the same as an empty one
+                pass
+
+    def isShared(self, size: int):
+        return self.digestIndex is not None and self.digestIndex.isPending(size)
+
+    def share(self, size: int, digest: str, result: Any):
+        if self.digestIndex is not None:
+            self.digestIndex.add(size, digest, result)
+
+    def lookup(self, path: Path):
+        """
+        Returns the cached entry of this file if it's still valid, otherwise ``None`` and the file's digest
+        (``None`` too if the result has nowhere to be stored)
+        """
+
+        key = str(path)
+        stat = path.stat()
+        entry = self.entries.get(key)
+        self.usedKeys.add(key)
+        shared = self.digestIndex.release(stat.st_size) if self.digestIndex is not None else {}
+
+        if entry is not None and entry.mtime == stat.st_mtime_ns and entry.size == stat.st_size:
+            # use the same objects for every identical file
+            entry.result = shared.get(entry.digest, entry.result)
+            self.share(stat.st_size, entry.digest, entry.result)
+            self.hits += 1
+            return entry, None
+
+        # without a cache file nor identical files to share the result with, the content doesn't need to be hashed
+        if entry is None and self.path is None and len(shared) == 0 and not self.isShared(stat.st_size):
+            self.misses += 1
+            return None, None
+
+        # the file was touched (or never seen), compare the content before parsing it again
+        digest = getFileDigest(path.read_bytes())
+        if entry is not None and entry.digest == digest or digest in shared:
+            result = shared.get(digest, entry.result if entry is not None else None)
+            entry = CacheEntry(stat.st_mtime_ns, stat.st_size, digest, result)
+            self.share(stat.st_size, digest, entry.result)
+            if self.path is not None:
+                self.entries[key] = entry
+            self.hits += 1
+            return entry, None
+
+        self.misses += 1
+        return None, digest
+
+    def store(self, path: Path, digest: str, result: Any):
+        stat = path.stat()
+        self.share(stat.st_size, digest, result)
+
+        # without a cache file, the results are only kept for the identical files still to come
+        if self.path is not None:
+            self.entries[str(path)] = CacheEntry(stat.st_mtime_ns, stat.st_size, digest, result)
+
+    def save(self):
+        """Writes the cache to the disk, files that weren't looked up during this run are dropped"""
+
+        if self.path is None:
+            return
+
+        entries = {key: entry for key, entry in self.entries.items() if key in self.usedKeys}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so an interrupted run can't leave a broken cache
+        tmpPath = self.path.with_suffix(".tmp")
+        with tmpPath.open("wb") as file:
+            pickle.dump({"fingerprint": self.fingerprint, "entries": entries}, file, pickle.HIGHEST_PROTOCOL)
+        tmpPath.replace(self.path)
@@ -0,0 +1,209 @@
+import numpy as np
+
+from array import array
+
+from classes import Cutscene
+from columnar import CamPointArray
+
+
+# Evaluation of the camera splines (``CS_CAM_EYE_SPLINE()``, ``CS_CAM_AT_SPLINE()`` and the rel-to-player ones), sampled per frame.
+# Each segment of a spline is a uniform cubic B-spline over 4 consecutive camera points, the game moves to the next segment
+# after ``frame`` frames of the second point of the segment (so a spline of n points has n - 3 segments).
+# The points of every cutscene are gathered in flat arrays first, then every spline of the corpus is sampled
+# and measured at once with NumPy, the only Python loops are over the commands, never over the points or the frames.
+
+# ``Cutscene`` attribute of the camera splines to whether they move the eye (camera position) or the AT (looked at point)
+splineLists = {
+    "camEyeSplineList": True,
+    "camATSplineList": False,
+    "camEyeSplineRelPlayerList": True,
+    "camATSplineRelPlayerList": False,
+}
+
+cameraMetricNames = [
+    "cameraSplines",  # number of camera splines
+    "cameraPathLength",  # distance travelled by the eye, in units
+    "cameraMaxSpeed",  # highest distance travelled by the eye in a single frame, in units
+    "cameraRotation",  # total rotation of the view direction (from the eye to the AT), in degrees
+    "cameraMinFOV",  # field of view range, in degrees (0 without camera splines)
+    "cameraMaxFOV",
+]
+
+
+# coefficients of u^3, u^2, u and 1 for each of the 4 control points of a segment
+splineBasis = np.array([[-1, 3, -3, 1], [3, -6, 3, 0], [-3, 0, 3, 0], [1, 4, 1, 0]]) / 6.0
+
+
+def isStopFlag(flag: str):
+    # same test as the import
+    return "CS_CAM_STOP" in flag or "-1" in flag
+
+
+class CameraSplineBatch:
+    """Camera points of the cutscenes added to it, evaluated together by ``getMetrics()``"""
+
+    def __init__(self):
+        self.rows = 0  # number of cutscenes added
+
+        # every camera point, splines are contiguous
+        self.x = array("d")
+        self.y = array("d")
+        self.z = array("d")
+        self.viewAngle = array("d")
+        self.frame = array("q")
+
+        # every spline: its first point, number of points (up to the stop point), cutscene row and kind
+        self.splineStarts = array("q")
+        self.splineCounts = array("q")
+        self.splineRows = array("q")
+        self.splineIsEye = array("b")
+
+        # eye and AT splines running together, to measure the rotation of the view
+        self.eyeSplines = array("q")
+        self.atSplines = array("q")
+
+    def addPoints(self, points):
+        if isinstance(points, CamPointArray):
+            stop = next((i for i, flag in enumerate(points.flag) if isStopFlag(points.flagTable.strings[flag])), None)
+            end = stop + 1 if stop is not None else len(points)
+            # the columns are converted to the types of the batch
+            self.x.extend(array("d", points.x[:end]))
+            self.y.extend(array("d", points.y[:end]))
+            self.z.extend(array("d", points.z[:end]))
+            self.viewAngle.extend(points.viewAngle[:end])
+            self.frame.extend(array("q", points.frame[:end]))
+            return end
+
+        count = 0
+        for point in points:
+            self.x.append(point.pos[0])
+            self.y.append(point.pos[1])
+            self.z.append(point.pos[2])
+            self.viewAngle.append(point.viewAngle)
+            self.frame.append(point.frame)
+            count += 1
+            if isStopFlag(point.continueFlag):
+                break
+        return count
+
+    def add(self, cutscene: Cutscene):
+        row = self.rows
+        self.rows += 1
+
+        for listName, isEye in splineLists.items():
+            splines: dict[int, int] = {}  # start frame to the spline index, to pair the eye and AT splines
+
+            for command in getattr(cutscene, listName):
+                splineIndex = len(self.splineStarts)
+                self.splineStarts.append(len(self.frame))
+                self.splineCounts.append(self.addPoints(command.entries))
+                self.splineRows.append(row)
+                self.splineIsEye.append(isEye)
+                splines[command.startFrame] = splineIndex
+
+            # AT lists follow their eye list in ``splineLists``
+            if isEye:
+                eyeSplines = splines
+            else:
+                for startFrame, atSpline in splines.items():
+                    eyeSpline = eyeSplines.get(startFrame)
+                    if eyeSpline is not None:
+                        self.eyeSplines.append(eyeSpline)
+                        self.atSplines.append(atSpline)
+
+    def getSamples(self):
+        """Returns the spline index, position and field of view of every frame of every spline"""
+
+        points = np.stack([np.frombuffer(self.x), np.frombuffer(self.y), np.frombuffer(self.z)], axis=1)
+        viewAngle = np.frombuffer(self.viewAngle)
+        frame = np.frombuffer(self.frame, dtype=np.int64)
+        splineStarts = np.frombuffer(self.splineStarts, dtype=np.int64)
+        splineCounts = np.frombuffer(self.splineCounts, dtype=np.int64)
+
+        # segments: first point, spline, duration and number of samples (the last segment also samples its end)
+        segmentCounts = np.maximum(splineCounts - 3, 0)
+        segmentSplines = np.repeat(np.arange(len(splineCounts)), segmentCounts)
+        segmentFirst = np.cumsum(segmentCounts) - segmentCounts
+        segmentIndices = np.arange(len(segmentSplines)) - np.repeat(segmentFirst, segmentCounts)
+        segmentPoints = splineStarts[segmentSplines] + segmentIndices
+        durations = np.maximum(frame[segmentPoints + 1], 1) if len(segmentPoints) > 0 else np.zeros(0, dtype=np.int64)
+        isLast = segmentIndices == segmentCounts[segmentSplines] - 1
+        sampleCounts = durations + isLast
+
+        # samples: segment and position in the segment (``u`` from 0 to 1)
+        sampleSegments = np.repeat(np.arange(len(segmentPoints)), sampleCounts)
+        sampleFirst = np.cumsum(sampleCounts) - sampleCounts
+        u = (np.arange(len(sampleSegments)) - np.repeat(sampleFirst, sampleCounts)) / durations[sampleSegments]
+
+        # each segment is turned into a polynomial of ``u`` (with the coefficients of the uniform cubic B-spline),
+        # repeated for its samples and evaluated with Horner's method
+        controlPoints = segmentPoints[:, None] + np.arange(4)
+        values = []
+        for column in (points[:, 0], points[:, 1], points[:, 2], viewAngle):
+            polynomials = np.repeat(column[controlPoints] @ splineBasis.T, sampleCounts, axis=0)
+            values.append(((polynomials[:, 0] * u + polynomials[:, 1]) * u + polynomials[:, 2]) * u + polynomials[:, 3])
+
+        positions = np.stack(values[:3], axis=1)
+        fov = values[3]
+
+        return segmentSplines[sampleSegments], positions, fov
+
+    def getMetrics(self):
+        """Returns the value of each metric of ``cameraMetricNames`` for every cutscene, in the order they were added"""
+
+        splineRows = np.frombuffer(self.splineRows, dtype=np.int64)
+        splineIsEye = np.frombuffer(self.splineIsEye, dtype=np.int8).astype(bool)
+        sampleSplines, positions, fov = self.getSamples()
+        sampleRows = splineRows[sampleSplines]
+
+        metrics = {"cameraSplines": np.bincount(splineRows, minlength=self.rows)}
+
+        # distance moved since the previous frame of the same spline
+        sameSpline = sampleSplines[1:] == sampleSplines[:-1]
+        speeds = np.linalg.norm(positions[1:] - positions[:-1], axis=1)[sameSpline]
+        speedSplines = sampleSplines[1:][sameSpline]
+        isEye = splineIsEye[speedSplines]
+        eyeRows = splineRows[speedSplines][isEye]
+        metrics["cameraPathLength"] = np.bincount(eyeRows, speeds[isEye], minlength=self.rows)
+        metrics["cameraMaxSpeed"] = np.zeros(self.rows)
+        np.maximum.at(metrics["cameraMaxSpeed"], eyeRows, speeds[isEye])
+
+        metrics["cameraRotation"] = self.getRotations(sampleSplines, positions)
+
+        hasSplines = metrics["cameraSplines"] > 0
+        metrics["cameraMinFOV"] = np.full(self.rows, np.inf)
+        metrics["cameraMaxFOV"] = np.zeros(self.rows)
+        np.minimum.at(metrics["cameraMinFOV"], sampleRows, fov)
+        np.maximum.at(metrics["cameraMaxFOV"], sampleRows, fov)
+        metrics["cameraMinFOV"][~hasSplines | np.isinf(metrics["cameraMinFOV"])] = 0.0
+
+        return metrics
+
+    def getRotations(self, sampleSplines: np.ndarray, positions: np.ndarray):
+        """Returns the total rotation of the view direction of every cutscene, from its paired eye and AT splines"""
+
+        rotations = np.zeros(self.rows)
+        if len(self.eyeSplines) == 0 or len(sampleSplines) == 0:
+            return rotations
+
+        eyeSplines = np.frombuffer(self.eyeSplines, dtype=np.int64)
+        atSplines = np.frombuffer(self.atSplines, dtype=np.int64)
+        splineCount = len(self.splineStarts)
+        sampleStarts = np.searchsorted(sampleSplines, np.arange(splineCount))
+        sampleCounts = np.bincount(sampleSplines, minlength=splineCount)
+
+        # the frames both splines of a pair have
+        pairCounts = np.minimum(sampleCounts[eyeSplines], sampleCounts[atSplines])
+        pairs = np.repeat(np.arange(len(eyeSplines)), pairCounts)
+        offsets = np.arange(len(pairs)) - np.repeat(np.cumsum(pairCounts) - pairCounts, pairCounts)
+
+        directions = positions[sampleStarts[atSplines][pairs] + offsets] - positions[sampleStarts[eyeSplines][pairs] + offsets]
+        lengths = np.linalg.norm(directions, axis=1)
+        directions /= np.where(lengths > 0, lengths, 1.0)[:, None]
+
+        # the direction is undefined when the eye and the AT are at the same place
+        samePair = (pairs[1:] == pairs[:-1]) & (lengths[1:] > 0) & (lengths[:-1] > 0)
+        cosines = np.clip(np.einsum("ij,ij->i", directions[1:], directions[:-1]), -1.0, 1.0)[samePair]
+        angles = np.degrees(np.arccos(cosines))
+        splineRows = np.frombuffer(self.splineRows, dtype=np.int64)
+        return np.bincount(splineRows[eyeSplines][pairs[1:][samePair]], angles, minlength=self.rows)
@@ -1,502 +1,392 @@
-import re
-
-from dataclasses import dataclass, field
-from struct import unpack
-from typing import Optional
+import sys
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache, partial
+from os import cpu_count
+from typing import Any, Callable, Optional
 from pathlib import Path
 
-from constants import (
-    ootCutsceneCommandsC,
-    ootCSSingleCommands,
-    ootCSListCommands,
-    ootCSListEntryCommands,
-    ootCSListAndSingleCommands,
-    ootCSLegacyToNewCmdNames,
-    oot_data,
-)
-
-
-def getInteger(number: str):
-    """Returns an int number (handles properly negative hex numbers)"""
+from cache import DigestIndex, ParseCache
+from constants import oot_data
+from diagnostics import Diagnostic, DiagnosticReport, FileCutscenes, ParamCountError, getDiagnostic
+from headers import SceneHeaderIndex
+from literals import getInteger, getRotation, cs_import_float, getEnumKey, splitArgs, decodeInteger, decodeFloat
+from prefilter import PrefilterStats, findMarker, readFromMarker
+from profiler import Profiler, noProfile
+from tokenizer import CutsceneToken, tokenizeCutscenes, groupCommands
+from usage import CommandUsage
 
-    if number.startswith("0x"):
-        number = number.removeprefix("0x")
 
-        # ``"0" * (8 - len(number)`` adds the missing zeroes (if necessary) to have a 8 digit hex number
-        return unpack("!i", bytes.fromhex("0" * (8 - len(number)) + number))[0]
-    else:
-        return int(number)
+# Every command class and its decoding from the macro parameters are generated from ``commandSchema`` when this module
+# is imported: a ``__slots__`` class per command class and a decoder function per macro, with the conversion of each
+# parameter written inline. Supporting a new command is adding its entry to the table.
+# The parameter indices are based on the commands arguments from ``z64cutscene_commands.h``.
 
 
-def getRotation(data: str):
-    """Returns the rotation converted to hexadecimal"""
+@dataclass(frozen=True)
+class CommandArg:
+    """A field of a command and the macro parameters it's read from"""
 
-    if "DEG_TO_BINANG" in data or not "0x" in data:
-        angle = float(data.split("(")[1].removesuffix(")") if "DEG_TO_BINANG" in data else data)
-        binang = int(angle * (0x8000 / 180.0))  # from ``DEG_TO_BINANG()`` in decomp
+    name: str
+    kind: str  # see ``argExpressions``, ``enum`` uses ``enumKey``
+    index: int | tuple[int, ...]  # a tuple makes a list field (positions, rotations)
+    enumKey: Optional[str] = None
+    legacyOffByOne: bool = False  # the ``L_`` variant of the macro writes the value plus one
+
+
+@dataclass(frozen=True)
+class CommandSchema:
+    """How a macro is decoded and where its command is added"""
+
+    className: str
+    doc: str
+    paramNumber: int  # expected number of parameters inside the parsed commands, this account for the unused parameters
+    args: tuple[CommandArg, ...] = ()
+    listName: Optional[str] = None  # ``Cutscene`` attribute of the command, ``None`` for the list entries
+    values: dict[str, Any] = field(default_factory=dict)  # fields with a constant value for this macro
+    classValues: dict[str, Any] = field(default_factory=dict)  # attributes shared by the instances
+    hasEntries: bool = False
+
+    @property
+    def hasLegacy(self):
+        return any(arg.legacyOffByOne for arg in self.args)
+
+
+def getIntegerOrId(value: str):
+    try:
+        return getInteger(value)
+    except ValueError:
+        return value
+
+
+def getCommandType(value: str):
+    if value.startswith("0x"):
+        # make it a 4 digit hex
+        value = value.removeprefix("0x")
+        return "0x" + "0" * (4 - len(value)) + value
+    return oot_data.enumData.enumByKey["csCmd"].itemById[value].key
+
+
+# the numbers are read with the typed decoders of ``literals.py``,
+# the rotations and identifiers keep the spelling of the sources
+argExpressions = {
+    "int": "decodeInteger({})",
+    "float": "decodeFloat({})",
+    "str": "{}",
+    "rot": "getRotation({})",
+    "intOrId": "getIntegerOrId({})",
+    "intTuple": "(decodeInteger({}),)",
+    "cmdType": "getCommandType({})",
+}
 
-        # if the angle value is higher than 0xFFFF it means we're at 360 degrees
-        return f"0x{0xFFFF if binang > 0xFFFF else binang:04X}"
-    else:
-        return data
+startEndFrames = (CommandArg("startFrame", "int", 0), CommandArg("endFrame", "int", 1))
+frames = (CommandArg("startFrame", "int", 1), CommandArg("endFrame", "int", 2))
+entryTotal = (CommandArg("entryTotal", "int", 0),)
+
+camPointSchema = CommandSchema(
+    "CutsceneCmdCamPoint",
+    "This class contains a single Camera Point command data",
+    8,
+    (
+        CommandArg("continueFlag", "str", 0),
+        CommandArg("camRoll", "int", 1),
+        CommandArg("frame", "int", 2),
+        CommandArg("viewAngle", "float", 3),
+        CommandArg("pos", "int", (4, 5, 6)),
+    ),
+)
 
+actorCueSchema = CommandSchema(
+    "CutsceneCmdActorCue",
+    "This class contains a single Actor Cue command data",
+    15,
+    (
+        *frames,
+        CommandArg("actionID", "intOrId", 0),
+        CommandArg("rot", "rot", (3, 4, 5)),
+        CommandArg("startPos", "int", (6, 7, 8)),
+        CommandArg("endPos", "int", (9, 10, 11)),
+    ),
+)
 
-def cs_import_float(v_str: str):
-    return float(v_str.removesuffix("f"))
+seqSchema = CommandSchema(
+    "CutsceneCmdStartStopSeq",
+    "This class contains Start/Stop Seq command data",
+    11,
+    (*frames, CommandArg("seqId", "enum", 0, "seqId", True)),
+)
 
 
-# NOTE: ``paramNumber`` is the expected number of parameters inside the parsed commands,
-# this account for the unused parameters. Every classes are based on the commands arguments from ``z64cutscene_commands.h``
+def getSplineSchema(className: str, doc: str, listName: str):
+    return CommandSchema(className, doc, 2, startEndFrames, listName, hasEntries=True)
+
+
+def getListSchema(className: str, doc: str, listName: str, values: Optional[dict[str, Any]] = None):
+    return CommandSchema(className, doc, 1, entryTotal, listName, values if values is not None else {}, hasEntries=True)
+
+
+# NOTE: the camera eye and AT points are not used in the final game and lack polish, it is recommended to use splines
+commandSchema: dict[str, CommandSchema] = {
+    "CS_CAM_POINT": camPointSchema,
+    "CS_MISC": CommandSchema(
+        "CutsceneCmdMisc",
+        "This class contains a single misc command entry",
+        14,
+        (*frames, CommandArg("type", "enum", 0, "csMiscType")),  # see ``CutsceneMiscType`` in decomp
+    ),
+    "CS_LIGHT_SETTING": CommandSchema(
+        "CutsceneCmdLightSetting",
+        "This class contains Light Setting command data",
+        14,
+        (*frames, CommandArg("lightSetting", "int", 0, legacyOffByOne=True)),
+    ),
+    "CS_TIME": CommandSchema(
+        "CutsceneCmdTime",
+        "This class contains Time Ocarina Action command data",
+        5,
+        (*frames, CommandArg("hour", "int", 3), CommandArg("minute", "int", 4)),
+    ),
+    "CS_FADE_OUT_SEQ": CommandSchema(
+        "CutsceneCmdFadeSeq",
+        "This class contains Fade Seq command data",
+        11,
+        (*frames, CommandArg("seqPlayer", "enum", 0, "csFadeOutSeqPlayer")),
+        classValues={"enumKey": "csFadeOutSeqPlayer"},
+    ),
+    "CS_RUMBLE_CONTROLLER": CommandSchema(
+        "CutsceneCmdRumbleController",
+        "This class contains Rumble Controller command data",
+        8,
+        (
+            *frames,
+            CommandArg("sourceStrength", "int", 3),
+            CommandArg("duration", "int", 4),
+            CommandArg("decreaseRate", "int", 5),
+        ),
+    ),
+    "CS_TEXT": CommandSchema(
+        "CutsceneCmdText",
+        "This class contains Text command data",
+        6,
+        (
+            *frames,
+            CommandArg("textId", "int", 0),
+            CommandArg("type", "enum", 3, "csTextType"),
+            CommandArg("altTextId1", "intTuple", 4),
+            CommandArg("altTextId2", "intTuple", 5),
+        ),
+        classValues={"id": "Text"},
+    ),
+    "CS_TEXT_NONE": CommandSchema(
+        "CutsceneCmdTextNone",
+        "This class contains Text None command data",
+        2,
+        startEndFrames,
+        classValues={"id": "None"},
+    ),
+    "CS_TEXT_OCARINA_ACTION": CommandSchema(
+        "CutsceneCmdTextOcarinaAction",
+        "This class contains Text Ocarina Action command data",
+        4,
+        (*frames, CommandArg("ocarinaActionId", "enum", 0, "ocarinaSongActionId"), CommandArg("messageId", "int", 3)),
+        classValues={"id": "OcarinaAction"},
+    ),
+    "CS_START_SEQ": seqSchema,
+    "CS_STOP_SEQ": seqSchema,
+    "CS_ACTOR_CUE": actorCueSchema,
+    "CS_PLAYER_CUE": actorCueSchema,
+    "CS_CAM_EYE_SPLINE": getSplineSchema(
+        "CutsceneCmdCamEyeSpline", "This class contains the Camera Eye Spline data", "camEyeSplineList"
+    ),
+    "CS_CAM_AT_SPLINE": getSplineSchema(
+        "CutsceneCmdCamATSpline", "This class contains the Camera AT (look-at) Spline data", "camATSplineList"
+    ),
+    "CS_CAM_EYE_SPLINE_REL_TO_PLAYER": getSplineSchema(
+        "CutsceneCmdCamEyeSplineRelToPlayer",
+        "This class contains the Camera Eye Spline Relative to the Player data",
+        "camEyeSplineRelPlayerList",
+    ),
+    "CS_CAM_AT_SPLINE_REL_TO_PLAYER": getSplineSchema(
+        "CutsceneCmdCamATSplineRelToPlayer",
+        "This class contains the Camera AT Spline Relative to the Player data",
+        "camATSplineRelPlayerList",
+    ),
+    "CS_CAM_EYE": getSplineSchema("CutsceneCmdCamEye", "This class contains a single Camera Eye point", "camEyeList"),
+    "CS_CAM_AT": getSplineSchema("CutsceneCmdCamAT", "This class contains a single Camera AT point", "camATList"),
+    "CS_MISC_LIST": getListSchema("CutsceneCmdMiscList", "This class contains Misc command data", "miscList"),
+    "CS_TRANSITION": CommandSchema(
+        "CutsceneCmdTransition",
+        "This class contains Transition command data",
+        3,
+        (*frames, CommandArg("type", "enum", 0, "csTransitionType")),
+        "transitionList",
+    ),
+    "CS_TEXT_LIST": getListSchema("CutsceneCmdTextList", "This class contains Text List command data", "textList"),
+    "CS_LIGHT_SETTING_LIST": getListSchema(
+        "CutsceneCmdLightSettingList", "This class contains Light Setting List command data", "lightSettingsList"
+    ),
+    "CS_TIME_LIST": getListSchema("CutsceneCmdTimeList", "This class contains Time List command data", "timeList"),
+    "CS_FADE_OUT_SEQ_LIST": getListSchema(
+        "CutsceneCmdFadeSeqList", "This class contains Fade Seq List command data", "fadeSeqList"
+    ),
+    "CS_RUMBLE_CONTROLLER_LIST": getListSchema(
+        "CutsceneCmdRumbleControllerList", "This class contains Rumble Controller List command data", "rumbleList"
+    ),
+    "CS_START_SEQ_LIST": getListSchema(
+        "CutsceneCmdStartStopSeqList", "This class contains Start/Stop Seq List command data", "seqList", {"type": "start"}
+    ),
+    "CS_STOP_SEQ_LIST": getListSchema(
+        "CutsceneCmdStartStopSeqList", "This class contains Start/Stop Seq List command data", "seqList", {"type": "stop"}
+    ),
+    "CS_ACTOR_CUE_LIST": CommandSchema(
+        "CutsceneCmdActorCueList",
+        "This class contains the Actor Cue List command data",
+        2,
+        (CommandArg("commandType", "cmdType", 0), CommandArg("entryTotal", "int", 1)),
+        "actorCueList",
+        {"isPlayer": False},
+        hasEntries=True,
+    ),
+    "CS_PLAYER_CUE_LIST": getListSchema(
+        "CutsceneCmdActorCueList",
+        "This class contains the Actor Cue List command data",
+        "playerCueList",
+        {"isPlayer": True, "commandType": "Player"},
+    ),
+    "CS_DESTINATION": CommandSchema(
+        "CutsceneCmdDestination",
+        "This class contains Destination command data",
+        3,
+        (CommandArg("id", "enum", 0, "csDestination"), CommandArg("startFrame", "int", 1)),
+        "destination",
+    ),
+}
 
 
-@dataclass
 class CutsceneCmdBase:
-    """This class contains common Cutscene data"""
-
-    params: list[str]
-
-    startFrame: Optional[int] = None
-    endFrame: Optional[int] = None
-
-    def getEnumValue(self, enumKey: str, index: int, isSeqLegacy: bool = False):
-        enum = oot_data.enumData.enumByKey[enumKey]
-        item = enum.itemById.get(self.params[index])
-        if item is None:
-            setting = getInteger(self.params[index])
-            if isSeqLegacy:
-                setting -= 1
-            item = enum.itemByIndex.get(setting)
-        return item.key if item is not None else self.params[index]
-
-
-@dataclass
-class CutsceneCmdCamPoint(CutsceneCmdBase):
-    """This class contains a single Camera Point command data"""
-
-    continueFlag: Optional[str] = None
-    camRoll: Optional[int] = None
-    frame: Optional[int] = None
-    viewAngle: Optional[float] = None
-    pos: list[int] = field(default_factory=list)
-    paramNumber: int = 8
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.continueFlag = self.params[0]
-            self.camRoll = getInteger(self.params[1])
-            self.frame = getInteger(self.params[2])
-            self.viewAngle = cs_import_float(self.params[3])
-            self.pos = [getInteger(self.params[4]), getInteger(self.params[5]), getInteger(self.params[6])]
-
-
-@dataclass
-class CutsceneCmdActorCue(CutsceneCmdBase):
-    """This class contains a single Actor Cue command data"""
-
-    actionID: Optional[int | str] = None
-    rot: list[str] = field(default_factory=list)
-    startPos: list[int] = field(default_factory=list)
-    endPos: list[int] = field(default_factory=list)
-    paramNumber: int = 15
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            try:
-                self.actionID = getInteger(self.params[0])
-            except ValueError:
-                self.actionID = self.params[0]
-            self.rot = [getRotation(self.params[3]), getRotation(self.params[4]), getRotation(self.params[5])]
-            self.startPos = [getInteger(self.params[6]), getInteger(self.params[7]), getInteger(self.params[8])]
-            self.endPos = [getInteger(self.params[9]), getInteger(self.params[10]), getInteger(self.params[11])]
-
-
-@dataclass
-class CutsceneCmdActorCueList(CutsceneCmdBase):
-    """This class contains the Actor Cue List command data"""
-
-    isPlayer: bool = False
-    commandType: Optional[str] = None
-    entryTotal: Optional[int] = None
-    entries: list[CutsceneCmdActorCue] = field(default_factory=list)
-    paramNumber: int = 2
-    listName: str = "actorCueList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            if self.isPlayer:
-                self.commandType = "Player"
-                self.entryTotal = getInteger(self.params[0])
-            else:
-                self.commandType = self.params[0]
-                if self.commandType.startswith("0x"):
-                    # make it a 4 digit hex
-                    self.commandType = self.commandType.removeprefix("0x")
-                    self.commandType = "0x" + "0" * (4 - len(self.commandType)) + self.commandType
-                else:
-                    self.commandType = oot_data.enumData.enumByKey["csCmd"].itemById[self.commandType].key
-                self.entryTotal = getInteger(self.params[1].strip())
-
-
-@dataclass
-class CutsceneCmdCamEyeSpline(CutsceneCmdBase):
-    """This class contains the Camera Eye Spline data"""
-
-    entries: list[CutsceneCmdCamPoint] = field(default_factory=list)
-    paramNumber: int = 2
-    listName: str = "camEyeSplineList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[0])
-            self.endFrame = getInteger(self.params[1])
-
-
-@dataclass
-class CutsceneCmdCamATSpline(CutsceneCmdBase):
-    """This class contains the Camera AT (look-at) Spline data"""
-
-    entries: list[CutsceneCmdCamPoint] = field(default_factory=list)
-    paramNumber: int = 2
-    listName: str = "camATSplineList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[0])
-            self.endFrame = getInteger(self.params[1])
-
-
-@dataclass
-class CutsceneCmdCamEyeSplineRelToPlayer(CutsceneCmdBase):
-    """This class contains the Camera Eye Spline Relative to the Player data"""
-
-    entries: list[CutsceneCmdCamPoint] = field(default_factory=list)
-    paramNumber: int = 2
-    listName: str = "camEyeSplineRelPlayerList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[0])
-            self.endFrame = getInteger(self.params[1])
-
-
-@dataclass
-class CutsceneCmdCamATSplineRelToPlayer(CutsceneCmdBase):
-    """This class contains the Camera AT Spline Relative to the Player data"""
-
-    entries: list[CutsceneCmdCamPoint] = field(default_factory=list)
-    paramNumber: int = 2
-    listName: str = "camATSplineRelPlayerList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[0])
-            self.endFrame = getInteger(self.params[1])
-
-
-@dataclass
-class CutsceneCmdCamEye(CutsceneCmdBase):
-    """This class contains a single Camera Eye point"""
-
-    # This feature is not used in the final game and lacks polish, it is recommended to use splines in all cases.
-    entries: list = field(default_factory=list)
-    paramNumber: int = 2
-    listName: str = "camEyeList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[0])
-            self.endFrame = getInteger(self.params[1])
-
-
-@dataclass
-class CutsceneCmdCamAT(CutsceneCmdBase):
-    """This class contains a single Camera AT point"""
-
-    # This feature is not used in the final game and lacks polish, it is recommended to use splines in all cases.
-    entries: list = field(default_factory=list)
-    paramNumber: int = 2
-    listName: str = "camATList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[0])
-            self.endFrame = getInteger(self.params[1])
-
-
-@dataclass
-class CutsceneCmdMisc(CutsceneCmdBase):
-    """This class contains a single misc command entry"""
-
-    type: Optional[str] = None  # see ``CutsceneMiscType`` in decomp
-    paramNumber: int = 14
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.type = self.getEnumValue("csMiscType", 0)
-
-
-@dataclass
-class CutsceneCmdMiscList(CutsceneCmdBase):
-    """This class contains Misc command data"""
-
-    entryTotal: Optional[int] = None
-    entries: list[CutsceneCmdMisc] = field(default_factory=list)
-    paramNumber: int = 1
-    listName: str = "miscList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.entryTotal = getInteger(self.params[0])
-
-
-@dataclass
-class CutsceneCmdTransition(CutsceneCmdBase):
-    """This class contains Transition command data"""
-
-    type: Optional[str] = None
-    paramNumber: int = 3
-    listName: str = "transitionList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.type = self.getEnumValue("csTransitionType", 0)
-
-
-@dataclass
-class CutsceneCmdText(CutsceneCmdBase):
-    """This class contains Text command data"""
-
-    textId: Optional[int] = None
-    type: Optional[str] = None
-    altTextId1: Optional[int] = None
-    altTextId2: Optional[int] = None
-    paramNumber: int = 6
-    id: str = "Text"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.textId = getInteger(self.params[0])
-            self.type = self.getEnumValue("csTextType", 3)
-            self.altTextId1 = (getInteger(self.params[4]),)
-            self.altTextId2 = (getInteger(self.params[5]),)
-
-
-@dataclass
-class CutsceneCmdTextNone(CutsceneCmdBase):
-    """This class contains Text None command data"""
-
-    paramNumber: int = 2
-    id: str = "None"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[0])
-            self.endFrame = getInteger(self.params[1])
-
-
-@dataclass
-class CutsceneCmdTextOcarinaAction(CutsceneCmdBase):
-    """This class contains Text Ocarina Action command data"""
-
-    ocarinaActionId: Optional[str] = None
-    messageId: Optional[int] = None
-    paramNumber: int = 4
-    id: str = "OcarinaAction"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.ocarinaActionId = self.getEnumValue("ocarinaSongActionId", 0)
-            self.messageId = getInteger(self.params[3])
-
-
-@dataclass
-class CutsceneCmdTextList(CutsceneCmdBase):
-    """This class contains Text List command data"""
-
-    entryTotal: Optional[int] = None
-    entries: list[CutsceneCmdText | CutsceneCmdTextNone | CutsceneCmdTextOcarinaAction] = field(default_factory=list)
-    paramNumber: int = 1
-    listName: str = "textList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.entryTotal = getInteger(self.params[0])
-
-
-@dataclass
-class CutsceneCmdLightSetting(CutsceneCmdBase):
-    """This class contains Light Setting command data"""
-
-    isLegacy: Optional[bool] = None
-    lightSetting: Optional[int] = None
-    paramNumber: int = 14
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.lightSetting = getInteger(self.params[0])
-            if self.isLegacy:
-                self.lightSetting -= 1
-
-
-@dataclass
-class CutsceneCmdLightSettingList(CutsceneCmdBase):
-    """This class contains Light Setting List command data"""
-
-    entryTotal: Optional[int] = None
-    entries: list[CutsceneCmdLightSetting] = field(default_factory=list)
-    paramNumber: int = 1
-    listName: str = "lightSettingsList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.entryTotal = getInteger(self.params[0])
-
-
-@dataclass
-class CutsceneCmdTime(CutsceneCmdBase):
-    """This class contains Time Ocarina Action command data"""
-
-    hour: Optional[int] = None
-    minute: Optional[int] = None
-    paramNumber: int = 5
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.hour = getInteger(self.params[3])
-            self.minute = getInteger(self.params[4])
-
-
-@dataclass
-class CutsceneCmdTimeList(CutsceneCmdBase):
-    """This class contains Time List command data"""
-
-    entryTotal: Optional[int] = None
-    entries: list[CutsceneCmdTime] = field(default_factory=list)
-    paramNumber: int = 1
-    listName: str = "timeList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.entryTotal = getInteger(self.params[0])
-
-
-@dataclass
-class CutsceneCmdStartStopSeq(CutsceneCmdBase):
-    """This class contains Start/Stop Seq command data"""
-
-    isLegacy: Optional[bool] = None
-    seqId: Optional[str] = None
-    paramNumber: int = 11
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.seqId = self.getEnumValue("seqId", 0, self.isLegacy)
-
-
-@dataclass
-class CutsceneCmdStartStopSeqList(CutsceneCmdBase):
-    """This class contains Start/Stop Seq List command data"""
-
-    entryTotal: Optional[int] = None
-    type: Optional[str] = None
-    entries: list[CutsceneCmdStartStopSeq] = field(default_factory=list)
-    paramNumber: int = 1
-    listName: str = "seqList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.entryTotal = getInteger(self.params[0])
-
-
-@dataclass
-class CutsceneCmdFadeSeq(CutsceneCmdBase):
-    """This class contains Fade Seq command data"""
-
-    seqPlayer: Optional[str] = None
-    paramNumber: int = 11
-    enumKey: str = "csFadeOutSeqPlayer"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.seqPlayer = self.getEnumValue("csFadeOutSeqPlayer", 0)
-
-
-@dataclass
-class CutsceneCmdFadeSeqList(CutsceneCmdBase):
-    """This class contains Fade Seq List command data"""
-
-    entryTotal: Optional[int] = None
-    entries: list[CutsceneCmdFadeSeq] = field(default_factory=list)
-    paramNumber: int = 1
-    listName: str = "fadeSeqList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.entryTotal = getInteger(self.params[0])
-
-
-@dataclass
-class CutsceneCmdRumbleController(CutsceneCmdBase):
-    """This class contains Rumble Controller command data"""
-
-    sourceStrength: Optional[int] = None
-    duration: Optional[int] = None
-    decreaseRate: Optional[int] = None
-    paramNumber: int = 8
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.startFrame = getInteger(self.params[1])
-            self.endFrame = getInteger(self.params[2])
-            self.sourceStrength = getInteger(self.params[3])
-            self.duration = getInteger(self.params[4])
-            self.decreaseRate = getInteger(self.params[5])
-
-
-@dataclass
-class CutsceneCmdRumbleControllerList(CutsceneCmdBase):
-    """This class contains Rumble Controller List command data"""
-
-    entryTotal: Optional[int] = None
-    entries: list[CutsceneCmdRumbleController] = field(default_factory=list)
-    paramNumber: int = 1
-    listName: str = "rumbleList"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.entryTotal = getInteger(self.params[0])
-
-
-@dataclass
-class CutsceneCmdDestination(CutsceneCmdBase):
-    """This class contains Destination command data"""
-
-    id: Optional[str] = None
-    paramNumber: int = 3
-    listName: str = "destination"
-
-    def __post_init__(self):
-        if self.params is not None:
-            self.id = self.getEnumValue("csDestination", 0)
-            self.startFrame = getInteger(self.params[1])
+    """This class contains common Cutscene data, the command classes are generated from ``commandSchema``"""
+
+    __slots__ = ()
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: Any):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+def getFieldNames(cmdSchema: CommandSchema):
+    names = [arg.name for arg in cmdSchema.args] + list(cmdSchema.values)
+    if cmdSchema.hasLegacy:
+        names.append("isLegacy")
+    if cmdSchema.hasEntries:
+        names.append("entries")
+    return names
+
+
+def getArgExpression(arg: CommandArg):
+    """Returns the source of the conversion of an argument from ``params``"""
+
+    def getValue(index: int):
+        param = f"params[{index}]"
+        if arg.kind == "enum":
+            return f"getEnumKey({arg.enumKey!r}, {param}{', isLegacy' if arg.legacyOffByOne else ''})"
+        expression = argExpressions[arg.kind].format(param)
+        return f"({expression} - 1 if isLegacy else {expression})" if arg.legacyOffByOne else expression
+
+    if isinstance(arg.index, tuple):
+        return f"[{', '.join(getValue(index) for index in arg.index)}]"
+    return getValue(arg.index)
+
+
+def generateCommands(schema: dict[str, CommandSchema]):
+    """Returns the command classes by name and the decoder of each macro"""
+
+    classSchemas: dict[str, CommandSchema] = {}  # first macro of each class
+    classFields: dict[str, list[str]] = {}
+    for cmdSchema in schema.values():
+        classSchemas.setdefault(cmdSchema.className, cmdSchema)
+        names = classFields.setdefault(cmdSchema.className, ["params", "startFrame", "endFrame"])
+        names.extend(name for name in getFieldNames(cmdSchema) if not name in names)
+
+    listFields = {
+        arg.name for cmdSchema in schema.values() for arg in cmdSchema.args if isinstance(arg.index, tuple)
+    } | {"entries"}
+
+    classes: dict[str, type] = {}
+    for className, names in classFields.items():
+        cmdSchema = classSchemas[className]
+        lines = [f"def __init__(self, params, {', '.join(f'{name}=None' for name in names[1:])}):"]
+        for name in names:
+            value = f"{name} if {name} is not None else []" if name in listFields else name
+            lines.append(f"    self.{name} = {value}")
+        namespace = {}
+        exec("\n".join(lines), namespace)
+
+        attributes = {"__slots__": tuple(names), "__doc__": cmdSchema.doc, "__module__": __name__}
+        attributes |= {"__init__": namespace["__init__"], "paramNumber": cmdSchema.paramNumber}
+        if cmdSchema.listName is not None:
+            attributes["listName"] = cmdSchema.listName
+        classes[className] = type(className, (CutsceneCmdBase,), attributes | cmdSchema.classValues)
+
+    decoders: dict[str, Callable] = {}
+    namespace = {
+        "decodeInteger": decodeInteger,
+        "decodeFloat": decodeFloat,
+        "getRotation": getRotation,
+        "getEnumKey": getEnumKey,
+        "getIntegerOrId": getIntegerOrId,
+        "getCommandType": getCommandType,
+    } | classes
+    for cmdName, cmdSchema in schema.items():
+        values = {arg.name: getArgExpression(arg) for arg in cmdSchema.args}
+        values |= {name: repr(value) for name, value in cmdSchema.values.items()}
+        if cmdSchema.hasLegacy:
+            values["isLegacy"] = "isLegacy"
+
+        args = ", ".join(values.get(name, "None") for name in classFields[cmdSchema.className][1:])
+        source = f"def decode_{cmdName}(params, isLegacy=False):\n    return {cmdSchema.className}(params, {args})"
+        exec(source, namespace)
+        decoders[cmdName] = namespace[f"decode_{cmdName}"]
+
+    return classes, decoders
+
+
+commandClasses, cmdToDecoder = generateCommands(commandSchema)
+
+CutsceneCmdCamPoint = commandClasses["CutsceneCmdCamPoint"]
+CutsceneCmdActorCue = commandClasses["CutsceneCmdActorCue"]
+CutsceneCmdActorCueList = commandClasses["CutsceneCmdActorCueList"]
+CutsceneCmdCamEyeSpline = commandClasses["CutsceneCmdCamEyeSpline"]
+CutsceneCmdCamATSpline = commandClasses["CutsceneCmdCamATSpline"]
+CutsceneCmdCamEyeSplineRelToPlayer = commandClasses["CutsceneCmdCamEyeSplineRelToPlayer"]
+CutsceneCmdCamATSplineRelToPlayer = commandClasses["CutsceneCmdCamATSplineRelToPlayer"]
+CutsceneCmdCamEye = commandClasses["CutsceneCmdCamEye"]
+CutsceneCmdCamAT = commandClasses["CutsceneCmdCamAT"]
+CutsceneCmdMisc = commandClasses["CutsceneCmdMisc"]
+CutsceneCmdMiscList = commandClasses["CutsceneCmdMiscList"]
+CutsceneCmdTransition = commandClasses["CutsceneCmdTransition"]
+CutsceneCmdText = commandClasses["CutsceneCmdText"]
+CutsceneCmdTextNone = commandClasses["CutsceneCmdTextNone"]
+CutsceneCmdTextOcarinaAction = commandClasses["CutsceneCmdTextOcarinaAction"]
+CutsceneCmdTextList = commandClasses["CutsceneCmdTextList"]
+CutsceneCmdLightSetting = commandClasses["CutsceneCmdLightSetting"]
+CutsceneCmdLightSettingList = commandClasses["CutsceneCmdLightSettingList"]
+CutsceneCmdTime = commandClasses["CutsceneCmdTime"]
+CutsceneCmdTimeList = commandClasses["CutsceneCmdTimeList"]
+CutsceneCmdStartStopSeq = commandClasses["CutsceneCmdStartStopSeq"]
+CutsceneCmdStartStopSeqList = commandClasses["CutsceneCmdStartStopSeqList"]
+CutsceneCmdFadeSeq = commandClasses["CutsceneCmdFadeSeq"]
+CutsceneCmdFadeSeqList = commandClasses["CutsceneCmdFadeSeqList"]
+CutsceneCmdRumbleController = commandClasses["CutsceneCmdRumbleController"]
+CutsceneCmdRumbleControllerList = commandClasses["CutsceneCmdRumbleControllerList"]
+CutsceneCmdDestination = commandClasses["CutsceneCmdDestination"]
 
 
 @dataclass
@@ -527,46 +417,14 @@ class Cutscene:
     fadeSeqList: list[CutsceneCmdFadeSeqList] = field(default_factory=list)
 
 
-cmdToClass = {
-    "CS_CAM_POINT": CutsceneCmdCamPoint,
-    "CS_MISC": CutsceneCmdMisc,
-    "CS_LIGHT_SETTING": CutsceneCmdLightSetting,
-    "CS_TIME": CutsceneCmdTime,
-    "CS_FADE_OUT_SEQ": CutsceneCmdFadeSeq,
-    "CS_RUMBLE_CONTROLLER": CutsceneCmdRumbleController,
-    "CS_TEXT": CutsceneCmdText,
-    "CS_TEXT_NONE": CutsceneCmdTextNone,
-    "CS_TEXT_OCARINA_ACTION": CutsceneCmdTextOcarinaAction,
-    "CS_START_SEQ": CutsceneCmdStartStopSeq,
-    "CS_STOP_SEQ": CutsceneCmdStartStopSeq,
-    "CS_ACTOR_CUE": CutsceneCmdActorCue,
-    "CS_PLAYER_CUE": CutsceneCmdActorCue,
-    "CS_CAM_EYE_SPLINE": CutsceneCmdCamEyeSpline,
-    "CS_CAM_AT_SPLINE": CutsceneCmdCamATSpline,
-    "CS_CAM_EYE_SPLINE_REL_TO_PLAYER": CutsceneCmdCamEyeSplineRelToPlayer,
-    "CS_CAM_AT_SPLINE_REL_TO_PLAYER": CutsceneCmdCamATSplineRelToPlayer,
-    "CS_CAM_EYE": CutsceneCmdCamEye,
-    "CS_CAM_AT": CutsceneCmdCamAT,
-    "CS_MISC_LIST": CutsceneCmdMiscList,
-    "CS_TRANSITION": CutsceneCmdTransition,
-    "CS_TEXT_LIST": CutsceneCmdTextList,
-    "CS_LIGHT_SETTING_LIST": CutsceneCmdLightSettingList,
-    "CS_TIME_LIST": CutsceneCmdTimeList,
-    "CS_FADE_OUT_SEQ_LIST": CutsceneCmdFadeSeqList,
-    "CS_RUMBLE_CONTROLLER_LIST": CutsceneCmdRumbleControllerList,
-    "CS_START_SEQ_LIST": CutsceneCmdStartStopSeqList,
-    "CS_STOP_SEQ_LIST": CutsceneCmdStartStopSeqList,
-    "CS_ACTOR_CUE_LIST": CutsceneCmdActorCueList,
-    "CS_PLAYER_CUE_LIST": CutsceneCmdActorCueList,
-    "CS_DESTINATION": CutsceneCmdDestination,
-}
+cmdToClass = {cmdName: commandClasses[cmdSchema.className] for cmdName, cmdSchema in commandSchema.items()}
 
 @dataclass
 class ParsedCutscene:
     """Local class used to order the parsed cutscene properly"""
 
     csName: str
-    csData: list[str]  # contains every command lists or standalone ones like ``CS_TRANSITION()``
+    csData: list[list[CutsceneToken]]  # contains every command lists or standalone ones like ``CS_TRANSITION()``
 
 
 @dataclass
@@ -575,215 +433,402 @@ class CutsceneImport:
 
     decomp_path: Path
     version: str
+    jobs: int = 1  # number of worker processes, 0 means one per CPU core
+    cache_dir: Optional[Path] = None  # where to keep the parse cache, disabled if ``None``
+    columnar: bool = False  # store camera points and actor cues as columns (see ``columnar.py``)
+    profiler: Optional[Profiler] = None  # measures the import stages if set (see ``profiler.py``)
+    prefilterStats: PrefilterStats = field(default_factory=PrefilterStats)  # shared by the copies made for each version
+    headerIndex: Optional[SceneHeaderIndex] = None  # filled with the scene headers during the prefilter if set
+    resilient: bool = False  # skip what can't be imported instead of raising, described in ``diagnostics``
+    diagnostics: DiagnosticReport = field(default_factory=DiagnosticReport)  # shared by the copies made for each version
+    usage: bool = False  # count the commands of every scene file while tokenizing it, returned with its cutscenes
+
+    def profile(self, name: str, category: str = "stage"):
+        """Returns the context measuring ``name`` if profiling, a no-op one otherwise"""
+
+        return self.profiler.measure(name, category) if self.profiler is not None else noProfile
+
+    def getSceneFiles(self):
+        """Returns the path of every scene file of this version, sorted to keep the output deterministic"""
+
+        scene_dir = self.decomp_path.resolve() / f"extracted/{self.version}/assets/scenes/"
+        sceneFiles: list[Path] = []
+
+        with self.profile("directory walk"):
+            for dirpath, _, filenames in scene_dir.walk():
+                for filename in filenames:
+                    if "_scene.c" in filename:
+                        sceneFiles.append(dirpath / filename)
+
+        return sorted(sceneFiles)
+
+    def prefilterSceneFiles(self, sceneFiles: list[Path]):
+        """
+        Returns the scene files containing cutscene data, the other ones are counted in ``prefilterStats``.
+        The scene headers of every file are added to ``headerIndex`` if it's set.
+        """
+
+        keptFiles: list[Path] = []
+
+        with self.profile("prefilter"):
+            for path in sceneFiles:
+                scan = None
+                if self.headerIndex is not None:
+                    scan = partial(self.headerIndex.addSceneFile, self.version, path.parent.name)
+
+                offset, size = findMarker(path, scan=scan)
+                self.prefilterStats.add(size, offset == -1)
+                if offset != -1:
+                    keptFiles.append(path)
+
+        return keptFiles
+
+    def mapSceneFiles(self, func, sceneFiles: list[Path], cache: Optional[ParseCache] = None):
+        """
+        Yields the path, content digest, result of ``func`` and whether it comes from the cache for every scene file,
+        in the same order as ``sceneFiles``. The results that don't come from the cache should be stored if they have
+        a digest, it's ``None`` when the file isn't hashed (no cache file and no other file can have the same content).
+        """
+
+        # the profiler can only measure what runs in this process
+        jobs = self.jobs if self.jobs > 0 else cpu_count() or 1
+        if self.profiler is not None:
+            jobs = 1
+        executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and len(sceneFiles) > 1 else None
+        maxPending = jobs * 4 if executor is not None else 0
+        pending: deque[tuple[Path, Optional[str], bool, Future]] = deque()
+
+        try:
+            for path in sceneFiles:
+                entry, digest = cache.lookup(path) if cache is not None else (None, None)
+                if entry is not None:
+                    digest = entry.digest
+
+                if entry is not None or executor is None:
+                    future = Future()
+                    future.set_result(entry.result if entry is not None else func(path))
+                else:
+                    # only the options the parse depends on are sent to the worker, not the whole importer
+                    future = executor.submit(importSceneFile, func.__name__, self.getWorkerOptions(), path)
+                pending.append((path, digest, entry is not None, future))
+
+                # only a few files are queued ahead so the results don't pile up in memory
+                while len(pending) > maxPending:
+                    path, digest, cached, future = pending.popleft()
+                    yield path, digest, cached, future.result()
+
+            while len(pending) > 0:
+                path, digest, cached, future = pending.popleft()
+                yield path, digest, cached, future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def parseSceneFile(
+        self, path: Path, diagnostics: Optional[list[Diagnostic]] = None, usage: Optional[CommandUsage] = None
+    ):
+        """
+        Returns the parsed commands read from every cutscene of a scene file, an empty list if it has none.
+        If ``diagnostics`` is set, the cutscenes that can't be parsed are skipped and described in it.
+        If ``usage`` is set, the commands of the file are counted in it from the tokens.
+        """
+
+        with self.profile("file read"):
+            fileData, lineNumber = readFromMarker(path)
+
+        if fileData is None:
+            return []
+
+        # the legacy command names are replaced by the tokenizer
+        with self.profile("tokenize"):
+            csArrays = tokenizeCutscenes(fileData, lineNumber)
+
+        if usage is not None:
+            with self.profile("command usage"):
+                usage.addArrays(csArrays)
+
+        if len(csArrays) == 0:
+            if diagnostics is not None:
+                diagnostics.append(Diagnostic("Found no cutscenes in this file"))
+            else:
+                # kept out of the stdout, which can be machine-readable
+                print("INFO: Found no cutscenes in this file!", file=sys.stderr)
+            return []
+
+        # group the commands from every cutscene we found
+        parsedCutscenes: list[ParsedCutscene] = []
+        with self.profile("group commands"):
+            for csArray in csArrays:
+                try:
+                    parsedCutscenes.append(ParsedCutscene(csArray.name, groupCommands(csArray)))
+                except ValueError as error:
+                    if diagnostics is None:
+                        raise
+                    diagnostics.append(getDiagnostic(error, csArray.line, csArray.name))
+
+        return parsedCutscenes
 
     def getParsedCutscenes(self):
         """Returns the parsed commands read from every cutscene we can find"""
 
-        scene_dir = self.decomp_path.resolve() / f"extracted/{self.version}/assets/scenes/"
         parsedCutscenes: list[ParsedCutscene] = []
 
-        for dirpath, _, filenames in scene_dir.walk():
-            for filename in filenames:
-                if "_scene.c" in filename:
-                    path = dirpath / filename
-
-                    with path.open("r", encoding="utf-8") as file:
-                        fileData = file.read()
-
-                    if not "CutsceneData " in fileData:
-                        continue
-
-                    # replace old names
-                    oldNames = list(ootCSLegacyToNewCmdNames.keys())
-                    fileData = fileData.replace("CS_CMD_CONTINUE", "CS_CAM_CONTINUE")
-                    fileData = fileData.replace("CS_CMD_STOP", "CS_CAM_STOP")
-                    for oldName in oldNames:
-                        fileData = fileData.replace(f"{oldName}(", f"{ootCSLegacyToNewCmdNames[oldName]}(")
-
-                    fileLines: list[str] = []
-                    for line in fileData.split("\n"):
-                        fileLines.append(line.strip())
-
-                    # parse cutscenes
-                    csData = []
-                    cutsceneList: list[list[str]] = []
-                    foundCutscene = False
-                    for line in fileLines:
-                        if not line.startswith("//") and not line.startswith("/*"):
-                            if "CutsceneData " in line:
-                                # split with "[" just in case the array has a set size
-                                csName = line.split(" ")[1].split("[")[0]
-                                foundCutscene = True
-
-                            if foundCutscene:
-                                sLine = line.strip()
-                                csCmd = sLine.split("(")[0]
-                                if "CutsceneData " not in line and "};" not in line and csCmd not in ootCutsceneCommandsC:
-                                    if len(csData) > 0:
-                                        csData[-1] += line
-
-                                if len(csData) == 0 or sLine.startswith("CS_") and not sLine.startswith("CS_FLOAT"):
-                                    csData.append(line)
-
-                                if "};" in line:
-                                    foundCutscene = False
-                                    cutsceneList.append(csData)
-                                    csData = []
-
-                    if len(cutsceneList) == 0:
-                        print("INFO: Found no cutscenes in this file!")
-                        return None
-
-                    # parse the commands from every cutscene we found
-                    for cutscene in cutsceneList:
-                        cmdListFound = False
-                        curCmdPrefix = None
-                        parsedCS = []
-                        parsedData = ""
-                        csName = None
-
-                        for line in cutscene:
-                            curCmd = line.strip().split("(")[0]
-                            index = cutscene.index(line) + 1
-                            nextCmd = cutscene[index].strip().split("(")[0] if index < len(cutscene) else None
-                            line = line.strip()
-                            if "CutsceneData" in line:
-                                csName = line.split(" ")[1][:-2]
-
-                            # NOTE: ``CS_UNK_DATA()`` are commands that are completely useless, so we're ignoring those
-                            if csName is not None and not "CS_UNK_DATA" in curCmd:
-                                if curCmd in ootCutsceneCommandsC:
-                                    line = line.removesuffix(",") + "\n"
-
-                                    if curCmd in ootCSSingleCommands and curCmd != "CS_END_OF_SCRIPT":
-                                        parsedData += line
-
-                                    if not cmdListFound and curCmd in ootCSListCommands:
-                                        cmdListFound = True
-                                        parsedData = ""
-
-                                        # camera and lighting have "non-standard" list names
-                                        if curCmd.startswith("CS_CAM"):
-                                            curCmdPrefix = "CS_CAM"
-                                        elif curCmd.startswith("CS_LIGHT") or curCmd.startswith("L_CS_LIGHT"):
-                                            curCmdPrefix = "CS_LIGHT"
-                                        else:
-                                            curCmdPrefix = curCmd[:-5]
-
-                                    if curCmdPrefix is not None:
-                                        if curCmdPrefix in curCmd:
-                                            parsedData += line
-                                        elif not cmdListFound and curCmd in ootCSListEntryCommands:
-                                            print(f"{csName}, command:\n{line}")
-                                            raise ValueError(f"ERROR: Found a list entry outside a list inside ``{csName}``!")
-
-                                    if cmdListFound and nextCmd == "CS_END_OF_SCRIPT" or nextCmd in ootCSListAndSingleCommands:
-                                        cmdListFound = False
-                                        parsedCS.append(parsedData)
-                                        parsedData = ""
-                                elif not "CutsceneData" in curCmd and not "};" in curCmd:
-                                    print(f"WARNING: Unknown command found: ``{curCmd}``")
-                                    cmdListFound = False
-                        parsedCutscenes.append(ParsedCutscene(csName, parsedCS))
+        sceneFiles = self.prefilterSceneFiles(self.getSceneFiles())
+
+        for _, _, _, fileCutscenes in self.mapSceneFiles(self.parseSceneFile, sceneFiles):
+            parsedCutscenes.extend(fileCutscenes)
 
         return parsedCutscenes
 
     def getCmdParams(self, data: str, cmdName: str, paramNumber: int):
-        """Returns the list of every parameter of the given command"""
-
-        parenthesis = "(" if not cmdName.endswith("(") else ""
-        data = data.strip().removeprefix(f"{cmdName}{parenthesis}").replace(" ", "").removesuffix(")")
-        if "CS_FLOAT" in data:
-            data = re.sub(r"CS_FLOAT\([a-fA-F0-9x]*,([0-9e+-.f]*)\)", r"\1", data, re.DOTALL)
-            data = re.sub(r"CS_FLOAT\([a-fA-F0-9x]*,([0-9e+-.f]*)", r"\1", data, re.DOTALL)
-        params = data.split(",")
-        validTimeCmd = cmdName == "CS_TIME" and len(params) == 6 and paramNumber == 5
-        if len(params) != paramNumber and not validTimeCmd:
-            raise ValueError(
-                f"ERROR: The number of expected parameters for `{cmdName}` "
-                + "and the number of found ones is not the same!"
-            )
-        return params
-
-    def getNewCutscene(self, csData: str, name: str):
-        params = self.getCmdParams(csData, "CS_HEADER", Cutscene.paramNumber)
+        """Returns the list of every parameter of the given command, ``data`` is the text between its parenthesis"""
+
+        with self.profile("getCmdParams"):
+            params = splitArgs(data)
+            validTimeCmd = cmdName == "CS_TIME" and len(params) == 6 and paramNumber == 5
+            if len(params) != paramNumber and not validTimeCmd:
+                raise ParamCountError(cmdName, paramNumber, len(params))
+            return params
+
+    def getNewCutscene(self, args: str, name: str):
+        params = self.getCmdParams(args, "CS_HEADER", Cutscene.paramNumber)
         return Cutscene(name, getInteger(params[0]), getInteger(params[1]))
     
-    def getCutsceneList(self):
-        """Returns the list of cutscenes with the data processed"""
+    def getCutscene(
+        self,
+        parsedCS: ParsedCutscene,
+        cmdToColumnArray: dict[str, type],
+        diagnostics: Optional[list[Diagnostic]] = None,
+    ):
+        """
+        Returns the cutscene created from the parsed commands of a single cutscene array.
+        If ``diagnostics`` is set, the commands and list entries that can't be imported are skipped and described in it.
+        """
+
+        cutscene = None
+        for cmdTokens in parsedCS.csData:
+            cmdListToken = cmdTokens[0]
+            cmdListName = cmdListToken.name
 
-        parsedCutscenes = self.getParsedCutscenes()
+            try:
+                # create a new cutscene data
+                if cmdListName == "CS_HEADER":
+                    cutscene = self.getNewCutscene(cmdListToken.args, parsedCS.csName)
 
-        if parsedCutscenes is None:
-            # if it's none then there's no cutscene in the file
-            return None
+                # if we have a cutscene, create and add the commands data in it
+                elif cutscene is not None:
+                    self.addCommand(cutscene, cmdTokens, cmdToColumnArray, diagnostics)
+            except (ValueError, KeyError, IndexError) as error:
+                if diagnostics is None:
+                    raise
+                diagnostics.append(getDiagnostic(error, cmdListToken.line, parsedCS.csName, cmdListName))
+
+        return cutscene
+
+    def addCommand(
+        self,
+        cutscene: Cutscene,
+        cmdTokens: list[CutsceneToken],
+        cmdToColumnArray: dict[str, type],
+        diagnostics: Optional[list[Diagnostic]] = None,
+    ):
+        """Creates a list or standalone command (with its entries) and adds it to the cutscene"""
+
+        cmdListToken = cmdTokens[0]
+        cmdListName = cmdListToken.name
+
+        cmdSchema = commandSchema.get(cmdListName)
+        if cmdSchema is None:
+            print(f"WARNING: `{cmdListName}` is not implemented yet!")
+            return
+        if cmdSchema.listName is None:
+            raise ValueError(f"ERROR: `{cmdListName}` is a list entry, found outside of a list")
+
+        params = self.getCmdParams(cmdListToken.args, cmdListName, cmdSchema.paramNumber)
+        with self.profile(cmdSchema.className, "command"):
+            commandData = cmdToDecoder[cmdListName](params)
+
+        if cmdSchema.hasEntries:
+            foundEndCmd = False
+            columnArray = cmdToColumnArray.get(cmdTokens[1].name) if len(cmdTokens) > 1 else None
+            if columnArray is not None:
+                commandData.entries = columnArray()
+
+            for entryToken in cmdTokens[1:]:
+                isLegacy = entryToken.name.startswith("L_")
+                cmdEntryName = entryToken.name.removeprefix("L_")
+
+                if "CAM" in cmdListName:
+                    flag = entryToken.args.split(",")[0]
+                    if foundEndCmd:
+                        raise ValueError("ERROR: More camera commands after last one!")
+                    foundEndCmd = "CS_CAM_STOP" in flag or "-1" in flag
+
+                # an entry of a column array can't be skipped once some of its columns are appended,
+                # the whole list command is skipped instead
+                if columnArray is not None:
+                    params = self.getCmdParams(entryToken.args, cmdEntryName, commandSchema[cmdEntryName].paramNumber)
+                    with self.profile(columnArray.__name__, "command"):
+                        commandData.entries.appendParams(params)
+                    continue
+
+                try:
+                    entrySchema = commandSchema[cmdEntryName]
+                    params = self.getCmdParams(entryToken.args, cmdEntryName, entrySchema.paramNumber)
+
+                    with self.profile(entrySchema.className, "command"):
+                        listEntry = cmdToDecoder[cmdEntryName](params, isLegacy)
+                except (ValueError, KeyError, IndexError) as error:
+                    if diagnostics is None:
+                        raise
+                    diagnostics.append(getDiagnostic(error, entryToken.line, cutscene.name, cmdEntryName))
+                    continue
+                commandData.entries.append(listEntry)
+
+        if cmdSchema.listName == "destination":
+            cutscene.destination = commandData
+        else:
+            getattr(cutscene, cmdSchema.listName).append(commandData)
+
+    def getCutscenes(self, parsedCutscenes: list[ParsedCutscene], diagnostics: Optional[list[Diagnostic]] = None):
+        """Returns the list of cutscenes created from the parsed commands (see ``getCutscene()`` for ``diagnostics``)"""
 
         cutsceneList: list[Cutscene] = []
 
+        if self.columnar:
+            # imported here since ``columnar`` depends on this module
+            from columnar import cmdToColumnArray
+        else:
+            cmdToColumnArray = {}
+
         # for each cutscene from the list returned by getParsedCutscenes(),
         # create classes containing the cutscene's informations
         # that will be used later when creating Blender objects to complete the import
         for parsedCS in parsedCutscenes:
-            cutscene = None
-            for data in parsedCS.csData:
-                cmdData = data.removesuffix("\n").split("\n")
-                cmdListData = cmdData.pop(0)
-                cmdListName = cmdListData.strip().split("(")[0]
-
-                # create a new cutscene data
-                if cmdListName == "CS_HEADER":
-                    cutscene = self.getNewCutscene(data, parsedCS.csName)
-
-                # if we have a cutscene, create and add the commands data in it
-                elif cutscene is not None and data.startswith(f"{cmdListName}("):
-                    isPlayer = cmdListData.startswith("CS_PLAYER_CUE_LIST(")
-                    isStartSeq = cmdListData.startswith("CS_START_SEQ_LIST(")
-                    isStopSeq = cmdListData.startswith("CS_STOP_SEQ_LIST(")
-
-                    cmd = cmdToClass.get(cmdListName)
-                    if cmd is not None:
-                        cmdList = getattr(cutscene, "playerCueList" if isPlayer else cmd.listName)
-
-                        paramNumber = cmd.paramNumber - 1 if isPlayer else cmd.paramNumber
-                        params = self.getCmdParams(cmdListData, cmdListName, paramNumber)
-                        if isStartSeq or isStopSeq:
-                            commandData = cmd(params, type="start" if isStartSeq else "stop")
-                        elif cmdListData.startswith("CS_ACTOR_CUE_LIST(") or isPlayer:
-                            commandData = cmd(params, isPlayer=isPlayer)
-                        else:
-                            commandData = cmd(params)
-
-                        if cmdListName != "CS_TRANSITION" and cmdListName != "CS_DESTINATION":
-                            foundEndCmd = False
-                            for d in cmdData:
-                                cmdEntryName = d.strip().split("(")[0]
-                                isLegacy = d.startswith("L_")
-                                if isLegacy:
-                                    cmdEntryName = cmdEntryName.removeprefix("L_")
-                                    d = d.removeprefix("L_")
-
-                                if "CAM" in cmdListName:
-                                    flag = d.removeprefix("CS_CAM_POINT(").split(",")[0]
-                                    if foundEndCmd:
-                                        raise ValueError("ERROR: More camera commands after last one!")
-                                    foundEndCmd = "CS_CAM_STOP" in flag or "-1" in flag
-
-                                entryCmd = cmdToClass[cmdEntryName]
-                                params = self.getCmdParams(d, cmdEntryName, entryCmd.paramNumber)
-
-                                if "CS_LIGHT_SETTING(" in d or isStartSeq or isStopSeq:
-                                    listEntry = entryCmd(params, isLegacy=isLegacy)
-                                else:
-                                    listEntry = entryCmd(params)
-                                commandData.entries.append(listEntry)
-                        if cmdListName == "CS_DESTINATION":
-                            cutscene.destination = commandData
-                        else:
-                            cmdList.append(commandData)
-                    else:
-                        print(f"WARNING: `{cmdListName}` is not implemented yet!")
+            with self.profile(parsedCS.csName, "cutscene"):
+                cutscene = self.getCutscene(parsedCS, cmdToColumnArray, diagnostics)
 
             # after processing the commands we can add the cutscene to the cutscene list
             if cutscene is not None:
                 cutsceneList.append(cutscene)
         return cutsceneList
+
+    def getFileCutscenes(self, path: Path):
+        """
+        Returns the list of cutscenes with the data processed from a single scene file.
+        In resilient mode, it's a ``FileCutscenes`` with the diagnostics of what was skipped, even if the whole file was.
+        When counting the command usage, it's a ``FileCutscenes`` with the usage of the file.
+        """
+
+        usage = CommandUsage() if self.usage else None
+
+        with self.profile(f"{self.version}/{path.name}", "file"):
+            if not self.resilient:
+                parsedCutscenes = self.parseSceneFile(path, usage=usage)
+                cutscenes = self.getCutscenes(parsedCutscenes)
+                return FileCutscenes(cutscenes, usage=usage) if usage is not None else cutscenes
+
+            diagnostics: list[Diagnostic] = []
+            try:
+                parsedCutscenes = self.parseSceneFile(path, diagnostics, usage)
+                cutscenes = self.getCutscenes(parsedCutscenes, diagnostics)
+            except (ValueError, KeyError, IndexError) as error:
+                diagnostics.append(getDiagnostic(error))
+                cutscenes = []
+
+            return FileCutscenes(cutscenes, diagnostics, usage)
+
+    def getWorkerOptions(self):
+        """Returns the arguments of ``getWorkerImporter()`` making an importer with the same parse results"""
+
+        return (self.decomp_path, self.version, self.columnar, self.resilient, self.usage)
+
+    def getCacheName(self):
+        """Returns the name of the parse cache of this version, the results depend on the import options"""
+
+        name = self.version + ("-columnar" if self.columnar else "") + ("-resilient" if self.resilient else "")
+        return name + ("-usage" if self.usage else "")
+
+    def iterFileCutscenes(self, digestIndex: Optional[DigestIndex] = None):
+        """
+        Yields the path and content digest (see ``mapSceneFiles()``) of every scene file with the list of its cutscenes,
+        with the data processed. Scene files with the same content as one in ``digestIndex`` reuse its cutscenes
+        instead of being parsed again.
+        """
+
+        sceneFiles = self.getSceneFiles()
+        keptFiles = self.prefilterSceneFiles(sceneFiles)
+
+        if digestIndex is not None:
+            digestIndex.removeFiles(sorted(set(sceneFiles) - set(keptFiles)))
+
+        if self.cache_dir is not None or digestIndex is not None:
+            cache = ParseCache(self.cache_dir, self.getCacheName(), digestIndex)
+        else:
+            cache = None
+
+        try:
+            # parsing and creating the cutscenes is done per file so it can be spread over the workers
+            for path, digest, cached, fileCutscenes in self.mapSceneFiles(self.getFileCutscenes, keptFiles, cache):
+                if digest is not None and not cached:
+                    cache.store(path, digest, fileCutscenes)
+
+                if len(fileCutscenes) == 0 and len(getattr(fileCutscenes, "diagnostics", [])) == 0:
+                    # there's no cutscene in the file, the next files can still have some
+                    continue
+
+                if isinstance(fileCutscenes, FileCutscenes):
+                    # identical files share their result, the diagnostics are reported for each of them
+                    self.diagnostics.add(path.relative_to(self.decomp_path.resolve()).as_posix(), fileCutscenes.diagnostics)
+
+                yield path, digest, fileCutscenes
+        finally:
+            if cache is not None:
+                cache.save()
+
+    def iterCutscenes(self, digestIndex: Optional[DigestIndex] = None):
+        """Yields the cutscenes with the data processed, one scene file at a time (see ``iterFileCutscenes()``)"""
+
+        for _, _, fileCutscenes in self.iterFileCutscenes(digestIndex):
+            yield from fileCutscenes
+
+    def getCutsceneList(self):
+        """Returns the list of cutscenes with the data processed"""
+
+        return list(self.iterCutscenes())
+
+    def iterVersions(self, versions: list[str], byFile: bool = False):
+        """
+        Yields every version with a generator of its cutscenes (see ``iterCutscenes()``),
+        or of its scene files and their cutscenes if ``byFile`` is set (see ``iterFileCutscenes()``).
+        Scene files are only parsed once per unique content, identical files share the same ``Cutscene`` objects.
+        """
+
+        importers = [replace(self, version=version) for version in versions]
+
+        # the scene files of every version are counted first so only the results a later file can reuse are kept
+        digestIndex = DigestIndex() if len(importers) > 1 else None
+        if digestIndex is not None:
+            for importer in importers:
+                digestIndex.addFiles(importer.getSceneFiles())
+
+        for importer in importers:
+            yield importer.version, (importer.iterFileCutscenes if byFile else importer.iterCutscenes)(digestIndex)
+
+    @staticmethod
+    def getVersionList(decomp_path: Path):
+        """Returns every version extracted in the decomp folder"""
+
+        extracted_dir = decomp_path.resolve() / "extracted"
+        return sorted(path.name for path in extracted_dir.iterdir() if (path / "assets/scenes").is_dir())
+
+
+@lru_cache(maxsize=None)
+def getWorkerImporter(decomp_path: Path, version: str, columnar: bool, resilient: bool, usage: bool):
+    return CutsceneImport(decomp_path, version, columnar=columnar, resilient=resilient, usage=usage)
+
+
+def importSceneFile(funcName: str, options: tuple, path: Path):
+    """Runs a method of ``CutsceneImport`` (like ``getFileCutscenes()``) on a scene file, in a worker process"""
+
+    return getattr(getWorkerImporter(*options), funcName)(path)
@@ -0,0 +1,294 @@
+from array import array
+
+from classes import CutsceneCmdActorCue, CutsceneCmdCamPoint, getInteger, getRotation, cs_import_float
+
+
+# Compact storage for the list entries that make most of a cutscene's data (camera points and actor cues).
+# Instead of one dataclass per entry, each list keeps one ``array`` per field, the ``*View`` classes give
+# access to a single entry with the same attributes as the dataclass for the code that iterates over entries.
+# The few values that aren't numbers in the sources (enum IDs, rotations not written as ``0x%04X``) are kept aside by index.
+# Since the columns support the buffer protocol they can also be wrapped by ``numpy.frombuffer()`` without a copy.
+
+
+def getBinang(data: str):
+    """Returns the rotation as an int, see ``getRotation()``"""
+
+    rotation = getRotation(data)
+    return -int(rotation[3:], 16) if rotation.startswith("0x-") else int(rotation, 16)
+
+
+class StringTable:
+    """Stores each distinct string once, entries refer to them by index"""
+
+    __slots__ = ("strings", "indices")
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self.indices: dict[str, int] = {}
+
+    def getIndex(self, string: str):
+        index = self.indices.get(string)
+        if index is None:
+            index = self.indices[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+    def __getstate__(self):
+        return self.strings
+
+    def __setstate__(self, strings: list[str]):
+        self.strings = strings
+        self.indices = {string: i for i, string in enumerate(strings)}
+
+
+class CamPointView:
+    """Read-only view of a single camera point stored in a ``CamPointArray``"""
+
+    __slots__ = ("array", "index")
+
+    params = None
+    startFrame = None
+    endFrame = None
+    paramNumber = CutsceneCmdCamPoint.paramNumber
+
+    def __init__(self, array: "CamPointArray", index: int):
+        self.array = array
+        self.index = index
+
+    @property
+    def continueFlag(self):
+        return self.array.flagTable.strings[self.array.flag[self.index]]
+
+    @property
+    def camRoll(self):
+        return self.array.camRoll[self.index]
+
+    @property
+    def frame(self):
+        return self.array.frame[self.index]
+
+    @property
+    def viewAngle(self):
+        return self.array.viewAngle[self.index]
+
+    @property
+    def pos(self):
+        return [self.array.x[self.index], self.array.y[self.index], self.array.z[self.index]]
+
+    def __repr__(self):
+        return (
+            f"CamPointView(continueFlag={self.continueFlag!r}, camRoll={self.camRoll}, "
+            + f"frame={self.frame}, viewAngle={self.viewAngle}, pos={self.pos})"
+        )
+
+
+class CamPointArray:
+    """Camera points of a camera command stored as columns"""
+
+    __slots__ = ("flagTable", "flag", "camRoll", "frame", "viewAngle", "x", "y", "z")
+
+    def __init__(self):
+        self.flagTable = StringTable()
+        self.flag = array("H")
+        self.camRoll = array("i")
+        self.frame = array("i")
+        self.viewAngle = array("d")
+        self.x = array("i")
+        self.y = array("i")
+        self.z = array("i")
+
+    def appendParams(self, params: list[str]):
+        """Decodes the parameters of a ``CS_CAM_POINT()`` command, like ``CutsceneCmdCamPoint`` does"""
+
+        self.flag.append(self.flagTable.getIndex(params[0]))
+        self.camRoll.append(getInteger(params[1]))
+        self.frame.append(getInteger(params[2]))
+        self.viewAngle.append(cs_import_float(params[3]))
+        self.x.append(getInteger(params[4]))
+        self.y.append(getInteger(params[5]))
+        self.z.append(getInteger(params[6]))
+
+    def append(self, point: CutsceneCmdCamPoint):
+        self.flag.append(self.flagTable.getIndex(point.continueFlag))
+        self.camRoll.append(point.camRoll)
+        self.frame.append(point.frame)
+        self.viewAngle.append(point.viewAngle)
+        self.x.append(point.pos[0])
+        self.y.append(point.pos[1])
+        self.z.append(point.pos[2])
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("camera point index out of range")
+        return CamPointView(self, index)
+
+    def __iter__(self):
+        return (CamPointView(self, i) for i in range(len(self)))
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class ActorCueView:
+    """Read-only view of a single actor cue stored in an ``ActorCueArray``"""
+
+    __slots__ = ("array", "index")
+
+    params = None
+    paramNumber = CutsceneCmdActorCue.paramNumber
+
+    def __init__(self, array: "ActorCueArray", index: int):
+        self.array = array
+        self.index = index
+
+    @property
+    def actionID(self):
+        return self.array.actionKeys.get(self.index, self.array.actionID[self.index])
+
+    @property
+    def startFrame(self):
+        return self.array.startFrame[self.index]
+
+    @property
+    def endFrame(self):
+        return self.array.endFrame[self.index]
+
+    @property
+    def rot(self):
+        rot = self.array.rotKeys.get(self.index)
+        if rot is not None:
+            return list(rot)
+        return [f"0x{self.array.rotX[self.index]:04X}", f"0x{self.array.rotY[self.index]:04X}", f"0x{self.array.rotZ[self.index]:04X}"]
+
+    @property
+    def startPos(self):
+        return [self.array.startX[self.index], self.array.startY[self.index], self.array.startZ[self.index]]
+
+    @property
+    def endPos(self):
+        return [self.array.endX[self.index], self.array.endY[self.index], self.array.endZ[self.index]]
+
+    def __repr__(self):
+        return (
+            f"ActorCueView(actionID={self.actionID!r}, startFrame={self.startFrame}, endFrame={self.endFrame}, "
+            + f"rot={self.rot}, startPos={self.startPos}, endPos={self.endPos})"
+        )
+
+
+class ActorCueArray:
+    """Actor or player cues of a cue list stored as columns"""
+
+    __slots__ = (
+        "actionID",
+        "actionKeys",
+        "startFrame",
+        "endFrame",
+        "rotX",
+        "rotY",
+        "rotZ",
+        "rotKeys",
+        "startX",
+        "startY",
+        "startZ",
+        "endX",
+        "endY",
+        "endZ",
+    )
+
+    def __init__(self):
+        self.actionID = array("i")
+        self.actionKeys: dict[int, str] = {}  # action ids that are enum names instead of numbers, by entry index
+        self.startFrame = array("i")
+        self.endFrame = array("i")
+        self.rotX = array("q")
+        self.rotY = array("q")
+        self.rotZ = array("q")
+        self.rotKeys: dict[int, list[str]] = {}  # rotations spelled otherwise than ``0x%04X`` (like ``0x4a00``), by entry index
+        self.startX = array("i")
+        self.startY = array("i")
+        self.startZ = array("i")
+        self.endX = array("i")
+        self.endY = array("i")
+        self.endZ = array("i")
+
+    def appendAction(self, actionID: int | str):
+        if isinstance(actionID, str):
+            self.actionKeys[len(self.actionID)] = actionID
+            actionID = -1
+        self.actionID.append(actionID)
+
+    def appendRot(self, rot: list[str]):
+        binangs = [getBinang(value) for value in rot]
+        if rot != [f"0x{binang:04X}" for binang in binangs]:
+            self.rotKeys[len(self.rotX)] = rot
+        self.rotX.append(binangs[0])
+        self.rotY.append(binangs[1])
+        self.rotZ.append(binangs[2])
+
+    def appendParams(self, params: list[str]):
+        """Decodes the parameters of a ``CS_ACTOR_CUE()`` command, like ``CutsceneCmdActorCue`` does"""
+
+        try:
+            actionID = getInteger(params[0])
+        except ValueError:
+            actionID = params[0]
+
+        self.startFrame.append(getInteger(params[1]))
+        self.endFrame.append(getInteger(params[2]))
+        self.appendAction(actionID)
+        self.appendRot([getRotation(param) for param in params[3:6]])
+        self.startX.append(getInteger(params[6]))
+        self.startY.append(getInteger(params[7]))
+        self.startZ.append(getInteger(params[8]))
+        self.endX.append(getInteger(params[9]))
+        self.endY.append(getInteger(params[10]))
+        self.endZ.append(getInteger(params[11]))
+
+    def append(self, cue: CutsceneCmdActorCue):
+        self.startFrame.append(cue.startFrame)
+        self.endFrame.append(cue.endFrame)
+        self.appendAction(cue.actionID)
+        self.appendRot(list(cue.rot))
+        self.startX.append(cue.startPos[0])
+        self.startY.append(cue.startPos[1])
+        self.startZ.append(cue.startPos[2])
+        self.endX.append(cue.endPos[0])
+        self.endY.append(cue.endPos[1])
+        self.endZ.append(cue.endPos[2])
+
+    def __len__(self):
+        return len(self.startFrame)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("actor cue index out of range")
+        return ActorCueView(self, index)
+
+    def __iter__(self):
+        return (ActorCueView(self, i) for i in range(len(self)))
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+# list entry command name to the columnar container used for it
+cmdToColumnArray = {
+    "CS_CAM_POINT": CamPointArray,
+    "CS_ACTOR_CUE": ActorCueArray,
+    "CS_PLAYER_CUE": ActorCueArray,
+}
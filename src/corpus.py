@@ -0,0 +1,494 @@
+import math
+import mmap
+import struct
+import sys
+
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+from columnar import ActorCueView, CamPointView, StringTable
+from classes import (
+    Cutscene,
+    CutsceneCmdActorCue,
+    CutsceneCmdActorCueList,
+    CutsceneCmdCamAT,
+    CutsceneCmdCamATSpline,
+    CutsceneCmdCamATSplineRelToPlayer,
+    CutsceneCmdCamEye,
+    CutsceneCmdCamEyeSpline,
+    CutsceneCmdCamEyeSplineRelToPlayer,
+    CutsceneCmdCamPoint,
+    CutsceneCmdDestination,
+    CutsceneCmdFadeSeq,
+    CutsceneCmdFadeSeqList,
+    CutsceneCmdLightSetting,
+    CutsceneCmdLightSettingList,
+    CutsceneCmdMisc,
+    CutsceneCmdMiscList,
+    CutsceneCmdRumbleController,
+    CutsceneCmdRumbleControllerList,
+    CutsceneCmdStartStopSeq,
+    CutsceneCmdStartStopSeqList,
+    CutsceneCmdText,
+    CutsceneCmdTextList,
+    CutsceneCmdTextNone,
+    CutsceneCmdTextOcarinaAction,
+    CutsceneCmdTime,
+    CutsceneCmdTimeList,
+    CutsceneCmdTransition,
+)
+
+
+# Binary export of parsed cutscenes, so other tools can load them without parsing the decomp again.
+#
+# The file is column oriented: every field of every command is an ``array`` stored as a section of the file,
+# strings (names, enum keys...) are stored once in a string table and referred to by index.
+# The reader memory-maps the file and only builds the ``Cutscene`` objects that are accessed, with their list entries
+# built on access too. The raw parameters (``params``) of the commands aren't exported.
+#
+# Layout: header, section directory then the sections (8-bytes aligned), in the byte order given in the header.
+# Cutscenes found in several versions are only stored once, each row of the file refers to a stored cutscene.
+
+CORPUS_MAGIC = b"OOTCSCRP"
+
+# bump this when the layout of the file or the exported fields change
+CORPUS_FORMAT = 1
+
+headerStruct = struct.Struct("<8sIBxxxI")  # magic, format, big endian flag, section count
+sectionStruct = struct.Struct("<HcxQQ")  # name length, typecode, offset, item count (followed by the name)
+
+# stored instead of ``None`` in integer columns
+NONE_INT = -(2**63)
+
+# columns used to store a field of each kind, as suffix and typecode
+kindColumns = {
+    "int": [("", "q")],
+    "float": [("", "d")],
+    "bool": [("", "b")],
+    "str": [("", "i")],
+    "intOrStr": [("", "q"), (".key", "i")],
+    "intList": [(".0", "q"), (".1", "q"), (".2", "q")],
+    "strList": [(".0", "i"), (".1", "i"), (".2", "i")],
+    "intTuple": [("", "q")],  # tuple of a single int, like ``CutsceneCmdText.altTextId1``
+}
+
+frameFields = [("startFrame", "int"), ("endFrame", "int")]
+
+# exported fields of every command class
+fieldKinds: dict[type, list[tuple[str, str]]] = {
+    CutsceneCmdCamPoint: [
+        *frameFields,
+        ("continueFlag", "str"),
+        ("camRoll", "int"),
+        ("frame", "int"),
+        ("viewAngle", "float"),
+        ("pos", "intList"),
+    ],
+    CutsceneCmdActorCue: [
+        *frameFields,
+        ("actionID", "intOrStr"),
+        ("rot", "strList"),
+        ("startPos", "intList"),
+        ("endPos", "intList"),
+    ],
+    CutsceneCmdActorCueList: [*frameFields, ("isPlayer", "bool"), ("commandType", "str"), ("entryTotal", "int")],
+    CutsceneCmdCamEyeSpline: frameFields,
+    CutsceneCmdCamATSpline: frameFields,
+    CutsceneCmdCamEyeSplineRelToPlayer: frameFields,
+    CutsceneCmdCamATSplineRelToPlayer: frameFields,
+    CutsceneCmdCamEye: frameFields,
+    CutsceneCmdCamAT: frameFields,
+    CutsceneCmdMisc: [*frameFields, ("type", "str")],
+    CutsceneCmdMiscList: [*frameFields, ("entryTotal", "int")],
+    CutsceneCmdTransition: [*frameFields, ("type", "str")],
+    CutsceneCmdText: [
+        *frameFields,
+        ("textId", "int"),
+        ("type", "str"),
+        ("altTextId1", "intTuple"),
+        ("altTextId2", "intTuple"),
+    ],
+    CutsceneCmdTextNone: frameFields,
+    CutsceneCmdTextOcarinaAction: [*frameFields, ("ocarinaActionId", "str"), ("messageId", "int")],
+    CutsceneCmdTextList: [*frameFields, ("entryTotal", "int")],
+    CutsceneCmdLightSetting: [*frameFields, ("isLegacy", "bool"), ("lightSetting", "int")],
+    CutsceneCmdLightSettingList: [*frameFields, ("entryTotal", "int")],
+    CutsceneCmdTime: [*frameFields, ("hour", "int"), ("minute", "int")],
+    CutsceneCmdTimeList: [*frameFields, ("entryTotal", "int")],
+    CutsceneCmdStartStopSeq: [*frameFields, ("isLegacy", "bool"), ("seqId", "str")],
+    CutsceneCmdStartStopSeqList: [*frameFields, ("entryTotal", "int"), ("type", "str")],
+    CutsceneCmdFadeSeq: [*frameFields, ("seqPlayer", "str")],
+    CutsceneCmdFadeSeqList: [*frameFields, ("entryTotal", "int")],
+    CutsceneCmdRumbleController: [*frameFields, ("sourceStrength", "int"), ("duration", "int"), ("decreaseRate", "int")],
+    CutsceneCmdRumbleControllerList: [*frameFields, ("entryTotal", "int")],
+    CutsceneCmdDestination: [*frameFields, ("id", "str")],
+}
+
+# ``Cutscene`` attribute to the class of the commands in it
+listClasses = {
+    "actorCueList": CutsceneCmdActorCueList,
+    "playerCueList": CutsceneCmdActorCueList,
+    "camEyeSplineList": CutsceneCmdCamEyeSpline,
+    "camATSplineList": CutsceneCmdCamATSpline,
+    "camEyeSplineRelPlayerList": CutsceneCmdCamEyeSplineRelToPlayer,
+    "camATSplineRelPlayerList": CutsceneCmdCamATSplineRelToPlayer,
+    "camEyeList": CutsceneCmdCamEye,
+    "camATList": CutsceneCmdCamAT,
+    "textList": CutsceneCmdTextList,
+    "miscList": CutsceneCmdMiscList,
+    "rumbleList": CutsceneCmdRumbleControllerList,
+    "transitionList": CutsceneCmdTransition,
+    "lightSettingsList": CutsceneCmdLightSettingList,
+    "timeList": CutsceneCmdTimeList,
+    "seqList": CutsceneCmdStartStopSeqList,
+    "fadeSeqList": CutsceneCmdFadeSeqList,
+}
+
+classByName = {cls.__name__: cls for cls in fieldKinds}
+
+# entries stored by ``columnar.py`` are exported like the dataclass they replace
+viewClasses = {CamPointView: CutsceneCmdCamPoint, ActorCueView: CutsceneCmdActorCue}
+
+
+def hasEntries(cls: type):
+    return "entries" in cls.__slots__
+
+
+def encodeValue(kind: str, value: Any, strings: StringTable):
+    """Returns the values stored in the columns of a field (see ``kindColumns``)"""
+
+    if kind == "int":
+        return (NONE_INT if value is None else value,)
+    elif kind == "float":
+        return (math.nan if value is None else value,)
+    elif kind == "bool":
+        return (-1 if value is None else int(value),)
+    elif kind == "str":
+        return (-1 if value is None else strings.getIndex(value),)
+    elif kind == "intOrStr":
+        if isinstance(value, str):
+            return (0, strings.getIndex(value))
+        return (NONE_INT if value is None else value, -1)
+    elif kind == "intList":
+        return tuple(value) if len(value) == 3 else (NONE_INT,) * 3
+    elif kind == "strList":
+        return tuple(strings.getIndex(item) for item in value) if len(value) == 3 else (-1,) * 3
+    elif kind == "intTuple":
+        return (NONE_INT if value is None else value[0],)
+    raise ValueError(f"ERROR: Unknown field kind '{kind}'")
+
+
+class CorpusWriter:
+    """Stores the cutscenes added to it as columns, until they are written to a file"""
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.sections: dict[str, array] = {}
+        self.rowIndex: dict[tuple[str, str], int] = {}  # source digest and name of the stored cutscenes, stored only once
+
+        for name, typecode in [
+            ("rows.version", "i"),
+            ("rows.scene", "i"),
+            ("rows.cutscene", "Q"),
+            ("cutscene.name", "i"),
+            ("cutscene.totalEntries", "q"),
+            ("cutscene.frameCount", "q"),
+            ("cutscene.destination", "q"),
+        ]:
+            self.sections[name] = array(typecode)
+
+        self.addTable("destination", CutsceneCmdDestination)
+        for listName, cls in listClasses.items():
+            self.sections[f"{listName}.offsets"] = array("Q", [0])
+            self.addTable(listName, cls)
+
+            if hasEntries(cls):
+                self.sections[f"{listName}.entryOffsets"] = array("Q", [0])
+                self.sections[f"{listName}.entryClass"] = array("i")
+                self.sections[f"{listName}.entryRow"] = array("Q")
+
+    def addTable(self, prefix: str, cls: type):
+        for fieldName, kind in fieldKinds[cls]:
+            for suffix, typecode in kindColumns[kind]:
+                self.sections[f"{prefix}.{fieldName}{suffix}"] = array(typecode)
+
+    def addObject(self, prefix: str, cls: type, obj: Any):
+        """Appends the fields of a command to the columns of its table, returns its row"""
+
+        key = f"{prefix}.{fieldKinds[cls][0][0]}"
+        if not key in self.sections:
+            self.addTable(prefix, cls)
+        row = len(self.sections[key])
+
+        for fieldName, kind in fieldKinds[cls]:
+            values = encodeValue(kind, getattr(obj, fieldName), self.strings)
+            for (suffix, _), value in zip(kindColumns[kind], values):
+                self.sections[f"{prefix}.{fieldName}{suffix}"].append(value)
+
+        return row
+
+    def add(self, cutscene: Cutscene, scene: str = "", version: str = "", source: Optional[str] = None):
+        """
+        Adds a row for the cutscene, ``source`` identifies the content it was imported from (like the digest of its file):
+        the cutscenes with the same source and name are only stored once
+        """
+
+        if source is None:
+            row = self.addCutscene(cutscene)
+        else:
+            row = self.rowIndex.get((source, cutscene.name))
+            if row is None:
+                row = self.rowIndex[(source, cutscene.name)] = self.addCutscene(cutscene)
+
+        self.sections["rows.version"].append(self.strings.getIndex(version))
+        self.sections["rows.scene"].append(self.strings.getIndex(scene))
+        self.sections["rows.cutscene"].append(row)
+
+    def addCutscene(self, cutscene: Cutscene):
+        sections = self.sections
+        row = len(sections["cutscene.name"])
+
+        sections["cutscene.name"].append(self.strings.getIndex(cutscene.name))
+        sections["cutscene.totalEntries"].append(cutscene.totalEntries)
+        sections["cutscene.frameCount"].append(cutscene.frameCount)
+        sections["cutscene.destination"].append(
+            self.addObject("destination", CutsceneCmdDestination, cutscene.destination) if cutscene.destination is not None else -1
+        )
+
+        for listName, cls in listClasses.items():
+            cmdList = getattr(cutscene, listName)
+
+            for command in cmdList:
+                self.addObject(listName, cls, command)
+
+                if hasEntries(cls):
+                    for entry in command.entries:
+                        entryClass = viewClasses.get(type(entry), type(entry))
+                        sections[f"{listName}.entryClass"].append(self.strings.getIndex(entryClass.__name__))
+                        sections[f"{listName}.entryRow"].append(
+                            self.addObject(f"{listName}.{entryClass.__name__}", entryClass, entry)
+                        )
+                    sections[f"{listName}.entryOffsets"].append(len(sections[f"{listName}.entryRow"]))
+
+            sections[f"{listName}.offsets"].append(sections[f"{listName}.offsets"][-1] + len(cmdList))
+
+        return row
+
+    def write(self, path: Path):
+        sections = dict(self.sections)
+
+        # the string table is stored as utf-8 bytes with the offset of each string
+        stringData = bytearray()
+        stringOffsets = array("Q", [0])
+        for string in self.strings.strings:
+            stringData.extend(string.encode("utf-8"))
+            stringOffsets.append(len(stringData))
+        sections["strings.data"] = array("B", stringData)
+        sections["strings.offsets"] = stringOffsets
+
+        directorySize = sum(sectionStruct.size + len(name.encode("utf-8")) for name in sections)
+        offset = headerStruct.size + directorySize
+        directory = bytearray()
+        for name, data in sections.items():
+            offset += -offset % 8
+            nameBytes = name.encode("utf-8")
+            directory.extend(sectionStruct.pack(len(nameBytes), data.typecode.encode(), offset, len(data)))
+            directory.extend(nameBytes)
+            offset += len(data) * data.itemsize
+
+        # write to a temporary file first so an interrupted export can't leave a broken file
+        tmpPath = path.with_suffix(path.suffix + ".tmp")
+        with tmpPath.open("wb") as file:
+            file.write(headerStruct.pack(CORPUS_MAGIC, CORPUS_FORMAT, int(sys.byteorder == "big"), len(sections)))
+            file.write(directory)
+            for data in sections.values():
+                file.write(bytes(-file.tell() % 8))
+                file.write(data.tobytes())
+        tmpPath.replace(path)
+
+
+class LazyEntries(Sequence):
+    """Entries of a command list read from a corpus file, each entry is only built when it's accessed"""
+
+    def __init__(self, reader: "CorpusReader", listName: str, start: int, end: int):
+        self.reader = reader
+        self.listName = listName
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index: int | slice):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("entry index out of range")
+        return self.reader.getEntry(self.listName, self.start + index)
+
+    def __eq__(self, other: object):
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class CorpusReader:
+    """Cutscenes of a corpus file, the file is memory-mapped and the cutscenes are built when they are accessed"""
+
+    def __init__(self, path: Path):
+        self.file = path.open("rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.sections: dict[str, Any] = {}
+        self.views: list[memoryview] = []
+        self.cutscenes: dict[int, Cutscene] = {}  # built cutscenes by stored row
+
+        magic, corpusFormat, bigEndian, sectionCount = headerStruct.unpack_from(self.data, 0)
+        if magic != CORPUS_MAGIC:
+            self.close()
+            raise ValueError(f"ERROR: '{path}' is not a cutscene corpus file")
+        if corpusFormat != CORPUS_FORMAT:
+            self.close()
+            raise ValueError(f"ERROR: '{path}' uses the corpus format {corpusFormat}, expected {CORPUS_FORMAT}")
+
+        swapBytes = bigEndian != int(sys.byteorder == "big")
+        offset = headerStruct.size
+        for _ in range(sectionCount):
+            nameLength, typecode, dataOffset, count = sectionStruct.unpack_from(self.data, offset)
+            offset += sectionStruct.size
+            name = bytes(self.data[offset : offset + nameLength]).decode("utf-8")
+            offset += nameLength
+
+            typecode = typecode.decode()
+            size = count * array(typecode).itemsize
+            if swapBytes:
+                # files written on a machine with another byte order are copied
+                column = array(typecode, self.data[dataOffset : dataOffset + size])
+                column.byteswap()
+            else:
+                view = memoryview(self.data)[dataOffset : dataOffset + size]
+                column = view.cast(typecode)
+                self.views.extend((view, column))
+            self.sections[name] = column
+
+        stringOffsets = self.sections["strings.offsets"]
+        self.strings: list[Optional[str]] = [None] * (len(stringOffsets) - 1)
+        self.stringOffsets = stringOffsets
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        for view in reversed(self.views):
+            view.release()
+        self.views.clear()
+        self.sections.clear()
+        self.data.close()
+        self.file.close()
+
+    def __len__(self):
+        return len(self.sections["rows.cutscene"])
+
+    def __getitem__(self, index: int):
+        return self.getCutscene(self.sections["rows.cutscene"][index])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def getString(self, index: int):
+        if index < 0:
+            return None
+
+        string = self.strings[index]
+        if string is None:
+            data = self.sections["strings.data"]
+            string = self.strings[index] = bytes(data[self.stringOffsets[index] : self.stringOffsets[index + 1]]).decode()
+        return string
+
+    def getColumn(self, name: str):
+        """Returns a column of the file (like ``camEyeSplineList.CutsceneCmdCamPoint.frame``) without copying it"""
+
+        return self.sections[name]
+
+    def getRows(self):
+        """Yields the version, scene and cutscene of every row"""
+
+        versions = self.sections["rows.version"]
+        scenes = self.sections["rows.scene"]
+        for i in range(len(self)):
+            yield self.getString(versions[i]), self.getString(scenes[i]), self[i]
+
+    def getVersions(self):
+        return list(dict.fromkeys(self.getString(index) for index in self.sections["rows.version"]))
+
+    def getObject(self, prefix: str, cls: type, row: int):
+        obj = cls(None)
+        for fieldName, kind in fieldKinds[cls]:
+            columns = kindColumns[kind]
+            value = self.sections[f"{prefix}.{fieldName}{columns[0][0]}"][row]
+
+            if kind == "int":
+                value = None if value == NONE_INT else value
+            elif kind == "float":
+                value = None if math.isnan(value) else value
+            elif kind == "bool":
+                value = None if value == -1 else bool(value)
+            elif kind == "str":
+                value = self.getString(value)
+            elif kind == "intOrStr":
+                key = self.sections[f"{prefix}.{fieldName}.key"][row]
+                value = self.getString(key) if key != -1 else (None if value == NONE_INT else value)
+            elif kind == "intList" or kind == "strList":
+                values = [self.sections[f"{prefix}.{fieldName}{suffix}"][row] for suffix, _ in columns]
+                if kind == "strList":
+                    value = [self.getString(item) for item in values] if values[0] != -1 else []
+                else:
+                    value = values if values[0] != NONE_INT else []
+            elif kind == "intTuple":
+                value = None if value == NONE_INT else (value,)
+            setattr(obj, fieldName, value)
+
+        return obj
+
+    def getEntry(self, listName: str, index: int):
+        entryClass = classByName[self.getString(self.sections[f"{listName}.entryClass"][index])]
+        return self.getObject(f"{listName}.{entryClass.__name__}", entryClass, self.sections[f"{listName}.entryRow"][index])
+
+    def getCutscene(self, row: int):
+        """Returns the stored cutscene at ``row``, built the first time it's accessed"""
+
+        cutscene = self.cutscenes.get(row)
+        if cutscene is not None:
+            return cutscene
+
+        sections = self.sections
+        cutscene = Cutscene(
+            self.getString(sections["cutscene.name"][row]),
+            sections["cutscene.totalEntries"][row],
+            sections["cutscene.frameCount"][row],
+        )
+
+        destination = sections["cutscene.destination"][row]
+        if destination != -1:
+            cutscene.destination = self.getObject("destination", CutsceneCmdDestination, destination)
+
+        for listName, cls in listClasses.items():
+            offsets = sections[f"{listName}.offsets"]
+            cmdList = getattr(cutscene, listName)
+
+            for listRow in range(offsets[row], offsets[row + 1]):
+                command = self.getObject(listName, cls, listRow)
+                if hasEntries(cls):
+                    entryOffsets = sections[f"{listName}.entryOffsets"]
+                    command.entries = LazyEntries(self, listName, entryOffsets[listRow], entryOffsets[listRow + 1])
+                cmdList.append(command)
+
+        self.cutscenes[row] = cutscene
+        return cutscene
@@ -1,6 +1,8 @@
 from os import path
 from dataclasses import dataclass
-from .getters import getXMLRoot
+from functools import cached_property
+from xml.etree.ElementTree import Element
+from .getters import getXMLSnapshot
 from .common import OoT_BaseElement
 
 
@@ -13,13 +15,17 @@ class OoT_ActorElement(OoT_BaseElement):
 class OoT_ActorData:
     """Everything related to OoT Actors"""
 
-    def __init__(self):
+    @cached_property
+    def actorList(self) -> list[OoT_ActorElement]:
+        """general actor list"""
+
         # Path to the ``ActorList.xml`` file
         actorXML = path.dirname(path.abspath(__file__)) + "/xml/ActorList.xml"
-        actorRoot = getXMLRoot(actorXML)
+        return getXMLSnapshot(actorXML, self.getActorList)
 
-        # general actor list
-        self.actorList: list[OoT_ActorElement] = []
+    @staticmethod
+    def getActorList(actorRoot: Element):
+        actorList: list[OoT_ActorElement] = []
 
         for actor in actorRoot.iterfind("Actor"):
             tiedObjects = []
@@ -27,7 +33,7 @@ class OoT_ActorData:
             actorName = f"{actor.attrib['Name']} - {actor.attrib['ID'].removeprefix('ACTOR_')}"
             if objKey is not None:  # actors don't always use an object
                 tiedObjects = objKey.split(",")
-            self.actorList.append(
+            actorList.append(
                 OoT_ActorElement(
                     actor.attrib["ID"],
                     actor.attrib["Key"],
@@ -37,12 +43,23 @@ class OoT_ActorData:
                     tiedObjects,
                 )
             )
-        self.actorsByKey = {actor.key: actor for actor in self.actorList}
-        self.actorsByID = {actor.id: actor for actor in self.actorList}
 
+        return actorList
+
+    @cached_property
+    def actorsByKey(self):
+        return {actor.key: actor for actor in self.actorList}
+
+    @cached_property
+    def actorsByID(self):
+        return {actor.id: actor for actor in self.actorList}
+
+    @cached_property
+    def ootEnumActorID(self):
         # list of tuples used by Blender's enum properties
         lastIndex = max(1, *(actor.index for actor in self.actorList))
-        self.ootEnumActorID = [("None", f"{i} (Deleted from the XML)", "None") for i in range(lastIndex)]
-        self.ootEnumActorID.insert(0, ("Custom", "Custom Actor", "Custom"))
+        ootEnumActorID = [("None", f"{i} (Deleted from the XML)", "None") for i in range(lastIndex)]
+        ootEnumActorID.insert(0, ("Custom", "Custom Actor", "Custom"))
         for actor in self.actorList:
-            self.ootEnumActorID[actor.index] = (actor.id, actor.name, actor.id)
+            ootEnumActorID[actor.index] = (actor.id, actor.name, actor.id)
+        return ootEnumActorID
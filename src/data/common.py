@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cached_property
 
 
 @dataclass
@@ -11,13 +12,22 @@ class OoT_BaseElement:
 
 @dataclass
 class OoT_Data:
-    """Contains data related to OoT, like actors or objects"""
+    """Contains data related to OoT, like actors or objects, each table is only loaded when it's first used"""
 
-    def __init__(self):
+    @cached_property
+    def enumData(self):
         from .enum_data import OoT_EnumData
+
+        return OoT_EnumData()
+
+    @cached_property
+    def objectData(self):
         from .object_data import OoT_ObjectData
+
+        return OoT_ObjectData()
+
+    @cached_property
+    def actorData(self):
         from .actor_data import OoT_ActorData
 
-        self.enumData = OoT_EnumData()
-        self.objectData = OoT_ObjectData()
-        self.actorData = OoT_ActorData()
+        return OoT_ActorData()
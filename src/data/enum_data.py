@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
+from functools import cached_property
 from os import path
-from .getters import getXMLRoot
+from xml.etree.ElementTree import Element
+from .getters import getXMLSnapshot
 from .common import OoT_BaseElement
 
 # Note: "enumData" in this context refers to an OoT Object file (like ``gameplay_keep``)
@@ -54,54 +56,57 @@ class OoT_EnumElement(OoT_BaseElement):
 class OoT_EnumData:
     """Cutscene and misc enum data"""
 
-    def __init__(self):
-        # general enumData list
-        self.enumDataList: list[OoT_EnumElement] = []
+    deletedEntry = ("None", "(Deleted from the XML)", "None")
+
+    @cached_property
+    def enumDataList(self) -> list[OoT_EnumElement]:
+        """general enumData list"""
 
         # Path to the ``EnumData.xml`` file
         enumDataXML = path.dirname(path.abspath(__file__)) + "/xml/EnumData.xml"
-        enumDataRoot = getXMLRoot(enumDataXML)
-
-        for enum in enumDataRoot.iterfind("Enum"):
-            self.enumDataList.append(
-                OoT_EnumElement(
-                    enum.attrib["ID"],
-                    enum.attrib["Key"],
-                    None,
-                    None,
-                    [
-                        OoT_ItemElement(
-                            item.attrib["ID"],
-                            item.attrib["Key"],
-                            # note: the name sets automatically after the init if None
-                            item.attrib["Name"] if enum.attrib["Key"] == "seqId" else None,
-                            int(item.attrib["Index"]),
-                            enum.attrib["Key"],
-                        )
-                        for item in enum
-                    ],
-                )
+        return getXMLSnapshot(enumDataXML, self.getEnumDataList)
+
+    @staticmethod
+    def getEnumDataList(enumDataRoot: Element):
+        return [
+            OoT_EnumElement(
+                enum.attrib["ID"],
+                enum.attrib["Key"],
+                None,
+                None,
+                [
+                    OoT_ItemElement(
+                        item.attrib["ID"],
+                        item.attrib["Key"],
+                        # note: the name sets automatically after the init if None
+                        item.attrib["Name"] if enum.attrib["Key"] == "seqId" else None,
+                        int(item.attrib["Index"]),
+                        enum.attrib["Key"],
+                    )
+                    for item in enum
+                ],
             )
-
-        # create list of tuples used by Blender's enum properties
-        self.deletedEntry = ("None", "(Deleted from the XML)", "None")
-
-        self.ootEnumCsCmd: list[tuple[str, str, str]] = []
-        self.ootEnumCsMiscType: list[tuple[str, str, str]] = []
-        self.ootEnumCsTextType: list[tuple[str, str, str]] = []
-        self.ootEnumCsFadeOutSeqPlayer: list[tuple[str, str, str]] = []
-        self.ootEnumCsTransitionType: list[tuple[str, str, str]] = []
-        self.ootEnumCsDestination: list[tuple[str, str, str]] = []
-        self.ootEnumCsPlayerCueId: list[tuple[str, str, str]] = []
-        self.ootEnumNaviQuestHintType: list[tuple[str, str, str]] = []
-        self.ootEnumOcarinaSongActionId: list[tuple[str, str, str]] = []
-        self.ootEnumSeqId: list[tuple[str, str, str]] = []
-
-        self.enumByID = {enum.id: enum for enum in self.enumDataList}
-        self.enumByKey = {enum.key: enum for enum in self.enumDataList}
-
-        for key in self.enumByKey.keys():
-            setattr(self, "ootEnum" + key[0].upper() + key[1:], self.getOoTEnumData(key))
+            for enum in enumDataRoot.iterfind("Enum")
+        ]
+
+    @cached_property
+    def enumByID(self):
+        return {enum.id: enum for enum in self.enumDataList}
+
+    @cached_property
+    def enumByKey(self):
+        return {enum.key: enum for enum in self.enumDataList}
+
+    def __getattr__(self, name: str):
+        # create list of tuples used by Blender's enum properties when they're first used,
+        # ``ootEnumCsMiscType`` is the list of the ``csMiscType`` enum for instance
+        if name.startswith("ootEnum") and len(name) > 7:
+            key = name[7].lower() + name[8:]
+            if key in self.enumByKey:
+                enumData = self.getOoTEnumData(key)
+                setattr(self, name, enumData)
+                return enumData
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
     def getOoTEnumData(self, enumKey: str):
         enum = self.enumByKey[enumKey]
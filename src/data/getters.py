@@ -1,9 +1,68 @@
+import pickle
+
+from hashlib import sha256
+from inspect import getsourcefile
+from os import makedirs, path, replace
+from typing import Any, Callable
 from xml.etree.ElementTree import parse as parseXML, Element
 
 
+# bump this when the layout of the snapshot files changes
+SNAPSHOT_FORMAT = 1
+
+# module of the classes every snapshot is made of, the snapshots are built again when it (or the builder's module) changes
+commonFile = path.join(path.dirname(path.abspath(__file__)), "common.py")
+
+
 def getXMLRoot(xmlPath: str) -> Element:
     """Parse an XML file and return its root element"""
     try:
         return parseXML(xmlPath).getroot()
     except:
         raise ValueError(f"ERROR: File '{xmlPath}' is missing or malformed.")
+
+
+def getXMLSnapshot(xmlPath: str, build: Callable[[Element], Any]):
+    """
+    Returns the data built by ``build`` from an XML file.
+    The result is saved in a snapshot next to the compiled python files and reused as long as the XML
+    and the modules building the data don't change.
+    """
+
+    hash = sha256(f"{SNAPSHOT_FORMAT}".encode())
+    try:
+        with open(xmlPath, "rb") as file:
+            hash.update(file.read())
+    except OSError:
+        raise ValueError(f"ERROR: File '{xmlPath}' is missing or malformed.")
+
+    for sourcePath in [getsourcefile(build), commonFile]:
+        with open(sourcePath, "rb") as file:
+            hash.update(file.read())
+    digest = hash.hexdigest()
+
+    snapshotPath = path.join(path.dirname(path.abspath(__file__)), "__pycache__", f"{path.basename(xmlPath)}.snapshot")
+
+    try:
+        with open(snapshotPath, "rb") as file:
+            snapshot = pickle.load(file)
+
+        if snapshot["digest"] == digest:
+            return snapshot["data"]
+    except (OSError, EOFError, KeyError, TypeError, AttributeError, pickle.UnpicklingError):
+        # missing, outdated or broken snapshot, build the data from the XML
+        pass
+
+    data = build(getXMLRoot(xmlPath))
+
+    try:
+        makedirs(path.dirname(snapshotPath), exist_ok=True)
+        tmpPath = f"{snapshotPath}.tmp"
+        with open(tmpPath, "wb") as file:
+            pickle.dump({"digest": digest, "data": data}, file, pickle.HIGHEST_PROTOCOL)
+        replace(tmpPath, snapshotPath)
+    except OSError:
+        # the snapshot is only an optimisation, it doesn't matter if it can't be written
+        pass
+
+    return data
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from functools import cached_property
 from os import path
-from .getters import getXMLRoot
+from xml.etree.ElementTree import Element
+from .getters import getXMLSnapshot
 from .common import OoT_BaseElement
 
 # Note: "object" in this context refers to an OoT Object file (like ``gameplay_keep``)
@@ -14,35 +16,53 @@ class OoT_ObjectElement(OoT_BaseElement):
 class OoT_ObjectData:
     """Everything related to OoT objects"""
 
-    def __init__(self):
-        # general object list
-        self.objectList: list[OoT_ObjectElement] = []
+    # list of tuples used by Blender's enum properties
+    deletedEntry = ("None", "(Deleted from the XML)", "None")
+
+    @cached_property
+    def objectList(self) -> list[OoT_ObjectElement]:
+        """general object list"""
 
         # Path to the ``ObjectList.xml`` file
         objectXML = path.dirname(path.abspath(__file__)) + "/xml/ObjectList.xml"
-        objectRoot = getXMLRoot(objectXML)
+        return getXMLSnapshot(objectXML, self.getObjectList)
+
+    @staticmethod
+    def getObjectList(objectRoot: Element):
+        objectList: list[OoT_ObjectElement] = []
 
         for obj in objectRoot.iterfind("Object"):
             objName = f"{obj.attrib['Name']} - {obj.attrib['ID'].removeprefix('OBJECT_')}"
-            self.objectList.append(
+            objectList.append(
                 OoT_ObjectElement(obj.attrib["ID"], obj.attrib["Key"], objName, int(obj.attrib["Index"]))
             )
 
-        self.objectsByID = {obj.id: obj for obj in self.objectList}
-        self.objectsByKey = {obj.key: obj for obj in self.objectList}
+        return objectList
+
+    @cached_property
+    def objectsByID(self):
+        return {obj.id: obj for obj in self.objectList}
 
-        # list of tuples used by Blender's enum properties
-        self.deletedEntry = ("None", "(Deleted from the XML)", "None")
+    @cached_property
+    def objectsByKey(self):
+        return {obj.key: obj for obj in self.objectList}
+
+    @cached_property
+    def ootEnumObjectKey(self):
         lastIndex = max(1, *(obj.index for obj in self.objectList))
-        self.ootEnumObjectKey = self.getObjectIDList(lastIndex + 1, False)
+        return self.getObjectIDList(lastIndex + 1, False)
 
+    @cached_property
+    def ootEnumObjectIDLegacy(self):
         # create the legacy object list for old blends
-        self.ootEnumObjectIDLegacy = self.getObjectIDList(self.objectsByKey["obj_timeblock"].index + 1, True)
+        ootEnumObjectIDLegacy = self.getObjectIDList(self.objectsByKey["obj_timeblock"].index + 1, True)
 
         # validate the legacy list, if there's any None element then something's wrong
-        if self.deletedEntry in self.ootEnumObjectIDLegacy:
+        if self.deletedEntry in ootEnumObjectIDLegacy:
             raise ValueError("ERROR: Legacy Object List doesn't match!")
 
+        return ootEnumObjectIDLegacy
+
     def getObjectIDList(self, max: int, isLegacy: bool):
         """Generates and returns the object list in the right order"""
         objList = [self.deletedEntry] * max
@@ -0,0 +1,99 @@
+import json
+
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Optional
+
+from usage import CommandUsage
+
+
+# Diagnostics of the resilient import: instead of stopping at the first error, the scene files, cutscenes and commands
+# that can't be imported are skipped and described by a ``Diagnostic``, returned with the cutscenes of their file
+# (see ``FileCutscenes``) so they also come back from the worker processes and the parse cache.
+
+
+class ParamCountError(ValueError):
+    """Raised when a command doesn't have the expected number of parameters"""
+
+    def __init__(self, command: str, expected: int, found: int):
+        super().__init__(
+            f"ERROR: The number of expected parameters for `{command}` and the number of found ones is not the same!"
+        )
+        self.command = command
+        self.expected = expected
+        self.found = found
+
+
+@dataclass
+class Diagnostic:
+    """A scene file, cutscene or command skipped by the resilient import"""
+
+    message: str
+    file: Optional[str] = None  # set when the diagnostics of a file are collected, identical files share them
+    line: Optional[int] = None
+    cutscene: Optional[str] = None
+    command: Optional[str] = None
+    expectedParams: Optional[int] = None
+    foundParams: Optional[int] = None
+
+    def __str__(self):
+        location = self.file if self.file is not None else "?"
+        if self.line is not None:
+            location += f":{self.line}"
+
+        text = f"{location}: "
+        if self.cutscene is not None:
+            text += f"{self.cutscene}, "
+        if self.command is not None:
+            text += f"`{self.command}`, "
+        text += self.message.removeprefix("ERROR: ")
+
+        if self.expectedParams is not None:
+            text += f" (expected {self.expectedParams} parameters, found {self.foundParams})"
+        return text
+
+
+def getDiagnostic(error: Exception, line: Optional[int] = None, cutscene: Optional[str] = None, command: Optional[str] = None):
+    diagnostic = Diagnostic(str(error), line=line, cutscene=cutscene, command=command)
+    if isinstance(error, ParamCountError):
+        diagnostic.expectedParams = error.expected
+        diagnostic.foundParams = error.found
+    return diagnostic
+
+
+class FileCutscenes(list):
+    """
+    Cutscenes of a scene file imported by the resilient import, with the diagnostics of what was skipped,
+    or by an import counting the command usage, with the usage of the file (see ``usage.py``)
+    """
+
+    def __init__(
+        self, cutscenes=(), diagnostics: Optional[list[Diagnostic]] = None, usage: Optional[CommandUsage] = None
+    ):
+        super().__init__(cutscenes)
+        self.diagnostics = diagnostics if diagnostics is not None else []
+        self.usage = usage
+
+
+@dataclass
+class DiagnosticReport:
+    """Diagnostics of every scene file, collected in the order the files are imported"""
+
+    diagnostics: list[Diagnostic] = field(default_factory=list)
+
+    def add(self, file: str, diagnostics: list[Diagnostic]):
+        self.diagnostics.extend(replace(diagnostic, file=file) for diagnostic in diagnostics)
+
+    def print(self):
+        if len(self.diagnostics) == 0:
+            print("Imported every scene file without errors.")
+            return
+
+        files = len(set(diagnostic.file for diagnostic in self.diagnostics))
+        parts = "part" if len(self.diagnostics) == 1 else "parts"
+        print(f"Skipped {len(self.diagnostics)} {parts} of {files} {'scene file' if files == 1 else 'scene files'}:")
+        for diagnostic in self.diagnostics:
+            print(f"    {diagnostic}")
+
+    def writeJSON(self, path: Path):
+        path.write_text(json.dumps([asdict(diagnostic) for diagnostic in self.diagnostics], indent=4), encoding="utf-8")
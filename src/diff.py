@@ -0,0 +1,278 @@
+import json
+
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Optional
+
+from classes import Cutscene, CutsceneCmdCamPoint, cmdToClass
+from corpus import fieldKinds, listClasses, viewClasses
+
+
+# Structural diff of the cutscenes of two versions, matched by name.
+# Every command list of a cutscene (``actorCueList``, ``textList``...) is turned into a list of keys (the exported fields
+# of each command, see ``corpus.py``, and of its entries), lists with equal keys are skipped,
+# only the lists that differ are compared with a sequence diff.
+# Cutscenes parsed from identical scene files are the same objects (see ``CutsceneImport.iterVersions()``) and are skipped too.
+
+# command class to the macro shown in the report
+classMacros: dict[type, str] = {}
+for macro, cls in cmdToClass.items():
+    classMacros.setdefault(cls, macro)
+
+# position of ``frame`` in the key of a camera point
+pointFrameIndex = 1 + [fieldName for fieldName, _ in fieldKinds[CutsceneCmdCamPoint]].index("frame")
+
+
+def getCommandKey(command: Any):
+    """Returns the compared fields of a command (without its entries), starting with its class"""
+
+    cls = viewClasses.get(type(command), type(command))
+    values = [cls]
+    for fieldName, _ in fieldKinds[cls]:
+        value = getattr(command, fieldName)
+        values.append(tuple(value) if isinstance(value, (list, tuple)) else value)
+    return tuple(values)
+
+
+def getListKeys(commands: list[Any]):
+    """Returns the key of each command, with the keys of its entries"""
+
+    keys = []
+    for command in commands:
+        entries = getattr(command, "entries", None)
+        entryKeys = tuple(getCommandKey(entry) for entry in entries) if entries is not None else ()
+        keys.append((getCommandKey(command), entryKeys))
+    return keys
+
+
+def getCutsceneKeys(cutscene: Cutscene):
+    """Returns the keys of every command list of a cutscene, the destination counts as a list"""
+
+    lists = {listName: getattr(cutscene, listName) for listName in listClasses}
+    lists["destination"] = [cutscene.destination] if cutscene.destination is not None else []
+
+    return {listName: getListKeys(commands) for listName, commands in lists.items()}
+
+
+def getFrames(startFrame: Optional[int], endFrame: Optional[int]):
+    if startFrame is None:
+        return ""
+    if endFrame is None or endFrame == startFrame:
+        return f"frame {startFrame}"
+    return f"frames {startFrame}-{endFrame}"
+
+
+@dataclass
+class CommandChange:
+    """A command (or an entry of a command) added, removed or modified, with the frames of the new version if it has them"""
+
+    change: str  # "added", "removed" or "modified"
+    command: str  # macro of the command
+    index: int  # position in the list of the old version for removed commands, of the new version otherwise
+    startFrame: Optional[int] = None
+    endFrame: Optional[int] = None
+    entries: list["CommandChange"] = field(default_factory=list)  # changed entries of a modified list command
+
+    def __str__(self):
+        frames = getFrames(self.startFrame, self.endFrame)
+        text = f"{self.change} {self.command} #{self.index}" + (f" ({frames})" if frames != "" else "")
+        if len(self.entries) > 0:
+            counts = {change: sum(entry.change == change for entry in self.entries) for change in ["added", "removed", "modified"]}
+            text += ": " + ", ".join(f"{count} {change}" for change, count in counts.items() if count > 0) + " entries"
+        return text
+
+    def getReport(self):
+        report = {
+            "change": self.change,
+            "command": self.command,
+            "index": self.index,
+            "startFrame": self.startFrame,
+            "endFrame": self.endFrame,
+        }
+        if len(self.entries) > 0:
+            report["entries"] = [entry.getReport() for entry in self.entries]
+        return report
+
+
+def getPointFrames(key: tuple):
+    """
+    Returns the start and end frame of every camera point of a spline (from its key), the points have no frames of their own:
+    each one lasts its ``frame`` field from the end of the previous one, the first one starts with the spline
+    """
+
+    frames = []
+    startFrame = key[0][1]
+    for entryKey in key[1]:
+        endFrame = startFrame + entryKey[pointFrameIndex] if startFrame is not None else None
+        frames.append((startFrame, endFrame))
+        startFrame = endFrame
+    return frames
+
+
+def getChange(change: str, key: tuple, index: int):
+    # ``startFrame`` and ``endFrame`` are the first exported fields of every command,
+    # they're ``None`` for the camera points which get theirs from the spline (see ``diffEntries()``)
+    return CommandChange(change, classMacros.get(key[0], key[0].__name__), index, key[1], key[2])
+
+
+def diffSequences(oldKeys: list, newKeys: list, getHead, diffModified):
+    """
+    Returns the changes between two lists of keys, ``getHead`` gives the key of the command itself
+    and ``diffModified`` the changed entries of a command found in both lists.
+    """
+
+    changes: list[CommandChange] = []
+    matcher = SequenceMatcher(None, oldKeys, newKeys, autojunk=False)
+
+    for tag, oldStart, oldEnd, newStart, newEnd in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+
+        # commands replaced by one of the same class are modified, the others are removed or added
+        oldIndex, newIndex = oldStart, newStart
+        while oldIndex < oldEnd and newIndex < newEnd:
+            oldHead, newHead = getHead(oldKeys[oldIndex]), getHead(newKeys[newIndex])
+            if oldHead[0] is not newHead[0]:
+                break
+            change = getChange("modified", newHead, newIndex)
+            change.entries = diffModified(oldKeys[oldIndex], newKeys[newIndex])
+            changes.append(change)
+            oldIndex += 1
+            newIndex += 1
+
+        for i in range(oldIndex, oldEnd):
+            changes.append(getChange("removed", getHead(oldKeys[i]), i))
+        for i in range(newIndex, newEnd):
+            changes.append(getChange("added", getHead(newKeys[i]), i))
+
+    return changes
+
+
+def diffEntries(oldKey: tuple, newKey: tuple):
+    changes = diffSequences(list(oldKey[1]), list(newKey[1]), lambda key: key, lambda old, new: [])
+
+    if any(change.command == classMacros[CutsceneCmdCamPoint] for change in changes):
+        oldFrames, newFrames = getPointFrames(oldKey), getPointFrames(newKey)
+        for change in changes:
+            frames = oldFrames if change.change == "removed" else newFrames
+            change.startFrame, change.endFrame = frames[change.index]
+
+    return changes
+
+
+def diffLists(oldKeys: list, newKeys: list):
+    return diffSequences(oldKeys, newKeys, lambda key: key[0], diffEntries)
+
+
+@dataclass
+class CutsceneDiff:
+    """Changes of a cutscene between two versions, by command list"""
+
+    name: str
+    scene: str
+    status: str  # "modified", "added" (only in the new version) or "removed" (only in the old version)
+    frameCount: Optional[tuple[int, int]] = None  # old and new frame count, if it changed
+    lists: dict[str, list[CommandChange]] = field(default_factory=dict)
+
+    def getReport(self):
+        report: dict[str, Any] = {"name": self.name, "scene": self.scene, "status": self.status}
+        if self.frameCount is not None:
+            report["frameCount"] = list(self.frameCount)
+        if len(self.lists) > 0:
+            report["lists"] = {listName: [change.getReport() for change in changes] for listName, changes in self.lists.items()}
+        return report
+
+
+def diffCutscenes(name: str, scene: str, old: Cutscene, new: Cutscene):
+    """Returns the changes between two cutscenes, ``None`` if they are identical"""
+
+    if old is new:
+        return None
+
+    result = CutsceneDiff(name, scene, "modified")
+    if old.frameCount != new.frameCount:
+        result.frameCount = (old.frameCount, new.frameCount)
+
+    oldKeys, newKeys = getCutsceneKeys(old), getCutsceneKeys(new)
+    for listName, oldListKeys in oldKeys.items():
+        newListKeys = newKeys[listName]
+        if oldListKeys != newListKeys:
+            changes = diffLists(oldListKeys, newListKeys)
+            if len(changes) > 0:
+                result.lists[listName] = changes
+
+    if result.frameCount is None and len(result.lists) == 0:
+        return None
+    return result
+
+
+@dataclass
+class VersionDiff:
+    """Cutscenes changed between two versions"""
+
+    oldVersion: str
+    newVersion: str
+    unchanged: int = 0  # number of cutscenes found in both versions without changes
+    cutscenes: list[CutsceneDiff] = field(default_factory=list)
+
+    def getCount(self, status: str):
+        return sum(cutscene.status == status for cutscene in self.cutscenes)
+
+    def print(self):
+        print(
+            f"{self.oldVersion} -> {self.newVersion}: {self.unchanged} unchanged, {self.getCount('modified')} modified, "
+            + f"{self.getCount('added')} added and {self.getCount('removed')} removed cutscenes."
+        )
+
+        for cutscene in self.cutscenes:
+            if cutscene.status != "modified":
+                print(f"{cutscene.name} ({cutscene.scene}): {cutscene.status}")
+                continue
+
+            print(f"{cutscene.name} ({cutscene.scene}):")
+            if cutscene.frameCount is not None:
+                print(f"    frame count: {cutscene.frameCount[0]} -> {cutscene.frameCount[1]}")
+            for listName, changes in cutscene.lists.items():
+                print(f"    {listName}:")
+                for change in changes:
+                    print(f"        {change}")
+                    for entry in change.entries:
+                        print(f"            {entry}")
+
+    def getReport(self):
+        return {
+            "oldVersion": self.oldVersion,
+            "newVersion": self.newVersion,
+            "unchanged": self.unchanged,
+            "cutscenes": [cutscene.getReport() for cutscene in self.cutscenes],
+        }
+
+    def writeJSON(self, path: Path):
+        path.write_text(json.dumps(self.getReport(), indent=4), encoding="utf-8")
+
+
+def diffVersions(
+    oldVersion: str, old: dict[str, tuple[str, Cutscene]], newVersion: str, new: dict[str, tuple[str, Cutscene]]
+):
+    """Returns the changes between the cutscenes of two versions, given by name with their scene"""
+
+    result = VersionDiff(oldVersion, newVersion)
+
+    for name, (scene, cutscene) in old.items():
+        if not name in new:
+            result.cutscenes.append(CutsceneDiff(name, scene, "removed"))
+            continue
+
+        newScene, newCutscene = new[name]
+        cutsceneDiff = diffCutscenes(name, newScene, cutscene, newCutscene)
+        if cutsceneDiff is not None:
+            result.cutscenes.append(cutsceneDiff)
+        else:
+            result.unchanged += 1
+
+    for name, (scene, _) in new.items():
+        if not name in old:
+            result.cutscenes.append(CutsceneDiff(name, scene, "added"))
+
+    return result
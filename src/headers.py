@@ -0,0 +1,162 @@
+import json
+import re
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+# Index of the references to the cutscenes, used to tell if a cutscene can play in-game and from which scene header.
+# The scene headers (``SceneCmd`` arrays) are read from the memory-mapped scene files during the prefilter,
+# so it doesn't cost another walk of the tree nor another read of the files.
+# The entrance cutscenes (played when entering an area the first time) are read from ``src/code/z_demo.c``.
+
+sceneCmdRegex = re.compile(rb"SceneCmd\s*(\*?)\s*(\w+)\s*\[\s*\w*\s*\]\s*=\s*\{(.*?)\};", re.DOTALL)
+commentRegex = re.compile(rb"//[^\n]*|/\*.*?\*/", re.DOTALL)
+csDataCmdRegex = re.compile(rb"SCENE_CMD_CUTSCENE_DATA\(\s*(\w+)\s*\)")
+altHeaderCmdRegex = re.compile(rb"SCENE_CMD_ALTERNATE_HEADER_LIST\(\s*(\w+)\s*\)")
+entranceCsRegex = re.compile(r"\{\s*(ENTR_\w+)\s*,\s*(\w+)\s*,\s*(\w+)\s*,\s*(\w+)\s*\}")
+
+entranceCsFile = "src/code/z_demo.c"
+
+# the first 4 headers are the default setups, the next ones are the cutscene setups
+headerSetups = ["child day", "child night", "adult day", "adult night"]
+
+# ``ageRestriction`` of the entrance cutscene table
+entranceAges = {"0": "adult", "1": "child", "2": "any age"}
+
+
+def getSetupName(headerIndex: int):
+    if headerIndex < len(headerSetups):
+        return headerSetups[headerIndex]
+    return f"cutscene {headerIndex - len(headerSetups)}"
+
+
+@dataclass
+class HeaderReference:
+    """A scene header using a cutscene with ``SCENE_CMD_CUTSCENE_DATA()``"""
+
+    scene: str
+    header: str  # name of the ``SceneCmd`` array
+    headerIndex: int  # 0 for the main header, the alternate headers start at 1
+    setup: str
+
+    def __str__(self):
+        return f"{self.scene} header {self.headerIndex} ({self.setup})"
+
+
+@dataclass
+class EntranceReference:
+    """An entry of the entrance cutscene table"""
+
+    entrance: str
+    age: str
+    flag: str
+
+    def __str__(self):
+        return f"entrance {self.entrance} ({self.age}, {self.flag})"
+
+
+def getHeaderReferences(data: bytes, scene: str):
+    """Returns the references to the cutscenes found in the scene headers of a scene file, by cutscene name"""
+
+    csData: dict[str, list[str]] = {}  # header to the cutscenes it uses
+    altHeaderLists: dict[str, list[Optional[str]]] = {}  # alternate header list to its headers
+    altHeaderCmds: dict[str, str] = {}  # header to its alternate header list
+
+    for match in sceneCmdRegex.finditer(data):
+        isPointer, name, body = match.group(1), match.group(2).decode(), commentRegex.sub(b"", match.group(3))
+
+        if isPointer:
+            headers = [item.strip().decode() for item in body.split(b",") if item.strip() != b""]
+            altHeaderLists[name] = [header if header not in ("NULL", "0") else None for header in headers]
+        else:
+            csData[name] = [symbol.decode() for symbol in csDataCmdRegex.findall(body)]
+            altHeaderCmd = altHeaderCmdRegex.search(body)
+            if altHeaderCmd is not None:
+                altHeaderCmds[name] = altHeaderCmd.group(1).decode()
+
+    # the main headers are the ones not used as an alternate header
+    headerIndices = {header: 0 for header in csData}
+    for listName in altHeaderCmds.values():
+        for i, header in enumerate(altHeaderLists.get(listName, []), 1):
+            if header is not None:
+                headerIndices[header] = i
+
+    references: dict[str, list[HeaderReference]] = {}
+    for header, symbols in csData.items():
+        headerIndex = headerIndices[header]
+        for symbol in symbols:
+            references.setdefault(symbol, []).append(
+                HeaderReference(scene, header, headerIndex, getSetupName(headerIndex))
+            )
+    return references
+
+
+def readEntranceCutscenes(decomp_path: Path):
+    """Returns the entries of the entrance cutscene table by cutscene name, none if ``z_demo.c`` is missing"""
+
+    try:
+        fileData = commentRegex.sub(b"", (decomp_path / entranceCsFile).read_bytes()).decode("utf-8")
+    except OSError:
+        return {}
+
+    references: dict[str, list[EntranceReference]] = {}
+    for entrance, age, flag, symbol in entranceCsRegex.findall(fileData):
+        references.setdefault(symbol, []).append(EntranceReference(entrance, entranceAges.get(age, age), flag))
+    return references
+
+
+@dataclass
+class SceneHeaderIndex:
+    """References to the cutscenes from the scene headers of every version and from the entrance cutscene table"""
+
+    headers: dict[str, dict[str, list[HeaderReference]]] = field(default_factory=dict)  # by version, then cutscene name
+    entrances: dict[str, list[EntranceReference]] = field(default_factory=dict)  # by cutscene name
+
+    def addSceneFile(self, version: str, scene: str, data: bytes):
+        versionHeaders = self.headers.setdefault(version, {})
+        for symbol, references in getHeaderReferences(data, scene).items():
+            versionHeaders.setdefault(symbol, []).extend(references)
+
+    def readEntrances(self, decomp_path: Path):
+        self.entrances = readEntranceCutscenes(decomp_path)
+
+    def getReferences(self, version: str, name: str) -> list[HeaderReference | EntranceReference]:
+        return [*self.headers.get(version, {}).get(name, []), *self.entrances.get(name, [])]
+
+    def getReport(self, cutscenes: dict[str, list[tuple[str, str]]]):
+        """
+        Returns the references to each cutscene and the cutscenes nothing refers to, by version.
+        ``cutscenes`` has the name and scene of the imported cutscenes of each version.
+        """
+
+        report = {}
+        for version, names in cutscenes.items():
+            referenced = {}
+            unreferenced = []
+            for name, scene in names:
+                references = self.getReferences(version, name)
+                if len(references) > 0:
+                    referenced[name] = [str(reference) for reference in references]
+                else:
+                    unreferenced.append({"name": name, "scene": scene})
+            report[version] = {"referenced": referenced, "unreferenced": unreferenced}
+        return report
+
+    def print(self, cutscenes: dict[str, list[tuple[str, str]]]):
+        for version, versionReport in self.getReport(cutscenes).items():
+            print(f"Cutscenes referenced by a scene header or an entrance ({version}):")
+            for name, references in versionReport["referenced"].items():
+                print(f"    {name}: " + ", ".join(references))
+
+            if len(versionReport["unreferenced"]) == 0:
+                print(f"Every cutscene of {version} is referenced.")
+                continue
+
+            print(f"Cutscenes nothing refers to ({version}):")
+            for cutscene in versionReport["unreferenced"]:
+                print(f"    {cutscene['name']} ({cutscene['scene']})")
+
+    def writeJSON(self, path: Path, cutscenes: dict[str, list[tuple[str, str]]]):
+        path.write_text(json.dumps(self.getReport(cutscenes), indent=4), encoding="utf-8")
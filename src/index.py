@@ -0,0 +1,183 @@
+import json
+
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from classes import Cutscene, CutsceneCmdText
+from literals import getEnumKey, getInteger
+
+
+# Inverted index of the cutscenes: for each indexed field (see ``indexFields``), the rows of the cutscenes using each value.
+# It's filled once while the cutscenes are imported, answering "which cutscenes use X" is then a single dict lookup.
+# The index can be saved to a JSON file and loaded back instead of importing the cutscenes again,
+# with the modification time and size of the files it was built from to know when it's outdated.
+
+# bump this when the indexed fields or the file layout change
+INDEX_FORMAT = 2
+
+# indexed field to its description
+indexFields = {
+    "actorCue": "actor cue command types",
+    "seqId": "sequences started or stopped",
+    "textId": "text IDs",
+    "destination": "destinations",
+    "misc": "misc command types",
+    "transition": "transition types",
+}
+
+# indexed field to the enum of its values, these can be queried by enum key, ID (like ``NA_BGM_ZELDA_THEME``) or index
+enumFields = {
+    "seqId": "seqId",
+    "destination": "csDestination",
+    "misc": "csMiscType",
+    "transition": "csTransitionType",
+}
+
+
+def getTextKey(textId: int):
+    return f"0x{textId & 0xFFFF:04X}"
+
+
+def getSourceStats(paths: list[Path]):
+    """Returns the modification time and size of each file, compared to the ones saved with an index"""
+
+    stats: dict[str, list[int]] = {}
+    for path in paths:
+        stat = path.stat()
+        stats[str(path)] = [stat.st_mtime_ns, stat.st_size]
+    return stats
+
+
+def getCutsceneKeys(cutscene: Cutscene):
+    """Returns the values of every indexed field used by a cutscene"""
+
+    keys: dict[str, set[str]] = {field: set() for field in indexFields}
+
+    for cueList in cutscene.actorCueList + cutscene.playerCueList:
+        keys["actorCue"].add(str(cueList.commandType))
+
+    for seqList in cutscene.seqList:
+        for seq in seqList.entries:
+            keys["seqId"].add(seq.seqId)
+
+    for textList in cutscene.textList:
+        for text in textList.entries:
+            if isinstance(text, CutsceneCmdText):
+                keys["textId"].add(getTextKey(text.textId))
+
+    if cutscene.destination is not None:
+        keys["destination"].add(cutscene.destination.id)
+
+    for miscList in cutscene.miscList:
+        for misc in miscList.entries:
+            keys["misc"].add(misc.type)
+
+    for transition in cutscene.transitionList:
+        keys["transition"].add(transition.type)
+
+    return keys
+
+
+class CutsceneIndex:
+    """Rows (name, scene and version) of the cutscenes added to it, and the rows using each value of the indexed fields"""
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.scenes: list[str] = []
+        self.versions: list[str] = []
+        self.postings: dict[str, dict[str, array]] = {field: {} for field in indexFields}
+        self.sources: dict[str, list[int]] = {}  # files the index was built from, see ``getSourceStats()``
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, cutscene: Cutscene, scene: str = "", version: str = ""):
+        row = len(self.names)
+        self.names.append(cutscene.name)
+        self.scenes.append(scene)
+        self.versions.append(version)
+
+        for field, values in getCutsceneKeys(cutscene).items():
+            postings = self.postings[field]
+            for value in values:
+                rows = postings.get(value)
+                if rows is None:
+                    rows = postings[value] = array("Q")
+                rows.append(row)
+
+    def checkField(self, field: str):
+        if not field in self.postings:
+            raise ValueError(f"ERROR: Unknown index field '{field}', expected one of {', '.join(indexFields)}")
+
+    def getKey(self, field: str, value: str):
+        """Returns the key ``value`` is indexed under, text IDs can be given in decimal or hex and enum values by ID"""
+
+        self.checkField(field)
+
+        if field == "textId":
+            try:
+                return getTextKey(getInteger(value))
+            except ValueError:
+                raise ValueError(f"ERROR: '{value}' is not a text ID")
+
+        if field in enumFields:
+            try:
+                return getEnumKey(enumFields[field], value)
+            except ValueError:
+                # already an enum key
+                return value
+
+        return value
+
+    def query(self, field: str, value: str):
+        """Returns the rows of the cutscenes using ``value`` for ``field``"""
+
+        key = self.getKey(field, value)
+        return self.postings[field].get(key, array("Q"))
+
+    def getValues(self, field: str):
+        """Returns the number of cutscenes using each value of ``field``, most used first"""
+
+        self.checkField(field)
+
+        return {
+            value: len(rows)
+            for value, rows in sorted(self.postings[field].items(), key=lambda item: (-len(item[1]), item[0]))
+        }
+
+    def getReport(self):
+        return {
+            "format": INDEX_FORMAT,
+            "names": self.names,
+            "scenes": self.scenes,
+            "versions": self.versions,
+            "sources": self.sources,
+            "postings": {
+                field: {value: rows.tolist() for value, rows in postings.items()} for field, postings in self.postings.items()
+            },
+        }
+
+    def writeJSON(self, path: Path):
+        path.write_text(json.dumps(self.getReport()), encoding="utf-8")
+
+    @staticmethod
+    def readJSON(path: Path) -> Optional["CutsceneIndex"]:
+        """Returns the index saved in ``path``, ``None`` if it's missing or was saved by another version of the index"""
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+            return None
+
+        index = CutsceneIndex()
+        index.names = data["names"]
+        index.scenes = data["scenes"]
+        index.versions = data["versions"]
+        index.sources = data["sources"]
+        for field, postings in data["postings"].items():
+            index.postings[field] = {value: array("Q", rows) for value, rows in postings.items()}
+        return index
@@ -0,0 +1,130 @@
+import re
+
+from functools import lru_cache
+from constants import oot_data
+
+
+# Decoding of the C literals used as command parameters.
+# The same few hundred literals (``0x0000``, ``0``, ``CS_CAM_CONTINUE``, ``45.0f``...) make most of the parameters
+# of a version, so the decoders keep the recently used ones in a memo table instead of parsing them every time.
+
+MEMO_SIZE = 8192
+
+# keeps the results of the last ``MEMO_SIZE`` literals decoded, the frequent ones stay in it as they keep being used
+memoize = lru_cache(maxsize=MEMO_SIZE)
+
+
+# ``CS_FLOAT(0x3F800000, 1.0f)`` is replaced by ``1.0f``, the hex value is the same float as raw bits
+csFloatRegex = re.compile(r"CS_FLOAT\([^,()]*,([^()]*)\)")
+degToBinangRegex = re.compile(r"DEG_TO_BINANG\(([^()]*)\)")
+decimalRegex = re.compile(r"[+-]?\d+")
+floatRegex = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?f?")
+
+
+@memoize
+def getInteger(number: str):
+    """Returns an int number (handles properly negative hex numbers)"""
+
+    if number.startswith("0x"):
+        # hex numbers are read as signed 32 bits integers
+        if len(number) > 10:
+            raise ValueError(f"ERROR: '{number}' doesn't fit in 32 bits")
+
+        value = int(number[2:] or "0", 16)
+        return value - 0x100000000 if value >= 0x80000000 else value
+    else:
+        return int(number)
+
+
+@memoize
+def getRotation(data: str):
+    """Returns the rotation converted to hexadecimal"""
+
+    if "DEG_TO_BINANG" in data or not "0x" in data:
+        angle = float(data.split("(")[1].removesuffix(")") if "DEG_TO_BINANG" in data else data)
+        binang = int(angle * (0x8000 / 180.0))  # from ``DEG_TO_BINANG()`` in decomp
+
+        # if the angle value is higher than 0xFFFF it means we're at 360 degrees
+        return f"0x{0xFFFF if binang > 0xFFFF else binang:04X}"
+    else:
+        return data
+
+
+@memoize
+def cs_import_float(v_str: str):
+    return float(v_str.removesuffix("f"))
+
+
+def splitArgs(args: str):
+    """
+    Returns the parameters of a command from the text between its parenthesis, in one pass.
+    Whitespace is removed and ``CS_FLOAT()`` is replaced by its float value.
+    """
+
+    args = args.replace(" ", "")
+    if "\n" in args or "\t" in args:
+        # multi-line commands
+        args = "".join(args.split())
+    if "(" in args:
+        args = csFloatRegex.sub(r"\1", args)
+    return args.split(",")
+
+
+def getEnumKey(enumKey: str, literal: str, isSeqLegacy: bool = False):
+    """Returns the key of the enum item ``literal`` refers to (by ID or by index), the literal itself if there's none"""
+
+    enum = oot_data.enumData.enumByKey[enumKey]
+    item = enum.itemById.get(literal)
+    if item is None:
+        setting = getInteger(literal)
+        if isSeqLegacy:
+            setting -= 1
+        item = enum.itemByIndex.get(setting)
+    return item.key if item is not None else literal
+
+
+@memoize
+def decodeLiteral(literal: str) -> int | float | str:
+    """
+    Returns the typed value of a single parameter:
+    ints for decimal and hex numbers, binangs (int) for ``DEG_TO_BINANG()``, floats and the identifier otherwise
+    """
+
+    if literal.startswith("0x") or decimalRegex.fullmatch(literal) is not None:
+        return getInteger(literal)
+
+    match = degToBinangRegex.fullmatch(literal)
+    if match is not None:
+        return int(float(match.group(1).removesuffix("f")) * (0x8000 / 180.0))
+
+    if floatRegex.fullmatch(literal) is not None:
+        return cs_import_float(literal)
+
+    # enum values and other identifiers
+    return literal
+
+
+@memoize
+def decodeInteger(literal: str):
+    """Returns the value of an int parameter (see ``decodeLiteral()``)"""
+
+    value = decodeLiteral(literal)
+    if not isinstance(value, int):
+        raise ValueError(f"ERROR: '{literal}' isn't an integer")
+    return value
+
+
+@memoize
+def decodeFloat(literal: str):
+    """Returns the value of a float parameter, ints are accepted too (see ``decodeLiteral()``)"""
+
+    value = decodeLiteral(literal)
+    if isinstance(value, str):
+        raise ValueError(f"ERROR: '{literal}' isn't a number")
+    return float(value)
+
+
+def decodeArgs(args: str):
+    """Returns the typed values of every parameter of a command (see ``decodeLiteral()``)"""
+
+    return [decodeLiteral(param) for param in splitArgs(args)]
@@ -2,103 +2,593 @@
 
 import argparse
 
+from array import array
+from contextlib import nullcontext
+from dataclasses import asdict
 from pathlib import Path
+from typing import Any, Optional
+from binary import readCutscenes
 from classes import CutsceneImport
+from corpus import CorpusReader, CorpusWriter
+from diff import diffVersions
+from headers import SceneHeaderIndex
+from index import CutsceneIndex, getSourceStats, indexFields
+from profiler import Profiler
+from stats import CutsceneMetrics
+from usage import CommandUsage
+from watch import CutsceneWatcher, serve
+
+
+# metric, description of the highest and lowest values (``None`` to skip one) and unit of the rankings printed for each version
+rankings = [
+    ("headerEntries", "highest number of entries", "lowest number of entries", "entries"),
+    (
+        "totalEntries",
+        "highest number of entries (counting list entries)",
+        "lowest number of entries (counting list entries)",
+        "entries",
+    ),
+    ("nameLength", "longest name", "shortest name", "characters"),
+    ("maxActorCues", "most actor cues at the same frame", None, "cues"),
+    ("maxActiveCommands", "most commands active at the same frame", None, "commands"),
+]
+
+# same for the camera metrics (see ``camera.py``), only for the cutscenes with camera splines
+camera_rankings = [
+    ("cameraPathLength", "longest camera path", None, "units"),
+    ("cameraMaxSpeed", "fastest camera", None, "units per frame"),
+    ("cameraRotation", "most camera rotation", None, "degrees"),
+    ("cameraMaxFOV", "widest field of view", None, "degrees"),
+    ("cameraMinFOV", None, "narrowest field of view", "degrees"),
+]
+
+# same for the actor cue motion metrics (see ``motion.py``), only for the cutscenes with actor cues
+motion_rankings = [
+    ("motionDistance", "most actor movement", None, "units"),
+    ("motionMaxSpeed", "fastest actor cue", None, "units per frame"),
+    ("motionDiscontinuities", "most actor cue discontinuities", None, "discontinuities"),
+]
+
+
+def get_names(metrics: CutsceneMetrics, rows: list[int], max_names: int = 3):
+    # the same cutscene can be found in several versions
+    names = list(dict.fromkeys(metrics.names[row] for row in rows))
+    text = ", ".join(f"'{name}'" for name in names[:max_names])
+
+    if len(names) > max_names:
+        others = len(names) - max_names
+        text += f" and {others} {'other' if others == 1 else 'others'}"
+
+    return len(names), text
+
+
+def print_ranking(metrics: CutsceneMetrics, metric: str, description: str, unit: str, highest: bool, rows, top: int):
+    ranking = metrics.getRanking(metric, top, highest, rows)
+
+    if top == 1:
+        value, tied = ranking[0]
+        count, names = get_names(metrics, tied)
+        print(f"{'Cutscene' if count == 1 else 'Cutscenes'} with the {description}: {names} with {value} {unit}!")
+        return
+
+    print(f"Cutscenes with the {description}:")
+    for rank, (value, tied) in enumerate(ranking, 1):
+        print(f"    {rank}. {get_names(metrics, tied)[1]} with {value} {unit}")
+
+
+def print_rankings(metrics: CutsceneMetrics, metric_rankings: list, rows, top: int):
+    for metric, highest_description, lowest_description, unit in metric_rankings:
+        if highest_description is not None:
+            print_ranking(metrics, metric, highest_description, unit, True, rows, top)
+        if lowest_description is not None:
+            print_ranking(metrics, metric, lowest_description, unit, False, rows, top)
+
+
+def print_metrics(metrics: CutsceneMetrics, label: str, rows, top: int, group_by: Optional[str]):
+    if len(rows) == 0:
+        raise ValueError("ERROR: No cutscenes found!")
+
+    print_rankings(metrics, rankings, rows, top)
+
+    print(f"{label} is using 'CS_DESTINATION' {metrics.getTotal('destination', rows)} times.")
+    print(f"{label} is using 'CS_TRANSITION' {metrics.getTotal('transitions', rows)} times.")
+
+    if "cameraSplines" in metrics.columns:
+        camera_rows = [row for row in rows if metrics.columns["cameraSplines"][row] > 0]
+        if len(camera_rows) > 0:
+            print_rankings(metrics, camera_rankings, camera_rows, top)
+        else:
+            print(f"{label} has no camera splines.")
+
+    if "motionCues" in metrics.columns:
+        motion_rows = [row for row in rows if metrics.columns["motionCues"][row] > 0]
+        if len(motion_rows) > 0:
+            print_rankings(metrics, motion_rankings, motion_rows, top)
+        print(
+            f"{label} has {metrics.getTotal('motionCues', rows)} actor cues, "
+            + f"{metrics.getTotal('motionStationary', rows)} not moving the actor and "
+            + f"{metrics.getTotal('motionDiscontinuities', rows)} starting away from the end of the previous cue."
+        )
+
+    if group_by is not None:
+        print()
+        for key, group in metrics.getGroups(group_by, rows).items():
+            print(
+                f"{key}: {len(group)} cutscenes, {metrics.getTotal('totalEntries', group)} entries, "
+                + f"{metrics.getTotal('frameCount', group)} frames."
+            )
+
+
+def get_jobs(value: str):
+    if not value.isdigit():
+        raise argparse.ArgumentTypeError(f"invalid job count '{value}', expected 0 or more")
+    return int(value)
+
+
+def add_source_arguments(parser: argparse.ArgumentParser, with_defaults: bool = True):
+    """Adds the arguments selecting where the cutscenes are read from"""
+
+    # the subcommands accept them too, without defaults so they don't override the ones given before the subcommand
+    def default(value):
+        return value if with_defaults else argparse.SUPPRESS
+
+    parser.add_argument("--decomp", "-d", dest="decomp_path", help="path to decomp root", default=default("../oot"))
+    parser.add_argument(
+        "--version",
+        "-v",
+        dest="versions",
+        nargs="+",
+        help="oot version(s) to analyse (default: gc-eu-mq-dbg, or every version of the corpus)",
+        default=default(None),
+    )
+    parser.add_argument(
+        "--all-versions",
+        "-a",
+        dest="all_versions",
+        action="store_true",
+        help="analyse every extracted version",
+        default=default(False),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        dest="jobs",
+        type=get_jobs,
+        help="number of processes parsing scene files, 0 for one per core",
+        default=default(1),
+    )
+    parser.add_argument("--cache", dest="cache_dir", help="directory used to cache the parsed scene files", default=default(None))
+    parser.add_argument(
+        "--columnar",
+        dest="columnar",
+        action="store_true",
+        help="store camera points and actor cues as columns",
+        default=default(False),
+    )
+    parser.add_argument(
+        "--corpus", dest="corpus", help="read the cutscenes from this corpus file instead of the decomp", default=default(None)
+    )
+    parser.add_argument(
+        "--resilient",
+        dest="resilient",
+        action="store_true",
+        help="skip the scene files, cutscenes and commands that can't be imported and list them at the end",
+        default=default(False),
+    )
+    parser.add_argument(
+        "--diagnostics-json",
+        dest="diagnostics_json",
+        help="write what the resilient import skipped to this JSON file",
+        default=default(None),
+    )
 
 
 def main():
     parser = argparse.ArgumentParser(description="prints stats for oot cutscenes")
-    parser.add_argument("--decomp", "-d", dest="decomp_path", help="path to decomp root", default="../oot")
-    parser.add_argument("--version", "-v", dest="version", help="oot version to analyse", default="gc-eu-mq-dbg")
+    add_source_arguments(parser)
+    parser.add_argument("--top", dest="top", type=int, help="number of cutscenes shown in each ranking", default=1)
+    parser.add_argument(
+        "--group-by", dest="group_by", choices=["scene", "version"], help="also print the totals of each scene or version"
+    )
+    parser.add_argument("--usage", dest="usage", action="store_true", help="print how many times each command is used")
+    parser.add_argument("--usage-json", dest="usage_json", help="write the command usage to this JSON file", default=None)
+    parser.add_argument(
+        "--legacy-files", dest="legacy_files", action="store_true", help="list the files using legacy command names"
+    )
+    parser.add_argument(
+        "--playability", dest="playability", action="store_true", help="print the scene headers and entrances using each cutscene"
+    )
+    parser.add_argument(
+        "--playability-json", dest="playability_json", help="write the references to each cutscene to this JSON file", default=None
+    )
+    parser.add_argument(
+        "--camera", dest="camera", action="store_true", help="evaluate the camera splines and rank their path, speed and FOV"
+    )
+    parser.add_argument(
+        "--motion", dest="motion", action="store_true", help="measure the movement of the actors in the actor and player cues"
+    )
+    parser.add_argument(
+        "--motion-json", dest="motion_json", help="write the actor cue motion of every cutscene to this JSON file", default=None
+    )
+    parser.add_argument("--export-corpus", dest="export_corpus", help="write the parsed cutscenes to this corpus file", default=None)
+    parser.add_argument(
+        "--profile", dest="profile", action="store_true", help="print the time and memory used by each stage of the import"
+    )
+    parser.add_argument("--profile-json", dest="profile_json", help="write the profiling results to this JSON file", default=None)
+    parser.add_argument(
+        "--profile-no-memory", dest="profile_memory", action="store_false", help="don't trace memory (tracemalloc slows the import)"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    query_parser = subparsers.add_parser("query", help="list the cutscenes using a value of an indexed field")
+    query_parser.add_argument("field", choices=list(indexFields), help="indexed field")
+    query_parser.add_argument("values", nargs="*", help="values to look up, every value used is listed if none is given")
+    query_parser.add_argument(
+        "--index", dest="index_path", help="read the index from this JSON file, it's written there if missing or outdated", default=None
+    )
+    query_parser.add_argument("--rebuild", dest="rebuild", action="store_true", help="build the index again even if it was saved")
+    add_source_arguments(query_parser, with_defaults=False)
+
+    diff_parser = subparsers.add_parser("diff", help="list the commands changed in each cutscene between two versions")
+    diff_parser.add_argument("old_version", help="version compared against")
+    diff_parser.add_argument("new_version", help="version compared")
+    diff_parser.add_argument("--json", dest="diff_json", help="write the changes to this JSON file", default=None)
+    add_source_arguments(diff_parser, with_defaults=False)
+
+    watch_parser = subparsers.add_parser("watch", help="keep the cutscenes in memory and serve their stats over HTTP")
+    watch_parser.add_argument("--port", dest="port", type=int, help="localhost port to serve on", default=8000)
+    watch_parser.add_argument(
+        "--interval", dest="interval", type=float, help="seconds between two checks of the scene files", default=1.0
+    )
+    add_source_arguments(watch_parser, with_defaults=False)
+
+    binary_parser = subparsers.add_parser("binary", help="print the stats of cutscenes compiled in a binary file")
+    binary_parser.add_argument("path", help="object file or segment dump with the cutscene data")
+    binary_parser.add_argument("offsets", nargs="+", help="offset of each cutscene in the file (0x prefix for hex)")
     args = parser.parse_args()
 
-    importer = CutsceneImport(Path(args.decomp_path).resolve(), args.version)
-    cs_list = importer.getCutsceneList()
+    decomp_path = Path(args.decomp_path).resolve()
+    cache_dir = Path(args.cache_dir).resolve() if args.cache_dir is not None else None
 
-    if len(cs_list) == 0:
-        raise ValueError("ERROR: No cutscenes found!")
+    if args.command == "query":
+        run_query(args, decomp_path, cache_dir)
+        return
 
-    entries_max_cs = None
-    entries_min_cs = None
-
-    entries_max_list_cs = None
-    entries_max_list_num = 0
-    entries_min_list_cs = None
-    entries_min_list_num = 999999999
-
-    name_len_max_cs = None
-    name_len_min_cs = None
-
-    dest_total = 0
-    trans_total = 0
-
-    for cutscene in cs_list:
-        if entries_max_cs is None or cutscene.totalEntries > entries_max_cs.totalEntries:
-            entries_max_cs = cutscene
-
-        if entries_min_cs is None or cutscene.totalEntries < entries_min_cs.totalEntries:
-            entries_min_cs = cutscene
-
-        sub_lists = [
-            cutscene.camEyeSplineList,
-            cutscene.camATSplineList,
-            cutscene.camEyeSplineRelPlayerList,
-            cutscene.camATSplineRelPlayerList,
-            cutscene.camEyeList,
-            cutscene.camATList,
-            cutscene.actorCueList,
-            cutscene.playerCueList,
-            cutscene.textList,
-            cutscene.miscList,
-            cutscene.rumbleList,
-            cutscene.lightSettingsList,
-            cutscene.timeList,
-            cutscene.seqList,
-            cutscene.fadeSeqList,
-        ]
-
-        cur_total = (
-            cutscene.totalEntries
-            + len(cutscene.transitionList)
-        )
+    if args.command == "diff":
+        run_diff(args, decomp_path, cache_dir)
+        return
+
+    if args.command == "binary":
+        run_binary(args)
+        return
+
+    if args.command == "watch":
+        if args.corpus is not None:
+            raise ValueError("ERROR: The watch mode reads the scene files of the decomp, it can't be used with '--corpus'")
+
+        versions = CutsceneImport.getVersionList(decomp_path) if args.all_versions else args.versions or ["gc-eu-mq-dbg"]
+        importer = CutsceneImport(decomp_path, versions[0], args.jobs, cache_dir, args.columnar, resilient=args.resilient)
+        watcher = CutsceneWatcher(importer, versions)
+        watcher.load()
+        serve(watcher, args.port, args.interval)
+        return
+
+    playability = args.playability or args.playability_json is not None
+
+    if args.corpus is not None:
+        if args.export_corpus is not None or args.usage or args.usage_json is not None or args.legacy_files or playability:
+            raise ValueError(
+                "ERROR: The command usage, playability and corpus export need the decomp, they can't be used with '--corpus'"
+            )
+
+        with CorpusReader(Path(args.corpus)) as reader:
+            versions = reader.getVersions() if args.all_versions or args.versions is None else args.versions
+            metrics = CutsceneMetrics()
+            batches = get_batches(args)
+            # rows of identical cutscenes share the same stored cutscene
+            stored = reader.getColumn("rows.cutscene")
+            for row, (version, scene, cutscene) in enumerate(reader.getRows()):
+                if version in versions:
+                    metrics.add(cutscene, scene, version, f"corpus:{stored[row]}")
+                    for batch in batches.values():
+                        batch.add(cutscene)
+
+            add_batch_metrics(metrics, batches)
+            print_stats(metrics, versions, args.top, args.group_by)
+            write_motion(args, metrics, batches)
+        return
+
+    versions = CutsceneImport.getVersionList(decomp_path) if args.all_versions else args.versions or ["gc-eu-mq-dbg"]
+
+    if len(versions) == 0:
+        raise ValueError("ERROR: No extracted versions found!")
+
+    profiler = None
+    if args.profile or args.profile_json is not None:
+        if args.jobs != 1:
+            print("WARNING: Profiling runs the import in a single process")
+
+        profiler = Profiler(args.profile_memory)
+        profiler.start()
+
+    count_usage = args.usage or args.usage_json is not None or args.legacy_files
+    importer = CutsceneImport(
+        decomp_path, versions[0], args.jobs, cache_dir, args.columnar, profiler, resilient=args.resilient, usage=count_usage
+    )
+    if playability:
+        importer.headerIndex = SceneHeaderIndex()
+        importer.headerIndex.readEntrances(decomp_path)
+
+    try:
+        with importer.profile("total"):
+            corpus = CorpusWriter() if args.export_corpus is not None else None
+            batches = get_batches(args)
+            usage = CommandUsage() if count_usage else None
+            metrics = get_metrics(importer, versions, corpus, batches=batches, usage=usage)
+            print_stats(metrics, versions, args.top, args.group_by)
+            write_motion(args, metrics, batches)
+
+            if corpus is not None:
+                with importer.profile("corpus export"):
+                    corpus.write(Path(args.export_corpus))
+
+            if usage is not None:
+                if args.usage:
+                    print()
+                    usage.print()
+                elif args.legacy_files:
+                    print()
+                    usage.printLegacyFiles()
+
+                if args.usage_json is not None:
+                    usage.writeJSON(Path(args.usage_json))
+
+            if playability:
+                cutscenes: dict[str, list[tuple[str, str]]] = {}
+                for row in metrics.getRows():
+                    cutscenes.setdefault(metrics.versions[row], []).append((metrics.names[row], metrics.scenes[row]))
+
+                if args.playability:
+                    print()
+                    importer.headerIndex.print(cutscenes)
+
+                if args.playability_json is not None:
+                    importer.headerIndex.writeJSON(Path(args.playability_json), cutscenes)
+
+            print_diagnostics(args, importer)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            profiler.addCounters("Prefilter", asdict(importer.prefilterStats))
+
+    if args.profile:
+        print()
+        profiler.print()
+
+    if args.profile_json is not None:
+        profiler.writeJSON(Path(args.profile_json))
+
+
+def get_index_sources(args: argparse.Namespace, decomp_path: Path, versions: list[str]):
+    """Returns the modification time and size of the corpus or of the scene files of every version"""
+
+    if args.corpus is not None:
+        return getSourceStats([Path(args.corpus).resolve()])
+
+    scene_files: list[Path] = []
+    for version in versions:
+        scene_files.extend(CutsceneImport(decomp_path, version).getSceneFiles())
+    return getSourceStats(scene_files)
+
+
+def run_query(args: argparse.Namespace, decomp_path: Path, cache_dir: Optional[Path]):
+    index_path = Path(args.index_path) if args.index_path is not None else None
+    index = None
+
+    with CorpusReader(Path(args.corpus)) if args.corpus is not None else nullcontext() as reader:
+        if reader is not None:
+            versions = reader.getVersions() if args.all_versions or args.versions is None else args.versions
+        else:
+            versions = CutsceneImport.getVersionList(decomp_path) if args.all_versions else args.versions or ["gc-eu-mq-dbg"]
+
+        if index_path is not None:
+            sources = get_index_sources(args, decomp_path, versions)
+
+            if not args.rebuild:
+                index = CutsceneIndex.readJSON(index_path)
+                if index is not None and list(dict.fromkeys(index.versions)) != versions:
+                    print(f"WARNING: '{index_path}' doesn't index the same versions, building it again")
+                    index = None
+                elif index is not None and index.sources != sources:
+                    print(f"INFO: The files indexed by '{index_path}' changed, building it again")
+                    index = None
+
+        if index is None:
+            index = CutsceneIndex()
+            if reader is not None:
+                for version, scene, cutscene in reader.getRows():
+                    if version in versions:
+                        index.add(cutscene, scene, version)
+            else:
+                importer = CutsceneImport(decomp_path, versions[0], args.jobs, cache_dir, args.columnar, resilient=args.resilient)
+                get_metrics(importer, versions, index=index)
+                print_diagnostics(args, importer)
+
+            if index_path is not None:
+                index.sources = sources
+                index.writeJSON(index_path)
+
+    if len(args.values) == 0:
+        print(f"Indexed {indexFields[args.field]}:")
+        for value, count in index.getValues(args.field).items():
+            print(f"    {value}: {count} {'cutscene' if count == 1 else 'cutscenes'}")
+        return
+
+    for value in args.values:
+        rows = index.query(args.field, value)
+        print(f"{len(rows)} {'cutscene is' if len(rows) == 1 else 'cutscenes are'} using '{value}' ({args.field}):")
+        for row in rows:
+            print(f"    {index.names[row]} ({index.scenes[row]}, {index.versions[row]})")
+
+
+def run_binary(args: argparse.Namespace):
+    path = Path(args.path)
+    offsets = {}
+    for offset in args.offsets:
+        try:
+            offset = int(offset, 0)
+        except ValueError:
+            raise ValueError(f"ERROR: Invalid offset '{offset}'")
+        offsets[f"{path.stem}_{offset:X}"] = offset
+
+    # the file is used as the version and the scene
+    metrics = CutsceneMetrics()
+    batches = get_batches(args)
+    for cutscene in readCutscenes(path, offsets, args.columnar):
+        metrics.add(cutscene, path.stem, path.name)
+        for batch in batches.values():
+            batch.add(cutscene)
+
+    add_batch_metrics(metrics, batches)
+    print_stats(metrics, [path.name], args.top, args.group_by)
+    write_motion(args, metrics, batches)
+
+
+def run_diff(args: argparse.Namespace, decomp_path: Path, cache_dir: Optional[Path]):
+    versions = [args.old_version, args.new_version]
+    cutscenes: dict[str, dict[str, tuple[str, Any]]] = {version: {} for version in versions}
+
+    def add(version: str, scene: str, cutscene):
+        if cutscene.name in cutscenes[version]:
+            print(f"WARNING: '{cutscene.name}' is found more than once in {version}, only the first one is compared")
+        else:
+            cutscenes[version][cutscene.name] = (scene, cutscene)
+
+    if args.corpus is not None:
+        with CorpusReader(Path(args.corpus)) as reader:
+            for version in versions:
+                if not version in reader.getVersions():
+                    raise ValueError(f"ERROR: '{version}' is not in '{args.corpus}'")
+
+            for version, scene, cutscene in reader.getRows():
+                if version in cutscenes:
+                    add(version, scene, cutscene)
+            result = diffVersions(args.old_version, cutscenes[args.old_version], args.new_version, cutscenes[args.new_version])
+    else:
+        importer = CutsceneImport(decomp_path, versions[0], args.jobs, cache_dir, args.columnar, resilient=args.resilient)
+        for version, scene_files in importer.iterVersions(versions, byFile=True):
+            for path, _, file_cutscenes in scene_files:
+                for cutscene in file_cutscenes:
+                    add(version, path.parent.name, cutscene)
+        print_diagnostics(args, importer)
+        result = diffVersions(args.old_version, cutscenes[args.old_version], args.new_version, cutscenes[args.new_version])
+
+    result.print()
+    if args.diff_json is not None:
+        result.writeJSON(Path(args.diff_json))
+
+
+def get_metrics(
+    importer: CutsceneImport,
+    versions: list[str],
+    corpus: Optional[CorpusWriter] = None,
+    index: Optional[CutsceneIndex] = None,
+    batches: Optional[dict[str, Any]] = None,
+    usage: Optional[CommandUsage] = None,
+):
+    metrics = CutsceneMetrics()
+    extracted_dir = importer.decomp_path.resolve() / "extracted"
+
+    # the cutscenes are processed as they are parsed so the whole list is never kept in memory
+    for version, scene_files in importer.iterVersions(versions, byFile=True):
+        for path, digest, cutscenes in scene_files:
+            with importer.profile("stats"):
+                for cutscene in cutscenes:
+                    metrics.add(cutscene, path.parent.name, version, digest)
+
+            if corpus is not None:
+                with importer.profile("corpus export"):
+                    for cutscene in cutscenes:
+                        corpus.add(cutscene, path.parent.name, version, digest)
+
+            if index is not None:
+                with importer.profile("index"):
+                    for cutscene in cutscenes:
+                        index.add(cutscene, path.parent.name, version)
+
+            for name, batch in (batches or {}).items():
+                with importer.profile(name):
+                    for cutscene in cutscenes:
+                        batch.add(cutscene)
+
+            # counted while tokenizing the file, identical files share it and it's added for each of them
+            if usage is not None:
+                usage.merge(cutscenes.usage, path.parent.name, path.relative_to(extracted_dir).as_posix())
+
+    with importer.profile("batch metrics"):
+        add_batch_metrics(metrics, batches or {})
+
+    return metrics
+
+
+def get_batches(args: argparse.Namespace):
+    """Returns the batches (see ``camera.py`` and ``motion.py``) the cutscenes are added to, by name"""
+
+    batches = {}
+    if not args.camera and not args.motion and args.motion_json is None:
+        return batches
+
+    # NumPy is only needed for these metrics
+    try:
+        from camera import CameraSplineBatch
+        from motion import ActorMotionBatch
+    except ImportError:
+        raise ValueError("ERROR: '--camera' and '--motion' need NumPy, install it with 'pip install numpy'")
+
+    if args.camera:
+        batches["camera"] = CameraSplineBatch()
+    if args.motion or args.motion_json is not None:
+        batches["motion"] = ActorMotionBatch()
+    return batches
 
-        for elem in sub_lists:
-            if len(elem) > 0:
-                for item in elem:
-                    cur_total += len(item.entries)
 
-        # TODO: implement the case when it's equal
-        if entries_max_list_cs is None or cur_total > entries_max_list_num:
-            entries_max_list_cs = cutscene
-            entries_max_list_num = cur_total
+def add_batch_metrics(metrics: CutsceneMetrics, batches: dict[str, Any]):
+    for batch in batches.values():
+        for metric, values in batch.getMetrics().items():
+            # counts are kept as integers, the rest is rounded
+            if values.dtype.kind == "i":
+                metrics.addColumn(metric, array("q", values.tolist()))
+            else:
+                metrics.addColumn(metric, array("d", values.round(1).tolist()))
 
-        if entries_min_list_cs is None or cur_total < entries_min_list_num:
-            entries_min_list_cs = cutscene
-            entries_min_list_num = cur_total
 
-        if name_len_max_cs is None or len(cutscene.name) > len(name_len_max_cs.name):
-            name_len_max_cs = cutscene
+def print_diagnostics(args: argparse.Namespace, importer: CutsceneImport):
+    if args.resilient:
+        print()
+        importer.diagnostics.print()
 
-        if name_len_min_cs is None or len(cutscene.name) < len(name_len_min_cs.name):
-            name_len_min_cs = cutscene
-        
-        if cutscene.destination is not None:
-            dest_total += 1
+        if args.diagnostics_json is not None:
+            importer.diagnostics.writeJSON(Path(args.diagnostics_json))
 
-        trans_total += len(cutscene.transitionList)
 
+def write_motion(args: argparse.Namespace, metrics: CutsceneMetrics, batches: dict[str, Any]):
+    if args.motion_json is not None:
+        batches["motion"].writeJSON(Path(args.motion_json), metrics.names, metrics.scenes, metrics.versions)
 
-    print(f"Cutscene with the highest number of entries: '{entries_max_cs.name}' with {entries_max_cs.totalEntries} entries!")
-    print(f"Cutscene with the lowest number of entries: '{entries_min_cs.name}' with {entries_min_cs.totalEntries} entries!")
 
-    print(f"Cutscene with the highest number of entries (counting list entries): '{entries_max_list_cs.name}' with {entries_max_list_num} entries!")
-    print(f"Cutscene with the lowest number of entries (counting list entries): '{entries_min_list_cs.name}' with {entries_min_list_num} entries!")
+def print_stats(metrics: CutsceneMetrics, versions: list[str], top: int, group_by: Optional[str]):
+    if len(versions) == 1:
+        print_metrics(metrics, versions[0], metrics.getRows(), top, group_by)
+        return
 
-    print(f"Cutscene with the longest name: '{name_len_max_cs.name}' with {len(name_len_max_cs.name)} characters!")
-    print(f"Cutscene with the shortest name: '{name_len_min_cs.name}' with {len(name_len_min_cs.name)} characters!")
+    for version in versions:
+        print(f"=== {version} ===")
+        print_metrics(metrics, version, metrics.getRows(version), top, group_by if group_by != "version" else None)
+        print()
 
-    print(f"{args.version} is using 'CS_DESTINATION' {dest_total} times.")
-    print(f"{args.version} is using 'CS_TRANSITION' {trans_total} times.")
+    print(f"=== all versions ({', '.join(versions)}) ===")
+    print(f"{len(metrics)} cutscenes in total, {metrics.getUniqueCount()} unique ones.")
+    print_metrics(metrics, "All versions", metrics.getRows(), top, group_by)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+import json
+import numpy as np
+
+from array import array
+from pathlib import Path
+
+from classes import Cutscene
+from columnar import ActorCueArray
+
+
+# Motion of the actor and player cues: how far and how fast each cue moves its actor, the cues that don't move it,
+# and the discontinuities (a cue starting away from where the previous cue of the same list ended, the actor teleports).
+# Like ``camera.py``, the cues of every cutscene are gathered in flat arrays and measured at once with NumPy.
+
+motionMetricNames = [
+    "motionCues",  # number of actor and player cues
+    "motionDistance",  # distance between the start and end positions, summed over the cues, in units
+    "motionMaxSpeed",  # highest distance per frame of a cue, in units
+    "motionStationary",  # number of cues with the same start and end positions
+    "motionDiscontinuities",  # number of cues starting away from the end position of the previous cue of their list
+    "motionMaxJump",  # longest distance between the end of a cue and the start of the next one, in units
+]
+
+
+class ActorMotionBatch:
+    """Actor and player cues of the cutscenes added to it, measured together by ``getMetrics()``"""
+
+    def __init__(self):
+        self.rows = 0  # number of cutscenes added
+        self.lists = 0  # number of cue lists added
+
+        # every cue, the cues of a list are contiguous
+        self.startFrame = array("q")
+        self.endFrame = array("q")
+        self.positions = [array("d") for _ in range(6)]  # start x, y, z and end x, y, z
+        self.cueLists = array("q")
+        self.cueRows = array("q")
+
+    def addCues(self, cues):
+        start = len(self.startFrame)
+
+        if isinstance(cues, ActorCueArray):
+            self.startFrame.extend(array("q", cues.startFrame))
+            self.endFrame.extend(array("q", cues.endFrame))
+            for column, values in zip(
+                self.positions, (cues.startX, cues.startY, cues.startZ, cues.endX, cues.endY, cues.endZ)
+            ):
+                column.extend(array("d", values))
+        else:
+            for cue in cues:
+                self.startFrame.append(cue.startFrame)
+                self.endFrame.append(cue.endFrame)
+                for column, value in zip(self.positions, (*cue.startPos, *cue.endPos)):
+                    column.append(value)
+
+        return len(self.startFrame) - start
+
+    def add(self, cutscene: Cutscene):
+        row = self.rows
+        self.rows += 1
+
+        for cueList in cutscene.actorCueList + cutscene.playerCueList:
+            count = self.addCues(cueList.entries)
+            self.cueLists.extend(array("q", [self.lists]) * count)
+            self.cueRows.extend(array("q", [row]) * count)
+            self.lists += 1
+
+    def getCueMotion(self):
+        """Returns the displacement, speed and jump from the previous cue of the same list (0 for the first one) of every cue"""
+
+        positions = [np.frombuffer(column) for column in self.positions]
+        startPos = np.stack(positions[:3], axis=1)
+        endPos = np.stack(positions[3:], axis=1)
+        durations = np.frombuffer(self.endFrame, dtype=np.int64) - np.frombuffer(self.startFrame, dtype=np.int64)
+
+        displacements = np.linalg.norm(endPos - startPos, axis=1)
+        speeds = displacements / np.maximum(durations, 1)
+
+        cueLists = np.frombuffer(self.cueLists, dtype=np.int64)
+        jumps = np.zeros(len(displacements))
+        sameList = cueLists[1:] == cueLists[:-1]
+        jumps[1:][sameList] = np.linalg.norm(startPos[1:] - endPos[:-1], axis=1)[sameList]
+
+        return displacements, speeds, jumps
+
+    def getMetrics(self):
+        """Returns the value of each metric of ``motionMetricNames`` for every cutscene, in the order they were added"""
+
+        displacements, speeds, jumps = self.getCueMotion()
+        cueRows = np.frombuffer(self.cueRows, dtype=np.int64)
+
+        metrics = {
+            "motionCues": np.bincount(cueRows, minlength=self.rows),
+            "motionDistance": np.bincount(cueRows, displacements, minlength=self.rows),
+            "motionMaxSpeed": np.zeros(self.rows),
+            "motionStationary": np.bincount(cueRows[displacements == 0], minlength=self.rows),
+            "motionDiscontinuities": np.bincount(cueRows[jumps > 0], minlength=self.rows),
+            "motionMaxJump": np.zeros(self.rows),
+        }
+        np.maximum.at(metrics["motionMaxSpeed"], cueRows, speeds)
+        np.maximum.at(metrics["motionMaxJump"], cueRows, jumps)
+        return metrics
+
+    def getSummary(self):
+        """Returns the corpus-wide totals and highest values"""
+
+        displacements, speeds, jumps = self.getCueMotion()
+        return {
+            "cues": len(displacements),
+            "distance": float(displacements.sum()),
+            "meanSpeed": float(speeds.mean()) if len(speeds) > 0 else 0.0,
+            "maxSpeed": float(speeds.max(initial=0.0)),
+            "stationary": int((displacements == 0).sum()),
+            "discontinuities": int((jumps > 0).sum()),
+            "maxJump": float(jumps.max(initial=0.0)),
+        }
+
+    def writeJSON(self, path: Path, names: list[str], scenes: list[str], versions: list[str]):
+        """Writes the summary and the metrics of every cutscene, ``names``, ``scenes`` and ``versions`` are those of each row"""
+
+        metrics = {metric: values.tolist() for metric, values in self.getMetrics().items()}
+        cutscenes = [
+            {"name": names[row], "scene": scenes[row], "version": versions[row]}
+            | {metric: values[row] for metric, values in metrics.items()}
+            for row in range(self.rows)
+        ]
+        path.write_text(json.dumps({"summary": self.getSummary(), "cutscenes": cutscenes}, indent=4), encoding="utf-8")
@@ -0,0 +1,75 @@
+import mmap
+import os
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+
+# Byte-level prefilter of the scene files: most of them don't have any cutscene,
+# those are found by searching the raw bytes of the memory-mapped file and skipped before anything is decoded.
+# The files that do have cutscenes are only decoded from the line where the first cutscene array starts.
+
+csDataMarker = b"CutsceneData "
+
+
+@dataclass
+class PrefilterStats:
+    """Number of scene files (and their size) seen and skipped by the prefilter"""
+
+    files: int = 0
+    bytes: int = 0
+    skippedFiles: int = 0
+    skippedBytes: int = 0
+
+    def add(self, size: int, skipped: bool):
+        self.files += 1
+        self.bytes += size
+        if skipped:
+            self.skippedFiles += 1
+            self.skippedBytes += size
+
+
+def findMarker(path: Path, marker: bytes = csDataMarker, scan: Optional[Callable[[mmap.mmap], None]] = None):
+    """
+    Returns the offset of the first ``marker`` in the file (-1 if there's none) and the size of the file.
+    ``scan`` is called with the mapped file, to read something else from the file while it's open.
+    """
+
+    with path.open("rb") as file:
+        size = os.fstat(file.fileno()).st_size
+
+        # empty files can't be mapped
+        if size == 0:
+            return -1, 0
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if scan is not None:
+                scan(data)
+            return data.find(marker), size
+
+
+def readFromMarker(path: Path, marker: bytes = csDataMarker):
+    """
+    Returns the text of the file starting from the line of the first ``marker`` with the number of that line,
+    ``None`` if the file doesn't contain the marker
+    """
+
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None, 0
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = data.find(marker)
+            if offset == -1:
+                return None, 0
+
+            lineStart = data.rfind(b"\n", 0, offset) + 1
+            lineNumber = data[:lineStart].count(b"\n") + 1
+            text = data[lineStart:].decode("utf-8")
+
+    # same as reading the file in text mode
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return text, lineNumber
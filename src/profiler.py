@@ -0,0 +1,123 @@
+import json
+import time
+import tracemalloc
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+# Per-stage profiling of an import, enabled with ``--profile`` or by giving a ``Profiler`` to ``CutsceneImport``.
+# Measures are grouped by category: the import stages, the command classes (from ``cmdToClass``),
+# the scene files and the cutscenes, the last two are used to find the slowest ones.
+
+categoryNames = {
+    "stage": "Stages",
+    "command": "Command classes",
+    "file": "Slowest scene files",
+    "cutscene": "Slowest cutscenes",
+}
+
+# used instead of a measure when profiling is disabled
+noProfile = nullcontext()
+
+
+@dataclass
+class StageStats:
+    """Measures of everything profiled under the same name"""
+
+    calls: int = 0
+    seconds: float = 0.0
+    peakMemory: int = 0  # highest memory allocated during a single call, in bytes (0 if tracemalloc is off)
+
+
+class Profiler:
+    """Records the wall time, call count and tracemalloc peak of the profiled stages"""
+
+    def __init__(self, traceMemory: bool = True, slowestCount: int = 10):
+        self.traceMemory = traceMemory
+        self.slowestCount = slowestCount  # number of files and cutscenes shown in the report
+        self.categories: dict[str, dict[str, StageStats]] = {category: {} for category in categoryNames}
+        self.counters: dict[str, dict[str, int]] = {}  # other numbers reported with the measures, by group
+
+        # allocated memory when each measure in progress started and its peak so far
+        self.memoryStack: list[list[int]] = []
+
+    def start(self):
+        if self.traceMemory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def measure(self, name: str, category: str = "stage"):
+        """Measures the code run inside the ``with`` block"""
+
+        stats = self.categories[category].get(name)
+        if stats is None:
+            stats = self.categories[category][name] = StageStats()
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+
+            # the peak is reset for this measure, keep the one of the measure it's nested in
+            if len(self.memoryStack) > 0:
+                self.memoryStack[-1][1] = max(self.memoryStack[-1][1], peak - self.memoryStack[-1][0])
+            tracemalloc.reset_peak()
+            self.memoryStack.append([current, 0])
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+
+            if tracing:
+                base, peak = self.memoryStack.pop()
+                stats.peakMemory = max(stats.peakMemory, peak, tracemalloc.get_traced_memory()[1] - base)
+
+    def addCounters(self, group: str, counters: dict[str, int]):
+        groupCounters = self.counters.setdefault(group, {})
+        for name, value in counters.items():
+            groupCounters[name] = groupCounters.get(name, 0) + value
+
+    def getReport(self):
+        """Returns the measures of every category, the files and cutscenes are limited to the slowest ones"""
+
+        report = {}
+        for category, measures in self.categories.items():
+            items = sorted(measures.items(), key=lambda item: item[1].seconds, reverse=True)
+            if category in ("file", "cutscene"):
+                items = items[: self.slowestCount]
+            report[category] = {name: asdict(stats) for name, stats in items}
+        report["counters"] = self.counters
+        return report
+
+    def print(self):
+        report = self.getReport()
+
+        for group, counters in report.pop("counters").items():
+            print(f"{group}: " + ", ".join(f"{name} {value}" for name, value in counters.items()))
+        if len(self.counters) > 0:
+            print()
+
+        for category, measures in report.items():
+            if len(measures) == 0:
+                continue
+
+            width = max(len(categoryNames[category]), *(len(name) for name in measures))
+            print(f"{categoryNames[category]:<{width}} {'calls':>9} {'total (s)':>10} {'per call (ms)':>14} {'peak (KiB)':>11}")
+            for name, stats in measures.items():
+                perCall = stats["seconds"] * 1000 / stats["calls"]
+                print(
+                    f"{name:<{width}} {stats['calls']:>9} {stats['seconds']:>10.3f} "
+                    + f"{perCall:>14.3f} {stats['peakMemory'] / 1024:>11.1f}"
+                )
+            print()
+
+    def writeJSON(self, path: Path):
+        path.write_text(json.dumps(self.getReport(), indent=4), encoding="utf-8")
@@ -0,0 +1,177 @@
+import heapq
+
+from array import array
+from typing import Optional
+
+from classes import Cutscene
+from diff import getCutsceneKeys
+from timeline import getMaxConcurrency, getTimelineItems
+
+
+# Stats of the cutscenes, computed from a table with one row per cutscene and one column per metric.
+# The table is filled once while the cutscenes are imported, every stat is then an aggregation over a column
+# (``sum()``, ``max()``, ``heapq`` on the ``array``) instead of another pass over the ``Cutscene`` objects.
+
+# metric name to the ``Cutscene`` attribute holding the command lists counted in it
+listMetrics = {
+    "camEyeSplineEntries": "camEyeSplineList",
+    "camATSplineEntries": "camATSplineList",
+    "camEyeSplineRelPlayerEntries": "camEyeSplineRelPlayerList",
+    "camATSplineRelPlayerEntries": "camATSplineRelPlayerList",
+    "camEyeEntries": "camEyeList",
+    "camATEntries": "camATList",
+    "actorCueEntries": "actorCueList",
+    "playerCueEntries": "playerCueList",
+    "textEntries": "textList",
+    "miscEntries": "miscList",
+    "rumbleEntries": "rumbleList",
+    "lightSettingsEntries": "lightSettingsList",
+    "timeEntries": "timeList",
+    "seqEntries": "seqList",
+    "fadeSeqEntries": "fadeSeqList",
+}
+
+metricNames = [
+    "nameLength",
+    "headerEntries",  # ``CS_HEADER()`` entry count
+    "totalEntries",  # header entries, transitions and every list entry
+    "frameCount",
+    "transitions",
+    "destination",  # 1 if the cutscene uses ``CS_DESTINATION()``
+    "maxActorCues",  # highest number of actor and player cues active at the same frame
+    "maxActiveCommands",  # highest number of commands active at the same frame (see ``timeline.py``)
+    *listMetrics.keys(),
+]
+
+
+def getContentHash(cutscene: Cutscene):
+    """Returns a hash of the header and commands of a cutscene (see ``diff.py``), its name and file don't count"""
+
+    keys = getCutsceneKeys(cutscene)
+    return hash((cutscene.totalEntries, cutscene.frameCount, tuple((listName, tuple(keys[listName])) for listName in keys)))
+
+
+class CutsceneMetrics:
+    """Table of the metrics of every cutscene added to it, with the scene and version each one comes from"""
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.scenes: list[str] = []
+        self.versions: list[str] = []
+        self.columns: dict[str, array] = {metric: array("q") for metric in metricNames}
+
+        # hash of the content of each cutscene (see ``getContentHash()``), identical cutscenes have the same one
+        self.contents = array("q")
+
+        # content hash by source (like the digest of the scene file) and name, the cutscenes of identical files
+        # are the same objects and are only hashed once
+        self.sourceContents: dict[tuple[str, str], int] = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, cutscene: Cutscene, scene: str = "", version: str = "", source: Optional[str] = None):
+        self.names.append(cutscene.name)
+        self.scenes.append(scene)
+        self.versions.append(version)
+
+        if source is None:
+            self.contents.append(getContentHash(cutscene))
+        else:
+            content = self.sourceContents.get((source, cutscene.name))
+            if content is None:
+                content = self.sourceContents[(source, cutscene.name)] = getContentHash(cutscene)
+            self.contents.append(content)
+
+        columns = self.columns
+        totalEntries = cutscene.totalEntries + len(cutscene.transitionList)
+        for metric, listName in listMetrics.items():
+            entries = sum(len(cmdList.entries) for cmdList in getattr(cutscene, listName))
+            columns[metric].append(entries)
+            totalEntries += entries
+
+        columns["nameLength"].append(len(cutscene.name))
+        columns["headerEntries"].append(cutscene.totalEntries)
+        columns["totalEntries"].append(totalEntries)
+        columns["frameCount"].append(cutscene.frameCount)
+        columns["transitions"].append(len(cutscene.transitionList))
+        columns["destination"].append(1 if cutscene.destination is not None else 0)
+
+        items = getTimelineItems(cutscene)
+        columns["maxActorCues"].append(getMaxConcurrency([item for item in items if item[2] in ("actorCue", "playerCue")])[0])
+        columns["maxActiveCommands"].append(getMaxConcurrency(items)[0])
+
+    def extend(self, other: "CutsceneMetrics"):
+        """Appends the rows of another table, without computing their metrics again"""
+
+        self.names.extend(other.names)
+        self.scenes.extend(other.scenes)
+        self.versions.extend(other.versions)
+        self.contents.extend(other.contents)
+        for metric, column in self.columns.items():
+            column.extend(other.columns[metric])
+
+    def addColumn(self, metric: str, values: array):
+        """Adds a metric computed for every row at once (like the camera metrics, see ``camera.py``)"""
+
+        if len(values) != len(self):
+            raise ValueError(f"ERROR: The '{metric}' column has {len(values)} values instead of {len(self)}")
+        self.columns[metric] = values
+
+    def getRows(self, version: Optional[str] = None, scene: Optional[str] = None):
+        """Returns the index of the rows matching the given version and scene, every row if none is given"""
+
+        if version is None and scene is None:
+            return range(len(self))
+
+        return [
+            row
+            for row in range(len(self))
+            if (version is None or self.versions[row] == version) and (scene is None or self.scenes[row] == scene)
+        ]
+
+    def getGroups(self, key: str, rows: Optional[range | list[int]] = None):
+        """Returns the rows grouped by ``key`` (``"scene"`` or ``"version"``), in the order the groups were added"""
+
+        keys = {"scene": self.scenes, "version": self.versions}[key]
+        groups: dict[str, list[int]] = {}
+        for row in rows if rows is not None else range(len(self)):
+            groups.setdefault(keys[row], []).append(row)
+        return groups
+
+    def getValues(self, metric: str, rows: Optional[range | list[int]] = None):
+        column = self.columns[metric]
+        if rows is None or len(rows) == len(column):
+            return column
+        return array(column.typecode, map(column.__getitem__, rows))
+
+    def getTotal(self, metric: str, rows: Optional[range | list[int]] = None):
+        return sum(self.getValues(metric, rows))
+
+    def getUniqueCount(self, rows: Optional[range | list[int]] = None):
+        """
+        Returns the number of distinct cutscenes, identical ones are counted once even if they come from different files
+        (like the same cutscene in several versions, or in scene files that only differ by a comment)
+        """
+
+        if rows is None or len(rows) == len(self.contents):
+            return len(set(self.contents))
+        return len(set(map(self.contents.__getitem__, rows)))
+
+    def getRanking(self, metric: str, count: int = 1, highest: bool = True, rows: Optional[range | list[int]] = None):
+        """
+        Returns the ``count`` highest (or lowest) values of a metric, each with the rows having it.
+        Tied rows are kept together under the same value, in the order they were added.
+        """
+
+        rows = rows if rows is not None else range(len(self))
+        values = self.getValues(metric, rows)
+        distinct = set(values)
+        best = heapq.nlargest(count, distinct) if highest else heapq.nsmallest(count, distinct)
+
+        ranking: dict[int, list[int]] = {value: [] for value in best}
+        for row, value in zip(rows, values):
+            tied = ranking.get(value)
+            if tied is not None:
+                tied.append(row)
+        return list(ranking.items())
@@ -0,0 +1,168 @@
+from bisect import bisect_right
+from typing import Any, Iterable, Optional
+
+from classes import Cutscene
+
+
+# Timeline index of a cutscene, to find the commands active at a frame or during a range of frames.
+# The commands are sorted by start frame and stored as an implicit interval tree: the middle of every range of the
+# sorted arrays is the root of that range, ``maxEnds`` has the highest end frame of each range.
+# A command is active from its start frame to the frame before its end frame, like the game does for the actor cues,
+# commands without an end frame (or ending before they start) are only active on their start frame.
+
+# ``Cutscene`` attribute to the kind of the indexed commands and if the entries of the lists are indexed instead
+timelineLists = {
+    "actorCueList": ("actorCue", True),
+    "playerCueList": ("playerCue", True),
+    "camEyeSplineList": ("camEyeSpline", False),
+    "camATSplineList": ("camATSpline", False),
+    "camEyeSplineRelPlayerList": ("camEyeSplineRelPlayer", False),
+    "camATSplineRelPlayerList": ("camATSplineRelPlayer", False),
+    "camEyeList": ("camEye", False),
+    "camATList": ("camAT", False),
+    "textList": ("text", True),
+    "miscList": ("misc", True),
+    "rumbleList": ("rumble", True),
+    "transitionList": ("transition", False),
+    "lightSettingsList": ("lightSetting", True),
+    "timeList": ("time", True),
+    "seqList": ("seq", True),
+    "fadeSeqList": ("fadeSeq", True),
+}
+
+timelineKinds = [kind for kind, _ in timelineLists.values()] + ["destination"]
+
+
+def getTimelineItems(cutscene: Cutscene, kinds: Optional[Iterable[str]] = None):
+    """Returns the start frame, end frame (excluded), kind and command of the commands with frames"""
+
+    kinds = set(kinds) if kinds is not None else None
+    items: list[tuple[int, int, str, Any]] = []
+
+    def add(kind: str, command: Any):
+        startFrame = command.startFrame
+        if startFrame is not None:
+            endFrame = command.endFrame
+            items.append((startFrame, max(endFrame if endFrame is not None else startFrame, startFrame + 1), kind, command))
+
+    for listName, (kind, indexEntries) in timelineLists.items():
+        if kinds is not None and not kind in kinds:
+            continue
+
+        for command in getattr(cutscene, listName):
+            if indexEntries:
+                for entry in command.entries:
+                    add(kind, entry)
+            else:
+                add(kind, command)
+
+    if cutscene.destination is not None and (kinds is None or "destination" in kinds):
+        add("destination", cutscene.destination)
+
+    return items
+
+
+def getMaxConcurrency(items: list[tuple[int, int, str, Any]]):
+    """Returns the highest number of commands active at the same frame and the first frame where it happens"""
+
+    # at the same frame, the commands ending are removed before the ones starting are added
+    events = sorted([(start, 1) for start, *_ in items] + [(end, -1) for _, end, *_ in items])
+
+    maxCount = count = 0
+    maxFrame = None
+    for frame, change in events:
+        count += change
+        if count > maxCount:
+            maxCount = count
+            maxFrame = frame
+    return maxCount, maxFrame
+
+
+class CutsceneTimeline:
+    """Commands of a cutscene indexed by frame, restricted to ``kinds`` if set (see ``timelineKinds``)"""
+
+    def __init__(self, cutscene: Cutscene, kinds: Optional[Iterable[str]] = None):
+        items = sorted(getTimelineItems(cutscene, kinds), key=lambda item: item[0])
+
+        self.starts = [item[0] for item in items]
+        self.ends = [item[1] for item in items]
+        self.kinds = [item[2] for item in items]
+        self.commands = [item[3] for item in items]
+        self.sortedEnds = sorted(self.ends)
+
+        self.maxEnds = [0] * len(items)
+        self.buildMaxEnds(0, len(items))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def buildMaxEnds(self, low: int, high: int):
+        if low >= high:
+            return 0
+
+        mid = (low + high) // 2
+        maxEnd = max(self.ends[mid], self.buildMaxEnds(low, mid), self.buildMaxEnds(mid + 1, high))
+        self.maxEnds[mid] = maxEnd
+        return maxEnd
+
+    def findOverlapping(self, low: int, high: int, firstFrame: int, lastFrame: int, found: list[int]):
+        while low < high:
+            mid = (low + high) // 2
+
+            # nothing in this range ends after the first frame
+            if self.maxEnds[mid] <= firstFrame:
+                return
+
+            self.findOverlapping(low, mid, firstFrame, lastFrame, found)
+
+            # the next commands start after the last frame
+            if self.starts[mid] > lastFrame:
+                return
+
+            if self.ends[mid] > firstFrame:
+                found.append(mid)
+            low = mid + 1
+
+    def getOverlapping(self, firstFrame: int, lastFrame: int, kind: Optional[str] = None):
+        """Returns the commands active during at least one frame from ``firstFrame`` to ``lastFrame`` (included)"""
+
+        found: list[int] = []
+        self.findOverlapping(0, len(self), firstFrame, lastFrame, found)
+        return [self.commands[i] for i in found if kind is None or self.kinds[i] == kind]
+
+    def getActive(self, frame: int, kind: Optional[str] = None):
+        """Returns the commands active at ``frame``"""
+
+        return self.getOverlapping(frame, frame, kind)
+
+    def getActiveCount(self, frame: int):
+        """Returns the number of commands active at ``frame``, without listing them"""
+
+        return bisect_right(self.starts, frame) - bisect_right(self.sortedEnds, frame)
+
+    def getActiveCounts(self, frames: Iterable[int]):
+        """Returns the number of commands active at each frame of ``frames``, in a single pass over the commands"""
+
+        frames = list(frames)
+        counts = [0] * len(frames)
+        started = ended = 0
+
+        for i in sorted(range(len(frames)), key=frames.__getitem__):
+            frame = frames[i]
+            while started < len(self.starts) and self.starts[started] <= frame:
+                started += 1
+            while ended < len(self.sortedEnds) and self.sortedEnds[ended] <= frame:
+                ended += 1
+            counts[i] = started - ended
+        return counts
+
+    def getMaxConcurrency(self, kinds: Optional[Iterable[str]] = None):
+        """Returns the highest number of commands (of ``kinds`` if set) active at the same frame and that frame"""
+
+        kinds = set(kinds) if kinds is not None else None
+        items = [
+            (start, end, kind, None)
+            for start, end, kind in zip(self.starts, self.ends, self.kinds)
+            if kinds is None or kind in kinds
+        ]
+        return getMaxConcurrency(items)
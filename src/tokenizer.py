@@ -0,0 +1,155 @@
+import re
+
+from dataclasses import dataclass, field
+from constants import ootCSLegacyToNewCmdNames, ootCSSingleCommands, ootCSListCommands, ootCSListEntryCommands
+
+
+# matches the start of a cutscene array definition, declarations like ``extern CutsceneData gCs[];`` are ignored
+csArrayRegex = re.compile(r"\bCutsceneData\s+(\w+)\s*\[[^\]]*\]\s*=\s*\{")
+
+# matches everything the lexer cares about inside a cutscene array, the order of the alternatives matters
+csTokenRegex = re.compile(r"//[^\n]*|/\*.*?\*/|^[ \t]*#[^\n]*|\b(\w+)\s*\(|[()}]", re.DOTALL | re.MULTILINE)
+
+
+@dataclass
+class CutsceneToken:
+    """This class contains a single command read from a cutscene array"""
+
+    name: str  # name of the command, like ``CS_CAM_POINT``
+    args: str  # raw text between the command's parenthesis, can span multiple lines
+    line: int  # line number of the command in the file
+
+
+@dataclass
+class CutsceneArray:
+    """This class contains every command of a ``CutsceneData`` array"""
+
+    name: str
+    line: int
+    tokens: list[CutsceneToken]
+    legacyNames: dict[str, int] = field(default_factory=dict)  # count of the legacy command names found in the array
+
+
+def isCommentedOut(fileData: str, index: int):
+    """Returns True if the line containing ``index`` starts with a comment"""
+
+    lineStart = fileData.rfind("\n", 0, index) + 1
+    line = fileData[lineStart:index].lstrip()
+    return line.startswith("//") or line.startswith("/*")
+
+
+def tokenizeCutscenes(fileData: str, lineNumber: int = 1):
+    """
+    Returns every cutscene array of a file with its commands, in a single pass over the text.
+    Legacy command names are replaced by the new ones, ``lineNumber`` is the line ``fileData`` starts at.
+    """
+
+    csArrays: list[CutsceneArray] = []
+    linePos = 0
+    pos = 0
+
+    while True:
+        arrayMatch = csArrayRegex.search(fileData, pos)
+        if arrayMatch is None:
+            break
+
+        pos = arrayMatch.end()
+        if isCommentedOut(fileData, arrayMatch.start()):
+            continue
+
+        lineNumber += fileData.count("\n", linePos, arrayMatch.start())
+        linePos = arrayMatch.start()
+        csArray = CutsceneArray(arrayMatch.group(1), lineNumber, [])
+
+        depth = 0
+        cmdName = None
+        cmdStart = 0
+        cmdLine = 0
+        for match in csTokenRegex.finditer(fileData, pos):
+            char = fileData[match.start()]
+            pos = match.end()
+
+            if char == "/" or char == "#" or char.isspace():
+                # comments and preprocessor directives
+                continue
+
+            if match.group(1) is not None or char == "(":
+                if depth == 0 and match.group(1) is not None:
+                    lineNumber += fileData.count("\n", linePos, match.start())
+                    linePos = match.start()
+                    cmdName = match.group(1)
+                    cmdStart = match.end()
+                    cmdLine = lineNumber
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0 and cmdName is not None:
+                    args = fileData[cmdStart : match.start()]
+
+                    # replace old names
+                    newName = ootCSLegacyToNewCmdNames.get(cmdName)
+                    if newName is not None:
+                        csArray.legacyNames[cmdName] = csArray.legacyNames.get(cmdName, 0) + 1
+                        cmdName = newName
+                    if "CS_CMD_" in args:
+                        args = args.replace("CS_CMD_CONTINUE", "CS_CAM_CONTINUE").replace("CS_CMD_STOP", "CS_CAM_STOP")
+
+                    csArray.tokens.append(CutsceneToken(cmdName, args, cmdLine))
+                    cmdName = None
+            elif depth == 0:
+                # end of the array
+                break
+
+        csArrays.append(csArray)
+
+    return csArrays
+
+
+def getListPrefix(cmdListName: str):
+    """Returns the prefix the entries of a list command start with"""
+
+    # camera and lighting have "non-standard" list names
+    if cmdListName.startswith("CS_CAM"):
+        return "CS_CAM"
+    elif cmdListName.startswith("CS_LIGHT"):
+        return "CS_LIGHT"
+    return cmdListName.removesuffix("_LIST")
+
+
+def groupCommands(csArray: CutsceneArray):
+    """Returns the commands of a cutscene grouped by list, each group starts with the list or standalone command"""
+
+    groups: list[list[CutsceneToken]] = []
+    curList: list[CutsceneToken] = None
+    curPrefix = None
+
+    for token in csArray.tokens:
+        # NOTE: ``CS_UNK_DATA()`` are commands that are completely useless, so we're ignoring those
+        if "CS_UNK_DATA" in token.name:
+            if token.name in ootCSListCommands:
+                curList = None
+            continue
+
+        if token.name in ootCSSingleCommands:
+            curList = None
+            if token.name == "CS_END_OF_SCRIPT":
+                break
+            groups.append([token])
+        elif token.name in ootCSListCommands:
+            curList = [token]
+            curPrefix = getListPrefix(token.name)
+            groups.append(curList)
+        elif token.name in ootCSListEntryCommands:
+            if curList is None:
+                print(f"{csArray.name}, command:\n{token.name}({token.args})")
+                raise ValueError(f"ERROR: Found a list entry outside a list inside ``{csArray.name}``!")
+
+            if curPrefix in token.name:
+                curList.append(token)
+            else:
+                print(f"WARNING: ``{token.name}`` doesn't belong to ``{curList[0].name}`` (line {token.line})")
+        else:
+            print(f"WARNING: Unknown command found: ``{token.name}``")
+            curList = None
+
+    return groups
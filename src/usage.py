@@ -0,0 +1,147 @@
+import json
+
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from constants import ootCSLegacyToNewCmdNames, ootCutsceneCommandsC
+from literals import getEnumKey
+from tokenizer import CutsceneArray
+
+
+# Usage report of the cutscene commands, counted from the tokens of the cutscene arrays.
+# The commands are never created so this is much cheaper than a full import,
+# the enum values are kept as written in the files and only resolved to enum keys when reporting.
+
+# command name to the enum and the index of the parameter counted in the report
+enumParams = {
+    "CS_MISC": ("csMiscType", 0),
+    "CS_TEXT": ("csTextType", 3),
+    "CS_START_SEQ": ("seqId", 0),
+    "CS_STOP_SEQ": ("seqId", 0),
+    "L_CS_START_SEQ": ("seqId", 0),
+    "L_CS_STOP_SEQ": ("seqId", 0),
+    "CS_TRANSITION": ("csTransitionType", 0),
+    "CS_DESTINATION": ("csDestination", 0),
+}
+
+
+class CommandUsage:
+    """Counts of every command, legacy command name, enum value and scene"""
+
+    def __init__(self):
+        self.commands: Counter[str] = Counter()  # by name, legacy commands are counted under their new name
+        self.legacyCommands: Counter[str] = Counter()  # by legacy name
+        self.enumLiterals: dict[str, Counter[tuple[str, bool]]] = {}  # by enum, (literal, is legacy seq id)
+        self.scenes: dict[str, Counter[str]] = {}
+        self.legacyFiles: dict[str, Counter[str]] = {}  # legacy names used by each file, to find old format files
+
+    def addArrays(self, csArrays: list[CutsceneArray]):
+        for csArray in csArrays:
+            self.legacyCommands.update(csArray.legacyNames)
+
+            for token in csArray.tokens:
+                self.commands[token.name.removeprefix("L_")] += 1
+
+                enumParam = enumParams.get(token.name)
+                if enumParam is not None:
+                    enumKey, index = enumParam
+                    params = token.args.split(",", index + 1)
+                    if len(params) > index:
+                        literal = "".join(params[index].split())
+                        isSeqLegacy = token.name.startswith("L_") and enumKey == "seqId"
+                        self.enumLiterals.setdefault(enumKey, Counter())[(literal, isSeqLegacy)] += 1
+
+    def merge(self, other: "CommandUsage", scene: Optional[str] = None, fileName: Optional[str] = None):
+        """Adds the counts of ``other``, if it's the usage of a single file its commands are added to ``scene``"""
+
+        self.commands.update(other.commands)
+        self.legacyCommands.update(other.legacyCommands)
+        for enumKey, literals in other.enumLiterals.items():
+            self.enumLiterals.setdefault(enumKey, Counter()).update(literals)
+        for otherScene, commands in other.scenes.items():
+            self.scenes.setdefault(otherScene, Counter()).update(commands)
+        for otherFileName, legacyNames in other.legacyFiles.items():
+            self.legacyFiles.setdefault(otherFileName, Counter()).update(legacyNames)
+
+        if scene is not None:
+            self.scenes.setdefault(scene, Counter()).update(other.commands)
+        if fileName is not None and len(other.legacyCommands) > 0:
+            self.legacyFiles.setdefault(fileName, Counter()).update(other.legacyCommands)
+
+    def getEnumCounts(self, enumKey: str):
+        """Returns the count of every value of an enum, by enum key when the value is known"""
+
+        counts: Counter[str] = Counter()
+        for (literal, isSeqLegacy), count in self.enumLiterals.get(enumKey, {}).items():
+            try:
+                counts[getEnumKey(enumKey, literal, isSeqLegacy)] += count
+            except ValueError:
+                # not a number nor an ID of this enum
+                counts[literal] += count
+        return counts
+
+    def getReport(self):
+        """Returns the counts of every command of ``ootCutsceneCommandsC`` (unused ones included) and the other counts"""
+
+        newNames = [name for name in ootCutsceneCommandsC if not name in ootCSLegacyToNewCmdNames and not name.startswith("L_")]
+        legacyByNewName: Counter[str] = Counter()
+        for legacyName, count in self.legacyCommands.items():
+            legacyByNewName[ootCSLegacyToNewCmdNames[legacyName].removeprefix("L_")] += count
+
+        commands = {name: self.commands[name] for name in newNames}
+        for name, count in self.commands.items():
+            # unknown commands
+            if not name in commands:
+                commands[name] = count
+
+        enumKeys = dict.fromkeys(enumKey for enumKey, _ in enumParams.values())
+
+        return {
+            "commands": {
+                name: {"total": count, "legacy": legacyByNewName[name]}
+                for name, count in sorted(commands.items(), key=lambda item: item[1], reverse=True)
+            },
+            "legacyCommands": {
+                legacyName: {"newName": newName.removeprefix("L_"), "count": self.legacyCommands[legacyName]}
+                for legacyName, newName in ootCSLegacyToNewCmdNames.items()
+            },
+            "enums": {enumKey: dict(self.getEnumCounts(enumKey).most_common()) for enumKey in enumKeys},
+            "scenes": {scene: dict(commands.most_common()) for scene, commands in sorted(self.scenes.items())},
+            "legacyFiles": {fileName: dict(legacyNames.most_common()) for fileName, legacyNames in sorted(self.legacyFiles.items())},
+        }
+
+    def printLegacyFiles(self):
+        if len(self.legacyFiles) == 0:
+            print("No file is using legacy command names.")
+            return
+
+        print("Files using legacy command names:")
+        for fileName, legacyNames in sorted(self.legacyFiles.items()):
+            print(f"    {fileName}: " + ", ".join(f"{name} ({count})" for name, count in legacyNames.most_common()))
+
+    def print(self):
+        report = self.getReport()
+
+        print("Command usage (legacy names included):")
+        for name, counts in report["commands"].items():
+            legacy = f" ({counts['legacy']} with a legacy name)" if counts["legacy"] > 0 else ""
+            print(f"    {name}: {counts['total']}{legacy}")
+
+        print("Legacy command names:")
+        for legacyName, counts in report["legacyCommands"].items():
+            print(f"    {legacyName} ({counts['newName']}): {counts['count']}")
+
+        for enumKey, counts in report["enums"].items():
+            print(f"'{enumKey}' values:")
+            for key, count in counts.items():
+                print(f"    {key}: {count}")
+
+        print("Commands per scene:")
+        for scene, commands in report["scenes"].items():
+            print(f"    {scene}: {sum(commands.values())}")
+
+        self.printLegacyFiles()
+
+    def writeJSON(self, path: Path):
+        path.write_text(json.dumps(self.getReport(), indent=4), encoding="utf-8")
@@ -0,0 +1,361 @@
+import json
+import threading
+import time
+
+from dataclasses import asdict, dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from cache import DigestIndex, ParseCache
+from classes import Cutscene, CutsceneImport
+from diagnostics import Diagnostic
+from index import CutsceneIndex
+from prefilter import findMarker
+from stats import CutsceneMetrics, metricNames
+
+
+# Watch mode: the parsed cutscenes of every scene file stay in memory, the scenes directories are polled and only the
+# scene files whose modification time or size changed are parsed again. Each file keeps the metrics of its cutscenes,
+# the totals of each version are updated with the difference, and the table used for rankings (and the query index)
+# is merged again from the files in memory the first time it's needed after a change, nothing is parsed for it.
+# The stats and queries are served as JSON on a localhost HTTP endpoint (see ``WatchRequestHandler``).
+
+
+@dataclass
+class WatchedFile:
+    """A scene file with its cutscenes and their metrics, as of its last modification time and size"""
+
+    version: str
+    mtime: int
+    size: int
+    cutscenes: list[Cutscene] = field(default_factory=list)
+    metrics: CutsceneMetrics = field(default_factory=CutsceneMetrics)
+    error: Optional[str] = None  # why the last parse failed, the cutscenes are then the ones of the previous parse
+    diagnostics: list[Diagnostic] = field(default_factory=list)  # what the resilient import skipped in the last parse
+
+    def getTotals(self):
+        return {"cutscenes": len(self.cutscenes)} | {metric: self.metrics.getTotal(metric) for metric in metricNames}
+
+
+def getFileMetrics(cutscenes: list[Cutscene], scene: str, version: str, digest: Optional[str] = None):
+    metrics = CutsceneMetrics()
+    for cutscene in cutscenes:
+        metrics.add(cutscene, scene, version, digest)
+    return metrics
+
+
+class CutsceneWatcher:
+    """Cutscenes of the scene files of every watched version, kept up to date by ``poll()``"""
+
+    def __init__(self, importer: CutsceneImport, versions: list[str]):
+        self.importers = {version: replace(importer, version=version) for version in versions}
+        self.files: dict[Path, WatchedFile] = {}
+        self.totals: dict[str, dict[str, int]] = {version: {} for version in versions}
+        self.lock = threading.Lock()
+        self.polls = 0
+        self.parsedFiles = 0
+        self.lastPoll = 0.0
+        self.pollErrors = 0
+
+        # merged from the files when needed, ``None`` until then
+        self.metrics: Optional[CutsceneMetrics] = None
+        self.index: Optional[CutsceneIndex] = None
+
+    def updateTotals(self, watched: WatchedFile, sign: int):
+        totals = self.totals[watched.version]
+        for key, value in watched.getTotals().items():
+            totals[key] = totals.get(key, 0) + sign * value
+
+    def setFile(self, path: Path, watched: Optional[WatchedFile]):
+        """Replaces the state of a scene file, removes it if ``watched`` is ``None``"""
+
+        previous = self.files.pop(path, None) if watched is None else self.files.get(path)
+        if previous is not None:
+            self.updateTotals(previous, -1)
+        if watched is not None:
+            self.files[path] = watched
+            self.updateTotals(watched, 1)
+
+        self.metrics = None
+        self.index = None
+
+    def getFileDiagnostics(self, version: str, path: Path, cutscenes: list[Cutscene]):
+        """Returns the diagnostics of the resilient import of a scene file, with the path of the file"""
+
+        file = path.relative_to(self.importers[version].decomp_path.resolve()).as_posix()
+        return [replace(diagnostic, file=file) for diagnostic in getattr(cutscenes, "diagnostics", [])]
+
+    def load(self):
+        """Parses every scene file of the watched versions, identical files are only parsed once"""
+
+        digestIndex = DigestIndex()
+        for importer in self.importers.values():
+            digestIndex.addFiles(importer.getSceneFiles())
+
+        for version, importer in self.importers.items():
+            sceneFiles = importer.getSceneFiles()
+            keptFiles = set(importer.prefilterSceneFiles(sceneFiles))
+            digestIndex.removeFiles(sorted(set(sceneFiles) - keptFiles))
+            cache = ParseCache(importer.cache_dir, importer.getCacheName(), digestIndex)
+
+            stats = {path: path.stat() for path in sceneFiles}
+            for path in sceneFiles:
+                if not path in keptFiles:
+                    self.setFile(path, WatchedFile(version, stats[path].st_mtime_ns, stats[path].st_size))
+
+            try:
+                files = importer.mapSceneFiles(importer.getFileCutscenes, sorted(keptFiles), cache)
+                for path, digest, cached, cutscenes in files:
+                    if digest is not None and not cached:
+                        cache.store(path, digest, cutscenes)
+
+                    watched = WatchedFile(version, stats[path].st_mtime_ns, stats[path].st_size, cutscenes)
+                    watched.metrics = getFileMetrics(cutscenes, path.parent.name, version, digest)
+                    watched.diagnostics = self.getFileDiagnostics(version, path, cutscenes)
+                    self.setFile(path, watched)
+                    self.parsedFiles += 1
+            finally:
+                cache.save()
+
+        self.lastPoll = time.time()
+
+    def parseFile(self, version: str, path: Path, previous: Optional[WatchedFile]):
+        """Returns the new state of a changed scene file, with the previous cutscenes if it can't be parsed"""
+
+        stat = path.stat()
+        watched = WatchedFile(version, stat.st_mtime_ns, stat.st_size)
+
+        try:
+            offset, _ = findMarker(path)
+            watched.cutscenes = self.importers[version].getFileCutscenes(path) if offset != -1 else []
+            watched.diagnostics = self.getFileDiagnostics(version, path, watched.cutscenes)
+        except (OSError, ValueError, KeyError, IndexError) as error:
+            # the file is most likely being edited (or replaced), it's parsed again on its next change
+            print(f"WARNING: Can't parse '{path}': {error}")
+            watched.error = str(error)
+            if previous is not None:
+                watched.cutscenes = previous.cutscenes
+                watched.metrics = previous.metrics
+                watched.diagnostics = previous.diagnostics
+                return watched
+
+        watched.metrics = getFileMetrics(watched.cutscenes, path.parent.name, version)
+        return watched
+
+    def poll(self):
+        """Parses again the scene files changed since the last poll, returns the changed, added and removed files"""
+
+        changed: list[tuple[str, Path]] = []
+        seen: set[Path] = set()
+
+        for version, importer in self.importers.items():
+            for path in importer.getSceneFiles():
+                seen.add(path)
+                watched = self.files.get(path)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if watched is None or watched.mtime != stat.st_mtime_ns or watched.size != stat.st_size:
+                    changed.append((version, path))
+
+        # the files are parsed without holding the lock so the requests aren't blocked meanwhile
+        updates: list[tuple[Path, WatchedFile]] = []
+        for version, path in changed:
+            try:
+                updates.append((path, self.parseFile(version, path, self.files.get(path))))
+            except OSError as error:
+                # removed since it was listed, it's dropped on the next poll if it's still missing
+                print(f"WARNING: Can't read '{path}': {error}")
+        removed = [path for path in self.files if not path in seen]
+
+        with self.lock:
+            for path, watched in updates:
+                self.setFile(path, watched)
+            for path in removed:
+                self.setFile(path, None)
+            self.polls += 1
+            self.parsedFiles += len(updates)
+            self.lastPoll = time.time()
+
+        return [path for path, _ in updates], removed
+
+    def getSortedFiles(self):
+        """Returns the path and state of every scene file, in the order of the versions then of the paths"""
+
+        versionOrder = {version: i for i, version in enumerate(self.importers)}
+        return sorted(self.files.items(), key=lambda item: (versionOrder[item[1].version], item[0]))
+
+    def getMetrics(self):
+        """Returns the metrics of every cutscene, merged from the files"""
+
+        if self.metrics is None:
+            metrics = CutsceneMetrics()
+            for _, watched in self.getSortedFiles():
+                metrics.extend(watched.metrics)
+            self.metrics = metrics
+        return self.metrics
+
+    def getIndex(self):
+        if self.index is None:
+            index = CutsceneIndex()
+            for path, watched in self.getSortedFiles():
+                for cutscene in watched.cutscenes:
+                    index.add(cutscene, path.parent.name, watched.version)
+            self.index = index
+        return self.index
+
+    def getStatus(self, params: dict[str, list[str]]):
+        return {
+            "versions": list(self.importers),
+            "files": len(self.files),
+            "cutscenes": sum(totals.get("cutscenes", 0) for totals in self.totals.values()),
+            "polls": self.polls,
+            "parsedFiles": self.parsedFiles,
+            "lastPoll": self.lastPoll,
+            "pollErrors": self.pollErrors,
+            "errors": {str(path): watched.error for path, watched in self.files.items() if watched.error is not None},
+            "diagnostics": sum(len(watched.diagnostics) for watched in self.files.values()),
+        }
+
+    def getVersions(self, params: dict[str, list[str]]):
+        versions = params.get("version", list(self.importers))
+        for version in versions:
+            if not version in self.totals:
+                raise ValueError(f"ERROR: '{version}' is not watched")
+        return versions
+
+    def getStats(self, params: dict[str, list[str]]):
+        return {version: self.totals[version] for version in self.getVersions(params)}
+
+    def getDiagnostics(self, params: dict[str, list[str]]):
+        """Returns what the resilient import skipped in the current state of the scene files, by version"""
+
+        diagnostics: dict[str, list[dict[str, Any]]] = {version: [] for version in self.getVersions(params)}
+        for _, watched in self.getSortedFiles():
+            if watched.version in diagnostics:
+                diagnostics[watched.version].extend(asdict(diagnostic) for diagnostic in watched.diagnostics)
+        return diagnostics
+
+    def getRanking(self, params: dict[str, list[str]]):
+        metric = params.get("metric", ["totalEntries"])[0]
+        if not metric in metricNames:
+            raise ValueError(f"ERROR: Unknown metric '{metric}', expected one of {', '.join(metricNames)}")
+
+        metrics = self.getMetrics()
+        version = params.get("version", [None])[0]
+        scene = params.get("scene", [None])[0]
+        top = int(params.get("top", ["1"])[0])
+        highest = params.get("order", ["highest"])[0] != "lowest"
+
+        rows = metrics.getRows(version, scene)
+        if len(rows) == 0:
+            return []
+
+        return [
+            {
+                "value": value,
+                "cutscenes": [
+                    {"name": metrics.names[row], "scene": metrics.scenes[row], "version": metrics.versions[row]} for row in tied
+                ],
+            }
+            for value, tied in metrics.getRanking(metric, top, highest, rows)
+        ]
+
+    def getQuery(self, params: dict[str, list[str]]):
+        if not "field" in params:
+            raise ValueError("ERROR: Missing 'field' parameter")
+
+        index = self.getIndex()
+        field = params["field"][0]
+        if not "value" in params:
+            return index.getValues(field)
+
+        return {
+            value: [
+                {"name": index.names[row], "scene": index.scenes[row], "version": index.versions[row]}
+                for row in index.query(field, value)
+            ]
+            for value in params["value"]
+        }
+
+
+class WatchRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the state of the ``CutsceneWatcher`` of the server as JSON:
+    ``/status``, ``/stats?version=...``, ``/ranking?metric=...&top=...&order=lowest&version=...&scene=...``,
+    ``/query?field=...&value=...`` (every value used by the field if none is given) and ``/diagnostics?version=...``.
+    """
+
+    routes = {
+        "/status": CutsceneWatcher.getStatus,
+        "/stats": CutsceneWatcher.getStats,
+        "/diagnostics": CutsceneWatcher.getDiagnostics,
+        "/ranking": CutsceneWatcher.getRanking,
+        "/query": CutsceneWatcher.getQuery,
+    }
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = self.routes.get(url.path)
+
+        if route is None:
+            self.sendJSON(404, {"error": f"ERROR: Unknown path '{url.path}', expected one of {', '.join(self.routes)}"})
+            return
+
+        watcher: CutsceneWatcher = self.server.watcher
+        try:
+            with watcher.lock:
+                result = route(watcher, parse_qs(url.query))
+        except ValueError as error:
+            self.sendJSON(400, {"error": str(error)})
+            return
+
+        self.sendJSON(200, result)
+
+    def sendJSON(self, code: int, data: Any):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        # the requests aren't logged, the changed files are
+        pass
+
+
+def pollForever(watcher: CutsceneWatcher, interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            changed, removed = watcher.poll()
+        except Exception as error:
+            # the thread keeps polling, the scene files are listed again on the next poll
+            with watcher.lock:
+                watcher.pollErrors += 1
+            print(f"WARNING: Can't poll the scene files: {error!r}")
+            continue
+        for path in changed:
+            print(f"INFO: Parsed '{path}' again")
+        for path in removed:
+            print(f"INFO: '{path}' was removed")
+
+
+def serve(watcher: CutsceneWatcher, port: int, interval: float):
+    """Polls the scene files every ``interval`` seconds and serves the stats on ``localhost:port`` until interrupted"""
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), WatchRequestHandler)
+    server.watcher = watcher
+    threading.Thread(target=pollForever, args=(watcher, interval), daemon=True).start()
+
+    print(f"INFO: Watching {len(watcher.files)} scene files, serving on http://127.0.0.1:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,180 @@
+# Checks that the binary decoder of ``binary.py`` gives back the cutscenes imported from the C sources.
+# The cutscenes are written in a scene file, imported, encoded like the ``z64cutscene_commands.h`` macros do and decoded back,
+# then every field of every command is compared as is: only ``params`` is skipped since there's no text in the binary data.
+
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from binary import decodeCutscene, encodeCutscene, readCutscenes
+from classes import Cutscene, CutsceneCmdActorCue, CutsceneCmdBase, CutsceneCmdCamPoint, CutsceneImport
+from columnar import ActorCueArray, CamPointArray
+
+
+# every command written with the current names and the spelling the decoder gives back
+cutsceneData = """
+CutsceneData gTestCurrentCs[] = {
+    CS_HEADER(16, 1000),
+    CS_CAM_EYE_SPLINE(0, 100),
+        CS_CAM_POINT(CS_CAM_CONTINUE, 0x00, 30, 45.0f, 100, -20, 300, 0x0000),
+        CS_CAM_POINT(CS_CAM_STOP, 0x00, 30, 60.4f, -684, -285, -1764, 0x0000),
+    CS_CAM_AT_SPLINE(0, 101),
+        CS_CAM_POINT(CS_CAM_CONTINUE, 0x00, 30, 45.0f, 1, 2, 3, 0x0000),
+        CS_CAM_POINT(CS_CAM_STOP, 0x00, 30, 45.0f, 4, 5, 6, 0x0000),
+    CS_ACTOR_CUE_LIST(CS_CMD_ACTOR_CUE_3_0, 2),
+        CS_ACTOR_CUE(0x0005, 0, 13, 0x0000, 0x4000, 0x0000, -6, 0, 0, 29, 0, 0, 0.0f, 0.0f, 0.0f),
+        CS_ACTOR_CUE(0x0009, 13, 40, 0x0000, 0x8000, 0xC000, 29, 0, 0, 35, 10, -4, 0.0f, 0.0f, 0.0f),
+    CS_PLAYER_CUE_LIST(1),
+        CS_PLAYER_CUE(PLAYER_CUEID_5, 0, 30, 0x0000, 0x8000, 0x0000, 1, 2, 3, 4, 5, 6, 0.0f, 0.0f, 0.0f),
+    CS_MISC_LIST(1),
+        CS_MISC(CS_MISC_STOP_CUTSCENE, 100, 101, 0x0000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    CS_LIGHT_SETTING_LIST(1),
+        CS_LIGHT_SETTING(0x02, 0, 1, 0x0000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    CS_RUMBLE_CONTROLLER_LIST(1),
+        CS_RUMBLE_CONTROLLER(0, 10, 11, 100, 10, 2, 0x00, 0x00),
+    CS_TEXT_LIST(3),
+        CS_TEXT(0x1234, 10, 20, CS_TEXT_NORMAL, 0xFFFF, 0xFFFF),
+        CS_TEXT_NONE(20, 30),
+        CS_TEXT_OCARINA_ACTION(OCARINA_ACTION_TEACH_MINUET, 30, 40, 0x0010),
+    CS_START_SEQ_LIST(1),
+        CS_START_SEQ(NA_BGM_ZELDA_THEME, 5, 6, 0x0000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    CS_STOP_SEQ_LIST(1),
+        CS_STOP_SEQ(NA_BGM_ZELDA_THEME, 7, 8, 0x0000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    CS_FADE_OUT_SEQ_LIST(1),
+        CS_FADE_OUT_SEQ(CS_FADE_OUT_BGM_MAIN, 5, 60, 0x0000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    CS_TIME_LIST(1),
+        CS_TIME(0, 10, 11, 6, 30, 0x00000000),
+    CS_TRANSITION(CS_TRANS_GRAY_FILL_OUT, 30, 40),
+    CS_DESTINATION(CS_DEST_HYRULE_FIELD_INTRO_DREAM, 200, 201),
+    CS_END_OF_SCRIPT(),
+};
+
+CutsceneData gTestShortCs[] = {
+    CS_HEADER(2, 50),
+    CS_CAM_AT_SPLINE(0, 50),
+        CS_CAM_POINT(CS_CAM_STOP, 0x00, 30, 45.0f, 4, 5, 6, 0x0000),
+    CS_TRANSITION(CS_TRANS_BLACK_FILL_IN, 10, 20),
+    CS_END_OF_SCRIPT(),
+};
+"""
+
+# legacy command names, lowercase hex and ``DEG_TO_BINANG()``, which the decoder can't know about
+legacyCutsceneData = """
+CutsceneData gTestLegacyCs[] = {
+    CS_HEADER(5, 300),
+    CS_CAM_POS_LIST(0, 201),
+        CS_CAM_POS(CS_CMD_CONTINUE, 0x00, 12, 30.0f, -2928, -71, -1867, 0x0000),
+        CS_CAM_POS(CS_CMD_STOP, 0x00, 43, 60.4f, -684, -285, -1764, 0x0000),
+    CS_NPC_ACTION_LIST(CS_CMD_ACTOR_CUE_1_0, 2),
+        CS_NPC_ACTION(0x0006, 0, 40, 0x0000, 0x4a00, 0x0000, 53, 0, 0, 61, 0, 0, CS_FLOAT(0x0, 0.0f), CS_FLOAT(0x0, 0.0f), CS_FLOAT(0x0, 0.0f)),
+        CS_NPC_ACTION(0x0011, 40, 91, 0x0000, DEG_TO_BINANG(90.0), 0x0000, -70, 0, 0, -27, 0, 0, 0.0f, 0.0f, 0.0f),
+    CS_PLAY_BGM_LIST(1),
+        CS_PLAY_BGM(0x0021, 5, 6, 0x0000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    CS_LIGHTING_LIST(1),
+        CS_LIGHTING(0x0002, 0, 1, 0x0000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    CS_SCENE_TRANS_FX(0x0005, 10, 20),
+    CS_END_OF_SCRIPT(),
+};
+"""
+
+# entry class of each columnar container, its attributes are the ones of the views
+columnClasses = {CamPointArray: CutsceneCmdCamPoint, ActorCueArray: CutsceneCmdActorCue}
+
+
+def getDifferences(expected: Any, actual: Any, path: str = "cutscene"):
+    """Returns the path, expected and actual value of every field that differs, types included"""
+
+    if type(expected) is not type(actual):
+        return [(path, expected, actual)]
+
+    if isinstance(expected, Cutscene):
+        names = [field.name for field in fields(Cutscene)]
+    elif isinstance(expected, CutsceneCmdBase):
+        names = [name for name in expected.__slots__ if name != "params"]
+    elif isinstance(expected, (CamPointArray, ActorCueArray)):
+        if len(expected) != len(actual):
+            return [(f"{path}.len", len(expected), len(actual))]
+        names = [name for name in columnClasses[type(expected)].__slots__ if name != "params"]
+        return [
+            difference
+            for i, (expectedView, actualView) in enumerate(zip(expected, actual))
+            for name in names
+            for difference in getDifferences(getattr(expectedView, name), getattr(actualView, name), f"{path}[{i}].{name}")
+        ]
+    elif isinstance(expected, (list, tuple)):
+        if len(expected) != len(actual):
+            return [(f"{path}.len", len(expected), len(actual))]
+        return [
+            difference
+            for i, (expectedItem, actualItem) in enumerate(zip(expected, actual))
+            for difference in getDifferences(expectedItem, actualItem, f"{path}[{i}]")
+        ]
+    else:
+        return [(path, expected, actual)] if expected != actual else []
+
+    return [
+        difference
+        for name in names
+        for difference in getDifferences(getattr(expected, name), getattr(actual, name), f"{path}.{name}")
+    ]
+
+
+def importCutscenes(root: Path, data: str, columnar: bool):
+    """Writes ``data`` in the scene file of a fake decomp tree and returns its cutscenes imported from the C sources"""
+
+    sceneDir = root / "extracted/test/assets/scenes/test/test_scene"
+    sceneDir.mkdir(parents=True)
+    (sceneDir / "test_scene_scene.c").write_text(data, encoding="utf-8")
+    return CutsceneImport(root, "test", columnar=columnar).getCutsceneList()
+
+
+@pytest.mark.parametrize("columnar", [False, True], ids=["objects", "columnar"])
+def test_decode_matches_c_path(tmp_path: Path, columnar: bool):
+    cutscenes = importCutscenes(tmp_path, cutsceneData, columnar)
+    assert [cutscene.name for cutscene in cutscenes] == ["gTestCurrentCs", "gTestShortCs"]
+
+    for cutscene in cutscenes:
+        data = encodeCutscene(cutscene)
+        decoded, size = decodeCutscene(data, 0, cutscene.name, columnar)
+        assert size == len(data)
+        assert getDifferences(cutscene, decoded) == []
+
+
+@pytest.mark.parametrize("columnar", [False, True], ids=["objects", "columnar"])
+def test_read_cutscenes_at_offsets(tmp_path: Path, columnar: bool):
+    cutscenes = importCutscenes(tmp_path, cutsceneData, columnar)
+
+    # the cutscenes are stored after some other data, like in an object file
+    data = bytearray(b"\x00" * 0x10)
+    offsets = {}
+    for cutscene in cutscenes:
+        offsets[cutscene.name] = len(data)
+        data += encodeCutscene(cutscene)
+    path = tmp_path / "test_scene.o"
+    path.write_bytes(data)
+
+    decoded = readCutscenes(path, offsets, columnar)
+    assert getDifferences(cutscenes, decoded) == []
+
+
+@pytest.mark.parametrize("columnar", [False, True], ids=["objects", "columnar"])
+def test_decode_legacy_commands(tmp_path: Path, columnar: bool):
+    (cutscene,) = importCutscenes(tmp_path, legacyCutsceneData, columnar)
+    decoded, _ = decodeCutscene(encodeCutscene(cutscene), 0, cutscene.name, columnar)
+
+    # the legacy commands compile to the same data, only the spelling of the sources is lost
+    assert getDifferences(cutscene, decoded) == [
+        ("cutscene.actorCueList[0].entries[0].rot[1]", "0x4a00", "0x4A00"),
+        ("cutscene.lightSettingsList[0].entries[0].isLegacy", True, False),
+        ("cutscene.seqList[0].entries[0].isLegacy", True, False),
+    ]
+
+
+def test_decode_truncated_data(tmp_path: Path):
+    (cutscene, _) = importCutscenes(tmp_path, cutsceneData, False)
+    data = encodeCutscene(cutscene)
+
+    with pytest.raises(ValueError, match="ends before its `CS_END_OF_SCRIPT\\(\\)`"):
+        decodeCutscene(data[:-8], 0, cutscene.name)